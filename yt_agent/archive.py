@@ -0,0 +1,225 @@
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import requests
+
+from .dedup import word_hashes
+from .llm_router import LLMRouter
+
+logger = logging.getLogger(__name__)
+
+
+class HashedEmbedder:
+    """Local fallback embeddings: hashed word unigrams and bigrams, log-scaled, L2-normalized.
+
+    Matches on shared words rather than meaning, but needs no model and is
+    stable across processes.
+    """
+
+    def __init__(self, dim: int = 512, max_words: int = 400):
+        self.dim = dim
+        self.max_words = max_words
+        self.name = f"hashed-{dim}"
+
+    def _vector(self, text: str) -> np.ndarray:
+        words = word_hashes(text, self.max_words)
+        features = np.concatenate([words, words[:-1] * np.uint64(1000003) ^ words[1:]]) if len(words) > 1 else words
+        counts = np.bincount((features % np.uint64(self.dim)).astype(np.int64), minlength=self.dim)
+        vector = np.log1p(counts).astype(np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return np.vstack([self._vector(text) for text in texts]) if texts else np.zeros((0, self.dim), np.float32)
+
+
+class EndpointEmbedder:
+    """Embeddings from the OpenAI-compatible ``/embeddings`` endpoint of an LLM server.
+
+    Requests go to the least-loaded endpoint offering the "embed" capability.
+    """
+
+    def __init__(self, router: LLMRouter, model: str, batch_size: int = 32, timeout: float = 60):
+        self.router = router
+        self.model = model
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.name = f"endpoint-{model}"
+
+    def request(self, texts: List[str]) -> List[List[float]]:
+        with self.router.acquire("embed") as backend:
+            response = requests.post(
+                f"{backend.api_base}/embeddings",
+                json={"model": self.model, "input": texts},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            rows.extend(self.request(list(texts[start:start + self.batch_size])))
+        if not rows:
+            return np.zeros((0, 0), np.float32)
+        vectors = np.asarray(rows, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def archive_text(item: Dict[str, Any]) -> str:
+    return f"{item['title']}\n{item['channel']}\n{item['summary']}"
+
+
+class SummaryArchive:
+    """Append-only archive of summary embeddings for ``/search``.
+
+    Vectors live in a raw float32 file that is memory-mapped for search and
+    only ever appended to; ``ids.txt`` holds the video id of each row. A video
+    summarized again gets a new row and its older rows are masked out. Each
+    embedder has its own subdirectory, since vectors from different models
+    cannot be compared. Video details are looked up in the ReviewStore. If
+    ``meta.json`` is unreadable, the archive starts empty and the next sync
+    rebuilds it from the store.
+    """
+
+    def __init__(self, directory: str, embedder: Any):
+        self.embedder = embedder
+        self.directory = os.path.join(directory, re.sub(r"[^A-Za-z0-9._-]+", "_", embedder.name))
+        os.makedirs(self.directory, exist_ok=True)
+        self._vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._ids_path = os.path.join(self.directory, "ids.txt")
+        self._meta_path = os.path.join(self.directory, "meta.json")
+        self._lock = threading.Lock()
+        self.dim: Optional[int] = None
+        self.synced_at = 0.0  # summary_at of the newest stored summary already archived
+        self.ids: List[str] = []
+        self._latest: Dict[str, int] = {}  # video_id -> its newest row
+        self._matrix: Optional[np.ndarray] = None
+        self._live = np.zeros(0, dtype=bool)
+        self._load()
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        """The metadata, {} before the first add, or None if the file is unreadable."""
+        if not os.path.exists(self._meta_path):
+            return {}
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if not isinstance(meta, dict) or not isinstance(meta.get("dim"), int):
+                raise ValueError("missing vector size")
+            return meta
+        except (OSError, ValueError) as e:
+            logger.error(f"Archive metadata {self._meta_path} unreadable: {e}")
+            return None
+
+    def _write_meta(self) -> None:
+        # Replaced atomically, so a crash mid-write never leaves a truncated file
+        temp_path = self._meta_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"embedder": self.embedder.name, "dim": self.dim, "synced_at": self.synced_at}, f)
+        os.replace(temp_path, self._meta_path)
+
+    def _load(self) -> None:
+        meta = self._read_meta()
+        if meta is None:
+            # Without the vector size the rows cannot be read; re-embed everything from the store.
+            logger.warning(f"Rebuilding archive {self.directory} from the review store")
+            for path in (self._vectors_path, self._ids_path, self._meta_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            meta = {}
+        self.dim = meta.get("dim")
+        self.synced_at = meta.get("synced_at", 0.0)
+        if os.path.exists(self._ids_path):
+            with open(self._ids_path, "r", encoding="utf-8") as f:
+                self.ids = f.read().split()
+        if not self.dim and os.path.exists(self._vectors_path):
+            # Written before the first metadata write (a crash in the first add); unreadable without dim.
+            os.remove(self._vectors_path)
+        rows = 0
+        if self.dim and os.path.exists(self._vectors_path):
+            rows = os.path.getsize(self._vectors_path) // (4 * self.dim)
+        if rows != len(self.ids):
+            # A crash between the two appends; keep the rows both files agree on.
+            logger.warning(f"Archive files out of step ({rows} vectors, {len(self.ids)} ids); truncating")
+            rows = min(rows, len(self.ids))
+            self.ids = self.ids[:rows]
+            if self.dim and os.path.exists(self._vectors_path):
+                with open(self._vectors_path, "r+b") as f:
+                    f.truncate(rows * 4 * self.dim)
+            with open(self._ids_path, "w", encoding="utf-8") as f:
+                f.write("".join(f"{video_id}\n" for video_id in self.ids))
+        self._remap(0)
+
+    def _remap(self, start: int) -> None:
+        """Map the vectors again after rows from ``start`` on were appended, and update the live mask for them."""
+        count = len(self.ids)
+        if not count:
+            self._matrix, self._live = None, np.zeros(0, dtype=bool)
+            return
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim))
+        # Only the newest row of each video takes part in searches. A new array,
+        # since a running search may still hold the old one.
+        live = np.concatenate([self._live[:start], np.ones(count - start, dtype=bool)])
+        for row in range(start, count):
+            previous = self._latest.get(self.ids[row])
+            if previous is not None:
+                live[previous] = False
+            self._latest[self.ids[row]] = row
+        self._live = live
+
+    def __len__(self) -> int:
+        return int(self._live.sum())
+
+    def add(self, items: List[Dict[str, Any]], synced_at: Optional[float] = None) -> int:
+        """Embed and append items (dicts with video_id, title, channel, summary)."""
+        if not items:
+            return 0
+        vectors = self.embedder.embed([archive_text(item) for item in items])
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding size changed from {self.dim} to {vectors.shape[1]}")
+            with open(self._vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            with open(self._ids_path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{item['video_id']}\n" for item in items))
+            start = len(self.ids)
+            self.ids.extend(item["video_id"] for item in items)
+            if synced_at is not None:
+                self.synced_at = max(self.synced_at, synced_at)
+            self._write_meta()
+            self._remap(start)
+        return len(items)
+
+    def sync(self, store: Any, batch: int = 256) -> int:
+        """Archive summaries stored since the last sync. Returns the number added."""
+        added = 0
+        while True:
+            items = store.summaries_since(self.synced_at, limit=batch)
+            if not items:
+                return added
+            added += self.add(items, synced_at=items[-1]["summary_at"])
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Video ids of the ``k`` summaries closest to ``query``, best first, with cosine scores."""
+        with self._lock:
+            matrix, live, ids = self._matrix, self._live, self.ids
+        if matrix is None:
+            return []
+        scores = np.asarray(matrix @ self.embedder.embed([query])[0])
+        scores = np.where(live, scores, -np.inf)
+        k = min(max(1, k), int(live.sum()))
+        if not k:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(ids[row], float(scores[row])) for row in top]
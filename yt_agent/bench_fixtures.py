@@ -0,0 +1,74 @@
+import random
+from typing import Any, Dict, List
+
+# Sentence banks the fixture transcripts are drawn from, one topic each
+_TOPICS = {
+    "rust": [
+        "Today we are looking at async Rust and why the borrow checker gets in the way of self-referential futures.",
+        "Pinning guarantees that a value will not move in memory, which is what lets a future hold references into itself.",
+        "Tokio schedules tasks across a pool of worker threads and steals work when one queue runs empty.",
+        "If you block inside an async function you stall every other task on that worker thread.",
+        "The fix is usually spawn_blocking, or moving the heavy work to a dedicated thread pool.",
+        "Let's benchmark the two versions and see how the tail latency changes under load.",
+    ],
+    "gpu": [
+        "This new graphics card doubles the memory bandwidth of last year's model.",
+        "In our gaming tests the average frame rate went up by about thirty percent at 4K.",
+        "Power draw under load peaked at four hundred and fifty watts, so check your power supply.",
+        "For local language models, the larger memory means a seventy billion parameter model fits when quantized.",
+        "The cooler stays quiet at idle but gets noticeably loud during long rendering jobs.",
+        "At this price it only makes sense if you need the memory for machine learning work.",
+    ],
+    "cooking": [
+        "Today we are making a simple sourdough loaf with just flour, water and salt.",
+        "Feed your starter the night before so it is bubbly and active in the morning.",
+        "Mix the dough and let it rest for thirty minutes before adding the salt.",
+        "Do four sets of stretch and folds, spaced half an hour apart, to build strength.",
+        "Shape the loaf tightly and proof it in the fridge overnight for better flavour.",
+        "Bake it in a preheated dutch oven, lid on for twenty minutes and off for twenty-five.",
+    ],
+}
+
+
+def _transcript(topic: str, chars: int, seed: int) -> str:
+    rng = random.Random(seed)
+    sentences = _TOPICS[topic]
+    parts: List[str] = []
+    length = 0
+    while length < chars:
+        sentence = rng.choice(sentences)
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)[:chars]
+
+
+# Videos of varying transcript length, from a short clip to a long talk
+TRANSCRIPTS: List[Dict[str, Any]] = [
+    {"id": "short", "title": "Sourdough in 60 seconds", "description": "Quick bread tips.", "transcript": _transcript("cooking", 400, 1)},
+    {"id": "medium", "title": "Async Rust pitfalls", "description": "Blocking, pinning and Tokio.", "transcript": _transcript("rust", 3000, 2)},
+    {"id": "long", "title": "GPU review: is it worth it?", "description": "Gaming and local LLM benchmarks.", "transcript": _transcript("gpu", 12000, 3)},
+    {"id": "very-long", "title": "Async Rust deep dive", "description": "A two hour workshop.", "transcript": _transcript("rust", 40000, 4)},
+    {"id": "no-transcript", "title": "Channel update: new schedule", "description": "Videos move to Fridays from next week.", "transcript": ""},
+]
+
+# Messages with the action the intent classifier should return
+INTENTS: List[Dict[str, str]] = [
+    {"text": "Add channel @Fireship", "action": "ADD_CHANNEL"},
+    {"text": "please follow https://www.youtube.com/@veritasium", "action": "ADD_CHANNEL"},
+    {"text": "subscribe to Linus Tech Tips", "action": "ADD_CHANNEL"},
+    {"text": "Remove channel Google", "action": "REMOVE_CHANNEL"},
+    {"text": "stop watching @mkbhd", "action": "REMOVE_CHANNEL"},
+    {"text": "List my channels", "action": "LIST_CHANNELS"},
+    {"text": "which channels am I monitoring?", "action": "LIST_CHANNELS"},
+    {"text": "Run review now", "action": "RUN_REVIEW"},
+    {"text": "what's new on my channels", "action": "RUN_REVIEW"},
+    {"text": "give me a summary of the latest videos", "action": "RUN_REVIEW"},
+    {"text": "find videos about rust async", "action": "SEARCH"},
+    {"text": "which videos covered Kubernetes?", "action": "SEARCH"},
+    {"text": "search for the GPT-5 launch", "action": "SEARCH"},
+    {"text": "status", "action": "STATUS"},
+    {"text": "are you still running?", "action": "STATUS"},
+    {"text": "hello!", "action": "HELP"},
+    {"text": "what can you do?", "action": "HELP"},
+    {"text": "the weather is nice today", "action": "UNKNOWN"},
+]
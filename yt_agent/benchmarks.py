@@ -0,0 +1,181 @@
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .quota import QuotaTracker
+from .stub_servers import StubYouTubeServer
+from .youtube_client import YouTubeClient
+
+logger = logging.getLogger(__name__)
+
+
+def format_table(rows: List[Dict[str, Any]], columns: List[str]) -> str:
+    """Render result rows as a fixed-width text table."""
+    def cell(value: Any) -> str:
+        if value is None:
+            return "-"
+        return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+    widths = [max(len(col), *(len(cell(row.get(col, ""))) for row in rows)) for col in columns]
+    lines = ["  ".join(col.ljust(width) for col, width in zip(columns, widths))]
+    lines.append("  ".join("-" * width for width in widths))
+    for row in rows:
+        lines.append("  ".join(cell(row.get(col, "")).ljust(width) for col, width in zip(columns, widths)))
+    return "\n".join(lines)
+
+
+def percentiles(values: Sequence[float], points: Sequence[int] = (50, 90, 99)) -> Dict[str, Optional[float]]:
+    """Nearest-rank percentiles of ``values`` as ``{"p50": ..., ...}`` (None for no values)."""
+    ordered = sorted(values)
+    if not ordered:
+        return {f"p{point}": None for point in points}
+    return {f"p{point}": ordered[max(0, math.ceil(point / 100 * len(ordered)) - 1)] for point in points}
+
+
+def bench_youtube_transports(channels: int = 20, latency: float = 0.05, workers: int = 8) -> List[Dict[str, Any]]:
+    """Time discovery of ``channels`` channels against a local stub YouTube API.
+
+    Compares the original shape (discovery client, sequential) with the
+    per-thread discovery transport and the pooled REST transport running
+    concurrently. Every scenario must return the same videos.
+    """
+    identifiers = [f"@stub_channel_{i}" for i in range(channels)]
+    scenarios = [
+        ("discovery", 1),
+        ("discovery", workers),
+        ("rest", 1),
+        ("rest", workers),
+    ]
+    results = []
+    baseline = None
+
+    with StubYouTubeServer(latency=latency) as server:
+        for transport, max_workers in scenarios:
+            client = YouTubeClient(
+                api_key="stub",
+                quota=QuotaTracker(daily_limit=10 ** 9),
+                transport=transport,
+                api_base=server.url,
+                max_workers=max_workers
+            )
+            requests_before = server.request_count
+            start = time.perf_counter()
+            videos = client.get_latest_videos_many(identifiers, max_videos=3)
+            elapsed = time.perf_counter() - start
+
+            ids = {identifier: [video.id for video in items or []] for identifier, items in videos.items()}
+            if baseline is None:
+                baseline = ids
+            results.append({
+                "transport": transport,
+                "workers": max_workers,
+                "seconds": elapsed,
+                "channels_per_sec": channels / elapsed if elapsed else 0.0,
+                "requests": server.request_count - requests_before,
+                "videos": sum(len(items or []) for items in videos.values()),
+                "same_result": ids == baseline
+            })
+    return results
+
+
+def _ms(seconds: Optional[float]) -> Optional[int]:
+    return None if seconds is None else round(seconds * 1000)
+
+
+def bench_llm(
+    targets: List[Tuple[str, str]],
+    repeats: int = 2,
+    max_sentences: int = 3,
+    language: str = "en"
+) -> List[Dict[str, Any]]:
+    """Run the fixture corpus through summarization and intent classification on each (api_base, model).
+
+    Requests run one at a time, so latencies are not inflated by queueing.
+    Time to first token comes from the streamed summary. Prompt tokens/sec
+    is the estimated prompt size over that time, and completion tokens/sec
+    is the answer size over the rest. Stability is the mean similarity
+    (hashed word features) between repeated summaries of the same video.
+    Failed summaries and intent calls that fell back after an error count
+    towards ``failure_rate``; metrics without samples are None.
+    """
+    from .archive import HashedEmbedder
+    from .bench_fixtures import INTENTS, TRANSCRIPTS
+    from .langchain_utils import LangChainUtils, SUMMARY_ERROR
+    from .pipeline import estimate_tokens
+
+    embedder = HashedEmbedder()
+    results = []
+    for api_base, model in targets:
+        lc_utils = LangChainUtils(api_base=api_base, model=model, max_concurrency=1, health_interval=0)
+        ttfts: List[float] = []
+        latencies: List[float] = []
+        prompt_rates: List[float] = []
+        completion_rates: List[float] = []
+        similarities: List[float] = []
+        failures = 0
+        for video in TRANSCRIPTS:
+            prompt_tokens = estimate_tokens(lc_utils.summary_prompt.format(
+                title=video["title"], description=video["description"] or "N/A", transcript=video["transcript"] or "N/A",
+                max_sentences=max_sentences, language=language
+            ))
+            summaries = []
+            for _ in range(repeats):
+                first_token: List[float] = []
+
+                def on_token(text: str) -> None:
+                    if not first_token:
+                        first_token.append(time.perf_counter())
+
+                start = time.perf_counter()
+                summary = lc_utils.generate_summary(
+                    video["title"], video["description"], video["transcript"], max_sentences, language, on_token=on_token
+                )
+                elapsed = time.perf_counter() - start
+                if summary == SUMMARY_ERROR or not first_token or not LangChainUtils._valid_summary(summary):
+                    failures += 1
+                    continue
+                ttft = first_token[0] - start
+                ttfts.append(ttft)
+                latencies.append(elapsed)
+                prompt_rates.append(prompt_tokens / ttft if ttft > 0 else 0.0)
+                if elapsed > ttft:
+                    completion_rates.append(estimate_tokens(summary) / (elapsed - ttft))
+                summaries.append(summary)
+            if len(summaries) > 1:
+                vectors = embedder.embed(summaries)
+                similarities.append(float((vectors @ vectors.T)[np.triu_indices(len(summaries), 1)].mean()))
+
+        intent_latencies = []
+        correct = 0
+        for case in INTENTS:
+            start = time.perf_counter()
+            intent = lc_utils.classify_intent(case["text"])
+            if "error" in intent:
+                # The UNKNOWN fallback would otherwise pass for a correct answer
+                failures += 1
+                continue
+            intent_latencies.append(time.perf_counter() - start)
+            correct += intent.get("action") == case["action"]
+        lc_utils.close()
+
+        requests = len(TRANSCRIPTS) * repeats + len(INTENTS)
+        latency = percentiles(latencies, (50, 90, 99))
+        results.append({
+            "endpoint": api_base,
+            "model": model,
+            "requests": requests,
+            "failure_rate": failures / requests if requests else 0.0,
+            "ttft_p50_ms": _ms(percentiles(ttfts, (50,))["p50"]),
+            "latency_p50_ms": _ms(latency["p50"]),
+            "latency_p90_ms": _ms(latency["p90"]),
+            "latency_p99_ms": _ms(latency["p99"]),
+            "prompt_tok_s": percentiles(prompt_rates, (50,))["p50"],
+            "completion_tok_s": percentiles(completion_rates, (50,))["p50"],
+            "stability": sum(similarities) / len(similarities) if similarities else None,
+            "intent_accuracy": correct / len(INTENTS),
+            "intent_p50_ms": _ms(percentiles(intent_latencies, (50,))["p50"])
+        })
+    return results
@@ -0,0 +1,249 @@
+import functools
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import requests
+
+from .channel_manager import Channel, ChannelManager
+from .youtube_transport import YouTubeApiError
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Match key of the channel list saved at the start of a recording
+_CHANNELS_KEY = "channels"
+
+
+class CassetteMiss(LookupError):
+    """Replay reached an interaction that was never recorded."""
+
+
+class _ReplayResponse:
+    """Just enough of ``requests.Response`` for TelegramClient."""
+
+    def __init__(self, status_code: int, body: Any):
+        self.status_code = status_code
+        self._body = body
+        self.text = body if isinstance(body, str) else json.dumps(body)
+
+    def json(self) -> Any:
+        if isinstance(self._body, str):
+            raise ValueError("Recorded response body is not JSON")
+        return self._body
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error (replayed)", response=self)
+
+
+def _encode_error(error: Exception) -> Dict[str, Any]:
+    if isinstance(error, YouTubeApiError):
+        return {"type": "YouTubeApiError", "status": error.status, "content": error.content}
+    if isinstance(error, requests.exceptions.RequestException):
+        return {"type": "RequestException", "message": str(error)}
+    return {"type": "Exception", "message": str(error)}
+
+
+def _decode_error(data: Dict[str, Any]) -> Exception:
+    if data["type"] == "YouTubeApiError":
+        return YouTubeApiError(data.get("status"), data.get("content", ""))
+    if data["type"] == "RequestException":
+        return requests.exceptions.ConnectionError(data.get("message", ""))
+    return RuntimeError(data.get("message", ""))
+
+
+def _stable_key(component: str, value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return component + ":" + hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class Cassette:
+    """Records outbound interactions to a file, or replays them offline.
+
+    Interactions are captured at each client's boundary: the YouTube transport,
+    the transcript fetch, the LLM calls and Telegram's HTTP session. Every
+    entry stores a match key, the result (or error) and the original latency;
+    replay serves entries in recorded order per key and sleeps for
+    ``latency * latency_scale`` so timing can be reproduced or compressed.
+    The channel list and the review store's transcript and summary lookups
+    are recorded too, so a replay in an empty data_dir takes the same path.
+    Paths ending in ``.gz`` are gzip-compressed JSON lines.
+    """
+
+    def __init__(self, path: str, mode: str, latency_scale: float = 1.0):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._file = None
+        self.recorded = 0
+        if mode == REPLAY:
+            self._load()
+        else:
+            self._file = self._open("wt")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self) -> None:
+        count = 0
+        with self._open("rt") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._entries[entry["k"]].append(entry)
+                count += 1
+        logger.info(f"Loaded {count} recorded interactions from {self.path}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                logger.info(f"Recorded {self.recorded} interactions to {self.path}")
+
+    def wrap(self, component: str, func: Callable, key_fn: Optional[Callable[..., Any]] = None) -> Callable:
+        """Return ``func`` wrapped to record into, or replay from, this cassette."""
+        def make_key(args: tuple, kwargs: dict) -> str:
+            value = key_fn(*args, **kwargs) if key_fn is not None else [list(args), kwargs]
+            return _stable_key(component, value)
+
+        @functools.wraps(func)
+        def recorded(*args: Any, **kwargs: Any) -> Any:
+            key = make_key(args, kwargs)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self._write({"k": key, "d": round(time.perf_counter() - start, 4), "e": _encode_error(e)})
+                raise
+            self._write({"k": key, "d": round(time.perf_counter() - start, 4), "r": self._encode(result)})
+            return result
+
+        @functools.wraps(func)
+        def replayed(*args: Any, **kwargs: Any) -> Any:
+            key = make_key(args, kwargs)
+            with self._lock:
+                queue = self._entries.get(key)
+                if queue:
+                    entry = queue.popleft()
+                    self._last[key] = entry
+                elif key in self._last:
+                    # Same call made more often than during recording: repeat the last answer.
+                    entry = self._last[key]
+                else:
+                    raise CassetteMiss(f"No recorded interaction for {component} call {key}")
+            if self.latency_scale > 0:
+                time.sleep(entry.get("d", 0.0) * self.latency_scale)
+            if "e" in entry:
+                raise _decode_error(entry["e"])
+            return self._decode(entry["r"])
+
+        return replayed if self.replaying else recorded
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+                self.recorded += 1
+
+    @staticmethod
+    def _encode(result: Any) -> Any:
+        if isinstance(result, requests.Response):
+            try:
+                body = result.json()
+            except ValueError:
+                body = result.text
+            return {"http_status": result.status_code, "body": body}
+        return result
+
+    @staticmethod
+    def _decode(result: Any) -> Any:
+        if isinstance(result, dict) and "http_status" in result:
+            return _ReplayResponse(result["http_status"], result["body"])
+        return result
+
+    def install(self, agent: Any) -> None:
+        """Route the agent's outbound calls through this cassette."""
+        self._install_channels(agent)
+
+        # The store skips fetches and LLM calls for what it already holds
+        store = agent.store
+        store.get_transcript = self.wrap("store", store.get_transcript)
+        store.get_summary = self.wrap("store", store.get_summary)
+
+        transport = agent.yt_client.transport
+        transport.call = self.wrap("youtube", transport.call)
+
+        transcripts = agent.transcript_client
+        transcripts.get_transcript = self.wrap("transcript", transcripts.get_transcript)
+
+        self.install_llm(agent)
+
+        # Telegram payloads contain dates and message ids, so match on the API method
+        # and rely on call order instead of the full request.
+        session = agent.telegram_client.session
+        for verb in ("get", "post"):
+            setattr(session, verb, self.wrap(
+                "telegram",
+                getattr(session, verb),
+                key_fn=lambda url, *args, **kwargs: url.rsplit("/", 1)[-1]
+            ))
+
+    def _install_channels(self, agent: Any) -> None:
+        if not self.replaying:
+            self._write({"k": _CHANNELS_KEY, "r": [asdict(channel) for channel in agent.channel_manager.get_channels()]})
+            return
+        entries = self._entries.pop(_CHANNELS_KEY, None)
+        if entries:
+            channels = [Channel(**channel) for channel in entries[0]["r"]]
+        else:
+            logger.warning(f"{self.path} has no recorded channel list; replaying with the current channels")
+            channels = agent.channel_manager.get_channels()
+        # A replay works on its own copy, so /add and /remove leave the real list alone
+        path = os.path.join(agent.config.run.data_dir, "channels.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([asdict(channel) for channel in channels], f, indent=2, ensure_ascii=False)
+        agent.channel_manager = ChannelManager(path)
+
+    def install_llm(self, agent: Any) -> None:
+        """Wrap the agent's LLM clients; called again when a config reload rebuilds them."""
+        llm_utils: List[Any] = []
+        for lc in (agent.lc_utils, agent.llm_client.lc_utils):
+            if not any(lc is seen for seen in llm_utils):
+                llm_utils.append(lc)
+        for lc in llm_utils:
+            lc.classify_intent = self.wrap("llm", lc.classify_intent)
+            # The streaming callback is a fresh function every call, so keep it out of the key.
+            lc.generate_summary = self.wrap(
+                "llm",
+                lc.generate_summary,
+                key_fn=lambda *args, on_token=None, **kwargs: [list(args), kwargs]
+            )
+            lc.generate_summaries_packed = self.wrap("llm", lc.generate_summaries_packed)
+        # Endpoint embeddings for the archive; the hashed fallback makes no calls.
+        embedder = getattr(getattr(agent, "archive", None), "embedder", None)
+        if hasattr(embedder, "request"):
+            embedder.request = self.wrap("llm", embedder.request)
@@ -1,16 +1,66 @@
 import argparse
 import logging
+import os
+import shutil
 import sys
+import tempfile
+from .cassette import Cassette, RECORD, REPLAY
 from .config import load_config
+from .profiling import Profiler
 from .review_agent import ReviewAgent
+from .review_worker import run_workers
 
 def main():
     parser = argparse.ArgumentParser(description="YouTube Telegram Review Agent")
-    parser.add_argument("--config", required=True, help="Path to the configuration YAML file")
+    parser.add_argument("--config", help="Path to the configuration YAML file")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
     parser.add_argument("--bot", action="store_true", help="Run in interactive bot mode (listens for Telegram commands)")
+    parser.add_argument("--webhook", action="store_true", help="In bot mode, receive updates via an embedded webhook server instead of long polling")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="PATH", help="Record all outbound interactions to a cassette file (.gz for compression)")
+    cassette_group.add_argument("--replay", metavar="PATH", help="Replay a recorded cassette offline instead of calling real services")
+    parser.add_argument("--profile", action="store_true", help="Profile a one-shot review (CPU profile and stage breakdown)")
+    parser.add_argument("--profile-memory", action="store_true", help="With --profile, also track allocations via tracemalloc")
+    parser.add_argument("--profile-dir", help="Directory for profile artifacts (default: <data_dir>/profiles)")
+    parser.add_argument("--deadline", type=float, metavar="SECONDS", help="Time budget per review; summaries are cut down as it runs out (overrides run.time_budget)")
+    parser.add_argument("--digest", metavar="PERIOD", help="Send a digest rolled up from stored summaries instead of a review: week, month, or e.g. 2026-W41 / 2026-10")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Replay latency multiplier (1.0 = original timing, 0 = no delays)")
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    bench_youtube = subparsers.add_parser("bench-youtube", help="Benchmark YouTube transports against a local stub API")
+    bench_youtube.add_argument("--channels", type=int, default=20, help="Number of stub channels to discover")
+    bench_youtube.add_argument("--latency-ms", type=float, default=50, help="Stub latency per request in milliseconds")
+    bench_youtube.add_argument("--workers", type=int, default=8, help="Concurrent workers for the parallel scenarios")
+    bench_llm = subparsers.add_parser("bench-llm", help="Benchmark LLM endpoints and models on fixture transcripts and intents")
+    bench_llm.add_argument("--api-base", action="append", metavar="URL", help="OpenAI-compatible server (repeatable; default: llm.api_base from --config)")
+    bench_llm.add_argument("--model", action="append", metavar="NAME", help="Model to benchmark on every server (repeatable; default: llm.model)")
+    bench_llm.add_argument("--stub", action="store_true", help="Benchmark a local stub server instead (for CI)")
+    bench_llm.add_argument("--stub-latency-ms", type=float, default=50, help="Stub time to first token in milliseconds")
+    bench_llm.add_argument("--stub-tokens-per-sec", type=float, default=300, help="Stub streaming speed")
+    bench_llm.add_argument("--stub-failure-rate", type=float, default=0.0, help="Share of stub requests that fail")
+    bench_llm.add_argument("--repeats", type=int, default=2, help="Summaries per fixture (more than one measures stability)")
+    bench_llm.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    loadtest = subparsers.add_parser("loadtest", help="Drive bot mode with synthetic Telegram updates against local stub APIs")
+    loadtest.add_argument("--duration", type=float, default=30, help="Seconds of generated load")
+    loadtest.add_argument("--rate", type=float, default=2.0, help="Updates per second (Poisson arrivals)")
+    loadtest.add_argument("--chats", type=int, default=3, help="Number of chats; only the first is authorized")
+    loadtest.add_argument("--authorized-share", type=float, default=0.8, help="Share of updates from the authorized chat")
+    loadtest.add_argument("--mix", help="Commands and weights, e.g. \"/status=3,list my channels=2,/review=0.2\"")
+    loadtest.add_argument("--cooldown", type=float, help="Override the per-chat command cooldown in seconds (default: the agent's)")
+    loadtest.add_argument("--llm-latency-ms", type=float, default=200, help="Stub LLM time to first token in milliseconds")
+    loadtest.add_argument("--llm-tokens-per-sec", type=float, default=200, help="Stub LLM streaming speed")
+    loadtest.add_argument("--youtube-latency-ms", type=float, default=20, help="Stub YouTube latency per request in milliseconds")
+    loadtest.add_argument("--channels", type=int, default=5, help="Stub channels reviewed by /review")
+    loadtest.add_argument("--no-memory", action="store_true", help="Skip tracemalloc heap tracking (it slows the agent down)")
+    loadtest.add_argument("--json", metavar="PATH", help="Also write the full results, with time series, as JSON")
+    loadtest.add_argument("--seed", type=int, default=0, help="Seed for arrivals and the command mix")
+    worker = subparsers.add_parser("worker", help="Run review worker processes that consume the job queue")
+    worker.add_argument("--processes", type=int, default=2, help="Number of worker processes")
+    worker.add_argument("--api-base", action="append", metavar="URL", help="LLM server for the workers (repeat to spread workers round-robin)")
     
     args = parser.parse_args()
+    if args.command in (None, "worker") and not args.config:
+        parser.error("--config is required")
 
     log_level = logging.DEBUG if args.verbose else logging.INFO
     logging.basicConfig(
@@ -22,12 +72,47 @@ def main():
     )
     
     logger = logging.getLogger(__name__)
+    cassette = None
+    replay_dir = None
 
     try:
+        if args.command == "bench-youtube":
+            run_bench_youtube(args)
+            return
+        if args.command == "loadtest":
+            run_loadtest(args)
+            return
+        if args.command == "bench-llm":
+            run_bench_llm(args, parser)
+            return
+
         logger.info(f"Loading config from {args.config}")
         config = load_config(args.config)
+
+        if args.command == "worker":
+            run_workers(config, args.processes, api_bases=args.api_base)
+            return
+
+        # Command-line settings for config.run; the agent keeps them across config reloads
+        run_overrides = {}
+        if args.record:
+            cassette = Cassette(args.record, RECORD)
+        elif args.replay:
+            cassette = Cassette(args.replay, REPLAY, latency_scale=args.latency_scale)
+            # Keep the quota, update journal, message history, store and checkpoints of real runs untouched
+            replay_dir = tempfile.mkdtemp(prefix="yt-replay-")
+            run_overrides["profile_dir"] = config.run.profile_dir or os.path.join(config.run.data_dir, "profiles")
+            run_overrides["data_dir"] = replay_dir
         
-        agent = ReviewAgent(config)
+        if args.profile_dir:
+            run_overrides["profile_dir"] = args.profile_dir
+        if args.profile_memory:
+            run_overrides["profile_memory"] = True
+        if args.deadline is not None:
+            run_overrides["time_budget"] = args.deadline
+
+        agent = ReviewAgent(config, cassette=cassette, config_path=args.config, run_overrides=run_overrides)
+        config = agent.config
         
         if args.bot:
             # Run in interactive bot mode
@@ -35,7 +120,30 @@ def main():
             logger.info("The agent will listen for Telegram commands.")
             logger.info("Send /review to your bot to trigger a review.")
             logger.info("Press Ctrl+C to stop.")
-            agent.start_bot_mode()
+            if config.run.watch_config:
+                agent.watch_config()
+            if config.prefetch.enabled:
+                agent.start_prefetch()
+            agent.resume_interrupted_review()
+            if args.webhook:
+                agent.start_webhook_mode()
+            else:
+                agent.start_bot_mode()
+        elif args.profile:
+            profiler = Profiler(
+                agent.profile_dir,
+                "review",
+                track_memory=config.run.profile_memory,
+                stages_source=lambda: agent.last_run_stages
+            )
+            with profiler:
+                agent.run_review()
+            logger.info(f"Review took {profiler.elapsed:.2f}s; stages: {profiler.stages.summary() if profiler.stages else 'n/a'}")
+            for line in profiler.hotspot_summary():
+                logger.info(f"  {line}")
+            logger.info(f"Profile report: {profiler.report_path}")
+        elif args.digest:
+            agent.run_digest(args.digest)
         else:
             # Run once and exit
             agent.run_review()
@@ -46,6 +154,83 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        if cassette is not None:
+            cassette.close()
+        if replay_dir is not None:
+            shutil.rmtree(replay_dir, ignore_errors=True)
+
+def run_bench_youtube(args: argparse.Namespace) -> None:
+    from .benchmarks import bench_youtube_transports, format_table
+
+    results = bench_youtube_transports(
+        channels=args.channels,
+        latency=args.latency_ms / 1000.0,
+        workers=args.workers
+    )
+    print(format_table(results, ["transport", "workers", "seconds", "channels_per_sec", "requests", "videos", "same_result"]))
+
+def run_bench_llm(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    import json
+    from .benchmarks import bench_llm, format_table
+    from .stub_servers import StubLLMServer
+
+    columns = [
+        "endpoint", "model", "requests", "failure_rate", "ttft_p50_ms", "latency_p50_ms", "latency_p90_ms",
+        "latency_p99_ms", "prompt_tok_s", "completion_tok_s", "stability", "intent_accuracy", "intent_p50_ms"
+    ]
+    stub = None
+    if args.stub:
+        stub = StubLLMServer(
+            latency=args.stub_latency_ms / 1000.0,
+            tokens_per_sec=args.stub_tokens_per_sec,
+            prompt_tokens_per_sec=20000,
+            failure_rate=args.stub_failure_rate,
+            seed=0
+        ).start()
+        api_bases, models = [stub.url], args.model or ["stub-model"]
+    else:
+        llm = load_config(args.config).llm if args.config else None
+        api_bases = args.api_base or ([llm.api_base] if llm else None)
+        models = args.model or ([llm.model] if llm else None)
+        if not api_bases or not models:
+            parser.error("bench-llm needs --stub, --config, or --api-base and --model")
+    try:
+        results = bench_llm([(api_base, model) for api_base in api_bases for model in models], repeats=args.repeats)
+    finally:
+        if stub is not None:
+            stub.stop()
+    print(format_table(results, columns))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+def run_loadtest(args: argparse.Namespace) -> None:
+    import json
+    from .loadtest import LoadTest, format_results, parse_mix
+
+    if not args.verbose:
+        # Per-message logging would drown the results and slow the agent down
+        logging.getLogger("yt_agent").setLevel(logging.ERROR)
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+    results = LoadTest(
+        duration=args.duration,
+        rate=args.rate,
+        chats=args.chats,
+        authorized_share=args.authorized_share,
+        mix=parse_mix(args.mix) if args.mix else None,
+        cooldown=args.cooldown,
+        llm_latency=args.llm_latency_ms / 1000.0,
+        llm_tokens_per_sec=args.llm_tokens_per_sec,
+        youtube_latency=args.youtube_latency_ms / 1000.0,
+        channels=args.channels,
+        track_memory=not args.no_memory,
+        seed=args.seed
+    ).run()
+    print(format_results(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
 
 if __name__ == "__main__":
     main()
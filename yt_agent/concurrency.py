@@ -0,0 +1,186 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+
+class LLMCall:
+    """Measurements of one request made through an AdaptiveLimiter slot."""
+
+    def __init__(self, epoch: int, prompt_tokens: int = 0, model: str = ""):
+        self.epoch = epoch
+        self.prompt_tokens = prompt_tokens
+        self.model = model
+        self.start = time.perf_counter()
+        self.ttft: Optional[float] = None
+        self.tokens = 0
+
+    def token(self, count: int = 1) -> None:
+        """Record streamed output; the first call marks time-to-first-token."""
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self.start
+        self.tokens += count
+
+
+class AdaptiveLimiter:
+    """AIMD limit on concurrent requests to one LLM server.
+
+    Requests are counted in rounds of ``limit`` streamed completions. When a
+    round that actually used the whole limit produced more tokens per second
+    than the previous one, the limit grows by one; a clear throughput drop
+    shrinks it by one. An error or a time-to-first-token above
+    ``latency_tolerance`` x the baseline TTFT cuts the limit by ``backoff``.
+    Only requests started at the current limit can trigger a cut, so one
+    overload does not halve the limit several times over.
+
+    Prefill time grows with the prompt, so the baseline is kept per prompt
+    size bucket (powers of two in tokens) and scaled to the call's size
+    within its bucket; a long prompt is only compared with long prompts.
+    Models sharing the server (e.g. a small and a large tier) keep separate
+    baselines too, while sharing its concurrency limit.
+    """
+
+    def __init__(
+        self,
+        initial: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 8,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.5
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.in_flight = 0
+        self.completed = 0
+        self.errors = 0
+        self.ttft_ema: Optional[float] = None
+        self.latency_ema: Optional[float] = None
+        # (model, size bucket) -> (fastest TTFT, its prompt tokens)
+        self.baseline_ttft: Dict[Tuple[str, int], Tuple[float, int]] = {}
+        self.throughput = 0.0  # Tokens per second over the last full round
+        self._recent: Deque[bool] = deque(maxlen=50)
+        self._epoch = 0
+        self._cond = threading.Condition()
+        self._reset_round()
+
+    def _reset_round(self) -> None:
+        self._round_start = time.perf_counter()
+        self._round_tokens = 0
+        self._round_calls = 0
+        self._round_saturated = False
+
+    @contextmanager
+    def slot(self, prompt_tokens: int = 0, model: str = "") -> Iterator[LLMCall]:
+        """Wait for a free slot; exceptions inside the block count as errors.
+
+        ``model`` and ``prompt_tokens`` (an estimate is fine) select the TTFT baseline.
+        """
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+            if self.in_flight >= self.limit:
+                self._round_saturated = True
+            call = LLMCall(self._epoch, prompt_tokens, model)
+        try:
+            yield call
+        except BaseException:
+            self._finish(call, ok=False)
+            raise
+        self._finish(call, ok=True)
+
+    @staticmethod
+    def _ema(previous: Optional[float], value: float, alpha: float = 0.2) -> float:
+        return value if previous is None else previous + alpha * (value - previous)
+
+    def _finish(self, call: LLMCall, ok: bool) -> None:
+        latency = time.perf_counter() - call.start
+        with self._cond:
+            self.in_flight -= 1
+            self._recent.append(ok)
+            if not ok:
+                self.errors += 1
+                self._decrease(call)
+            else:
+                self.completed += 1
+                self.latency_ema = self._ema(self.latency_ema, latency)
+                if call.ttft is not None:
+                    self._observe_ttft(call)
+                if call.tokens:
+                    self._round_tokens += call.tokens
+                    self._round_calls += 1
+                    if self._round_calls >= self.limit:
+                        self._end_round()
+            self._cond.notify_all()
+
+    @staticmethod
+    def _bucket(call: LLMCall) -> Tuple[str, int]:
+        return call.model, max(1, call.prompt_tokens).bit_length()
+
+    def _observe_ttft(self, call: LLMCall) -> None:
+        ttft = call.ttft
+        self.ttft_ema = self._ema(self.ttft_ema, ttft)
+        bucket = self._bucket(call)
+        baseline = self.baseline_ttft.get(bucket)
+        if baseline is None or ttft < baseline[0]:
+            self.baseline_ttft[bucket] = (ttft, call.prompt_tokens)
+            return
+        baseline_ttft, baseline_tokens = baseline
+        if self.limit == self.min_limit:
+            # Not caused by our load, e.g. a slower model was loaded: make it the new normal.
+            baseline_ttft += (ttft - baseline_ttft) * 0.1
+            self.baseline_ttft[bucket] = (baseline_ttft, baseline_tokens)
+        # Up to 2x the baseline's prompt within a bucket; assume prefill time grows at most linearly
+        expected = baseline_ttft * max(1.0, call.prompt_tokens / max(1, baseline_tokens))
+        if ttft > expected * self.latency_tolerance:
+            self._decrease(call)
+
+    def _end_round(self) -> None:
+        elapsed = time.perf_counter() - self._round_start
+        throughput = self._round_tokens / elapsed if elapsed > 0 else 0.0
+        if self._round_saturated:
+            if throughput > self.throughput * 1.05 and self.limit < self.max_limit:
+                self.limit += 1
+            elif throughput < self.throughput * 0.8 and self.limit > self.min_limit:
+                self.limit -= 1
+        self.throughput = throughput
+        self._reset_round()
+
+    def _decrease(self, call: LLMCall) -> None:
+        if call.epoch != self._epoch:
+            return
+        self._epoch += 1
+        self.limit = max(self.min_limit, int(self.limit * self.backoff))
+        self.throughput = 0.0
+        self._reset_round()
+
+    @property
+    def error_rate(self) -> float:
+        with self._cond:
+            return (len(self._recent) - sum(self._recent)) / len(self._recent) if self._recent else 0.0
+
+    def metrics(self) -> Dict[str, Any]:
+        error_rate = self.error_rate
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "errors": self.errors,
+                "error_rate": error_rate,
+                "ttft_ms": None if self.ttft_ema is None else self.ttft_ema * 1000,
+                "latency_ms": None if self.latency_ema is None else self.latency_ema * 1000,
+                "tokens_per_sec": self.throughput
+            }
+
+    def summary(self) -> str:
+        m = self.metrics()
+        ttft = f"{m['ttft_ms']:.0f}ms" if m["ttft_ms"] is not None else "n/a"
+        return (
+            f"limit {m['limit']} ({m['in_flight']} in flight), TTFT {ttft}, "
+            f"{m['tokens_per_sec']:.1f} tok/s, errors {m['error_rate']:.0%}"
+        )
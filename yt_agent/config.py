@@ -1,12 +1,19 @@
 import os
 import yaml
-from dataclasses import dataclass
-from typing import Optional, Union
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
 
 @dataclass
 class RunConfig:
     timezone: str = "UTC"
     max_videos_per_channel: int = 1
+    data_dir: str = "data"
+    profile_dir: Optional[str] = None  # Defaults to <data_dir>/profiles
+    profile_memory: bool = False
+    watch_config: bool = True  # Bot mode: reload config.yaml when it changes
+    time_budget: Optional[float] = None  # Seconds a review may take; summaries degrade to meet it
+    resume_interrupted: bool = True  # Finish a review cut short by a crash or restart on the next run
+    resume_max_age: float = 12 * 3600  # Older interrupted reviews are abandoned
 
 @dataclass
 class ChannelConfig:
@@ -16,6 +23,19 @@ class ChannelConfig:
 @dataclass
 class TelegramConfig:
     chat_id: Union[str, int]
+    webhook_url: Optional[str] = None
+    webhook_host: str = "127.0.0.1"
+    webhook_port: int = 8443
+    webhook_path: str = "/telegram/webhook"
+    webhook_secret: Optional[str] = None
+    api_base: str = "https://api.telegram.org"  # Bot API server (e.g. a local stub for load tests)
+
+@dataclass
+class LLMEndpoint:
+    api_base: str
+    weight: float = 1.0
+    capabilities: Optional[List[str]] = None  # e.g. ["intent", "summarize", "embed"]; None means all
+    model: Optional[str] = None  # Defaults to llm.model
 
 @dataclass
 class LLMConfig:
@@ -27,10 +47,61 @@ class LLMConfig:
     include_links: bool = True
     group_by_channel: bool = True
     title: str = "YouTube Daily Review"
+    max_transcript_chars: Optional[int] = 60000  # Longer transcripts are evenly sampled down; None keeps everything
+    max_concurrency: int = 4  # Upper bound for the adaptive number of parallel LLM requests (per endpoint)
+    endpoints: List[LLMEndpoint] = field(default_factory=list)  # Defaults to [api_base]
+    health_interval: float = 30.0
+    small_model: Optional[str] = None  # Fast model for intents and short videos; None disables the cascade
+    small_model_max_chars: int = 8000  # Transcripts up to this length go to small_model
+    escalate_invalid: bool = True  # Retry with the main model when small_model's output fails validation
+    pack_videos: bool = True  # Summarize several short videos per request
+    pack_max_video_tokens: int = 1500  # Videos up to this (estimated) size count as short
+    pack_max_tokens: int = 6000  # Content budget of one packed request
+    pack_max_videos: int = 8
 
 @dataclass
 class YouTubeConfig:
     api_key: Optional[str] = None
+    daily_quota: int = 10000
+    search_reserve: int = 1000
+    transport: str = "discovery"
+    api_base: Optional[str] = None
+    max_workers: int = 4
+
+@dataclass
+class QueueConfig:
+    enabled: bool = False  # Run reviews through the job queue and `worker` processes
+    path: Optional[str] = None  # Defaults to <data_dir>/jobs.sqlite3
+    visibility_timeout: float = 900  # Seconds before a claimed job is handed to another worker
+    max_attempts: int = 3
+    poll_interval: float = 1.0
+    run_timeout: float = 3600  # Report whatever finished after this long
+
+@dataclass
+class PrefetchConfig:
+    enabled: bool = False  # Bot mode: prepare transcripts for new uploads in the background
+    interval: float = 1800
+    summaries: bool = False  # Also pre-generate summaries
+    min_quota: int = 2000  # Leave this much YouTube quota for on-demand reviews
+    transcript_days: Optional[float] = 14  # Drop stored transcripts fetched longer ago; None keeps them
+
+@dataclass
+class DedupConfig:
+    enabled: bool = False  # Summarize near-identical uploads on different channels once
+    threshold: float = 0.8  # Cosine similarity of content fingerprints that counts as the same video
+
+@dataclass
+class ArchiveConfig:
+    enabled: bool = True  # Keep every summary searchable with /search
+    embedding_model: Optional[str] = None  # Embedding model on the LLM endpoints; None uses hashed features
+    hashed_dim: int = 512
+    top_k: int = 5
+
+@dataclass
+class DigestConfig:
+    max_sentences: int = 4  # Per channel and period
+    pack_max_tokens: int = 6000  # Content budget of one packed rollup request
+    pack_max_channels: int = 30
 
 @dataclass
 class Config:
@@ -38,6 +109,11 @@ class Config:
     telegram: TelegramConfig
     llm: LLMConfig
     youtube: YouTubeConfig
+    queue: QueueConfig = field(default_factory=QueueConfig)
+    prefetch: PrefetchConfig = field(default_factory=PrefetchConfig)
+    dedup: DedupConfig = field(default_factory=DedupConfig)
+    archive: ArchiveConfig = field(default_factory=ArchiveConfig)
+    digest: DigestConfig = field(default_factory=DigestConfig)
 
 def load_config(path: str) -> Config:
     if not os.path.exists(path):
@@ -52,7 +128,14 @@ def load_config(path: str) -> Config:
     run_data = data.get('run', {})
     run_config = RunConfig(
         timezone=run_data.get('timezone', 'UTC'),
-        max_videos_per_channel=run_data.get('max_videos_per_channel', 1)
+        max_videos_per_channel=run_data.get('max_videos_per_channel', 1),
+        data_dir=run_data.get('data_dir', "data"),
+        profile_dir=run_data.get('profile_dir'),
+        profile_memory=run_data.get('profile_memory', False),
+        watch_config=run_data.get('watch_config', True),
+        time_budget=run_data.get('time_budget'),
+        resume_interrupted=run_data.get('resume_interrupted', True),
+        resume_max_age=run_data.get('resume_max_age', 12 * 3600)
     )
 
 
@@ -61,7 +144,16 @@ def load_config(path: str) -> Config:
     chat_id = telegram_data.get('chat_id')
     if not chat_id:
         raise ValueError("telegram.chat_id is required in config")
-    telegram_config = TelegramConfig(chat_id=chat_id)
+    telegram_config = TelegramConfig(
+        chat_id=chat_id,
+        webhook_url=telegram_data.get('webhook_url'),
+        webhook_host=telegram_data.get('webhook_host', "127.0.0.1"),
+        webhook_port=int(telegram_data.get('webhook_port', 8443)),
+        webhook_path=telegram_data.get('webhook_path', "/telegram/webhook"),
+        # The secret token is a credential, so it only comes from the environment
+        webhook_secret=os.environ.get('TELEGRAM_WEBHOOK_SECRET'),
+        api_base=telegram_data.get('api_base', "https://api.telegram.org")
+    )
 
     # LLM
     llm_data = data.get('llm', {})
@@ -70,6 +162,21 @@ def load_config(path: str) -> Config:
     api_base = os.environ.get('LMSTUDIO_API_BASE', llm_data.get('api_base', "http://127.0.0.1:1234"))
     model = os.environ.get('LMSTUDIO_MODEL', llm_data.get('model', "local-model"))
 
+    endpoints = []
+    for entry in llm_data.get('endpoints') or []:
+        if isinstance(entry, str):
+            entry = {'api_base': entry}
+        if not entry.get('api_base'):
+            raise ValueError("Each llm.endpoints entry needs an api_base")
+        endpoints.append(LLMEndpoint(
+            api_base=entry['api_base'],
+            weight=float(entry.get('weight', 1.0)),
+            capabilities=entry.get('capabilities'),
+            model=entry.get('model')
+        ))
+    if not endpoints:
+        endpoints = [LLMEndpoint(api_base=api_base)]
+
     llm_config = LLMConfig(
         api_base=api_base,
         model=model,
@@ -78,17 +185,84 @@ def load_config(path: str) -> Config:
         language=llm_data.get('language', 'en'),
         include_links=llm_data.get('include_links', True),
         group_by_channel=llm_data.get('group_by_channel', True),
-        title=llm_data.get('title', "YouTube Daily Review")
+        title=llm_data.get('title', "YouTube Daily Review"),
+        max_transcript_chars=llm_data.get('max_transcript_chars', 60000),
+        max_concurrency=llm_data.get('max_concurrency', 4),
+        endpoints=endpoints,
+        health_interval=llm_data.get('health_interval', 30.0),
+        small_model=os.environ.get('LMSTUDIO_SMALL_MODEL', llm_data.get('small_model')),
+        small_model_max_chars=llm_data.get('small_model_max_chars', 8000),
+        escalate_invalid=llm_data.get('escalate_invalid', True),
+        pack_videos=llm_data.get('pack_videos', True),
+        pack_max_video_tokens=llm_data.get('pack_max_video_tokens', 1500),
+        pack_max_tokens=llm_data.get('pack_max_tokens', 6000),
+        pack_max_videos=llm_data.get('pack_max_videos', 8)
     )
 
     # YouTube
+    youtube_data = data.get('youtube', {})
     youtube_config = YouTubeConfig(
-        api_key=os.environ.get('YOUTUBE_API_KEY')
+        api_key=os.environ.get('YOUTUBE_API_KEY'),
+        daily_quota=youtube_data.get('daily_quota', 10000),
+        search_reserve=youtube_data.get('search_reserve', 1000),
+        transport=youtube_data.get('transport', "discovery"),
+        api_base=youtube_data.get('api_base'),
+        max_workers=youtube_data.get('max_workers', 4)
+    )
+
+    # Job queue
+    queue_data = data.get('queue', {})
+    queue_config = QueueConfig(
+        enabled=queue_data.get('enabled', False),
+        path=queue_data.get('path'),
+        visibility_timeout=queue_data.get('visibility_timeout', 900),
+        max_attempts=queue_data.get('max_attempts', 3),
+        poll_interval=queue_data.get('poll_interval', 1.0),
+        run_timeout=queue_data.get('run_timeout', 3600)
+    )
+
+    # Background prefetch
+    prefetch_data = data.get('prefetch', {})
+    prefetch_config = PrefetchConfig(
+        enabled=prefetch_data.get('enabled', False),
+        interval=prefetch_data.get('interval', 1800),
+        summaries=prefetch_data.get('summaries', False),
+        min_quota=prefetch_data.get('min_quota', 2000),
+        transcript_days=prefetch_data.get('transcript_days', 14)
+    )
+
+    # Duplicate detection
+    dedup_data = data.get('dedup', {})
+    dedup_config = DedupConfig(
+        enabled=dedup_data.get('enabled', False),
+        threshold=float(dedup_data.get('threshold', 0.8))
+    )
+
+    # Summary archive
+    archive_data = data.get('archive', {})
+    archive_config = ArchiveConfig(
+        enabled=archive_data.get('enabled', True),
+        embedding_model=os.environ.get('LMSTUDIO_EMBEDDING_MODEL', archive_data.get('embedding_model')),
+        hashed_dim=int(archive_data.get('hashed_dim', 512)),
+        top_k=int(archive_data.get('top_k', 5))
+    )
+
+    # Weekly/monthly digests
+    digest_data = data.get('digest', {})
+    digest_config = DigestConfig(
+        max_sentences=int(digest_data.get('max_sentences', 4)),
+        pack_max_tokens=int(digest_data.get('pack_max_tokens', 6000)),
+        pack_max_channels=int(digest_data.get('pack_max_channels', 30))
     )
 
     return Config(
         run=run_config,
         telegram=telegram_config,
         llm=llm_config,
-        youtube=youtube_config
+        youtube=youtube_config,
+        queue=queue_config,
+        prefetch=prefetch_config,
+        dedup=dedup_config,
+        archive=archive_config,
+        digest=digest_config
     )
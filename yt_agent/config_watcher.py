@@ -0,0 +1,51 @@
+import logging
+import os
+import threading
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigWatcher:
+    """Polls a config file's modification time and calls ``on_change`` when it changes.
+
+    Polling a single ``os.stat`` every few seconds is cheap and works the same
+    on every platform, including editors that save via rename.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[], None], interval: float = 2.0):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature = self._stat()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def start(self) -> "ConfigWatcher":
+        self._thread = threading.Thread(target=self._run, daemon=True, name="config-watcher")
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            signature = self._stat()
+            if signature is None or signature == self._signature:
+                continue
+            self._signature = signature
+            logger.info(f"Config file changed: {self.path}")
+            try:
+                self.on_change()
+            except Exception as e:
+                logger.error(f"Config reload failed: {e}", exc_info=True)
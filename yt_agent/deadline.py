@@ -0,0 +1,71 @@
+import math
+import time
+from typing import Optional
+
+# Degradation levels, from the full summary down to no LLM call at all
+FULL = "full"
+REDUCED = "reduced"  # Small model (if configured) and fewer sentences
+DESCRIPTION = "description"  # Summarized from title and description, transcript skipped
+HEADLINE = "headline"  # Title and description snippet only
+
+LEVELS = [FULL, REDUCED, DESCRIPTION, HEADLINE]
+
+
+class Deadline:
+    """Time budget of one review and the degradation ladder it drives.
+
+    While more than half of the budget is left, videos get full summaries;
+    below half they are reduced, below a quarter they are written from the
+    description only, and once the budget is used up (or a request would
+    not finish in time) only headlines are reported. ``reserve`` seconds are
+    kept back for sending the report. Without a budget everything is FULL.
+    """
+
+    # (fraction of the working budget left, richest level allowed)
+    LADDER = [(0.5, FULL), (0.25, REDUCED), (0.0, DESCRIPTION)]
+
+    def __init__(self, budget: Optional[float], reserve: Optional[float] = None):
+        self.budget = budget if budget and budget > 0 else None
+        self.start = time.monotonic()
+        if reserve is None:
+            reserve = min(15.0, self.budget * 0.1) if self.budget else 0.0
+        self.reserve = reserve
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget is not None
+
+    def _working_budget(self) -> float:
+        return max(self.budget - self.reserve, 1e-9)
+
+    def remaining(self) -> float:
+        """Seconds left until results must be in (the report reserve excluded)."""
+        if self.budget is None:
+            return math.inf
+        return self._working_budget() - (time.monotonic() - self.start)
+
+    def until(self, level: str) -> float:
+        """Seconds until the ladder reaches ``level`` (0 if it already has)."""
+        if self.budget is None or level == FULL:
+            return math.inf
+        if level == HEADLINE:
+            return max(0.0, self.remaining())
+        threshold = next(fraction for fraction, allowed in reversed(self.LADDER) if LEVELS.index(allowed) < LEVELS.index(level))
+        return max(0.0, self.remaining() - threshold * self._working_budget())
+
+    def level(self, expected_latency: Optional[float] = None) -> str:
+        """Richest level for work starting now.
+
+        ``expected_latency`` is the typical duration of one LLM request; if it
+        would overrun the budget, the LLM is skipped.
+        """
+        if self.budget is None:
+            return FULL
+        left = self.remaining()
+        if left <= 0 or (expected_latency is not None and expected_latency > left):
+            return HEADLINE
+        fraction = left / self._working_budget()
+        for threshold, allowed in self.LADDER:
+            if fraction > threshold:
+                return allowed
+        return DESCRIPTION
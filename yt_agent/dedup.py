@@ -0,0 +1,87 @@
+import string
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Punctuation becomes whitespace, so "word," and "word" hash alike
+_PUNCTUATION = str.maketrans(string.punctuation, " " * len(string.punctuation))
+
+
+def word_hashes(text: str, max_words: int) -> np.ndarray:
+    """Stable (CRC32) hashes of the first ``max_words`` lowercased words of ``text``."""
+    # Words average well under 12 characters; avoid tokenizing a whole transcript.
+    words = text[:max_words * 12].lower().translate(_PUNCTUATION).split()[:max_words]
+    return np.fromiter(map(zlib.crc32, map(str.encode, words)), dtype=np.uint64, count=len(words))
+
+
+class Fingerprinter:
+    """Hashed word-bigram sets as L2-normalized vectors.
+
+    A vector marks which bigram buckets occur (not how often, so filler like
+    "of the" does not dominate); the dot product of two vectors is their
+    cosine similarity. Word hashes are stable across processes (CRC32). Only
+    the first ``max_words`` words of a text are used, which is enough to tell
+    a re-upload from a different video. Texts under ``min_words`` words get a
+    zero vector, which matches nothing.
+    """
+
+    def __init__(self, dim: int = 1024, max_words: int = 600, min_words: int = 20):
+        self.dim = dim
+        self.max_words = max_words
+        self.min_words = min_words
+
+    def vector(self, text: str) -> np.ndarray:
+        words = word_hashes(text, self.max_words)
+        if len(words) < max(self.min_words, 2):
+            return np.zeros(self.dim, dtype=np.float32)
+        buckets = (words[:-1] * np.uint64(1000003) ^ words[1:]) % np.uint64(self.dim)
+        vector = (np.bincount(buckets.astype(np.int64), minlength=self.dim) > 0).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def matrix(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.vstack([self.vector(text) for text in texts])
+
+
+def duplicate_groups(
+    vectors: np.ndarray,
+    threshold: float = 0.9,
+    labels: Optional[Sequence[str]] = None,
+    block: int = 512
+) -> List[List[int]]:
+    """Groups of row indices whose cosine similarity reaches ``threshold``.
+
+    Rows with the same label (e.g. channel) are never paired. Similarities
+    are computed ``block`` rows at a time to bound memory. Returns only groups
+    with more than one member, each sorted, ordered by their first index.
+    """
+    count = len(vectors)
+    parent = list(range(count))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    label_ids = None
+    if labels is not None:
+        _, label_ids = np.unique(np.asarray(labels), return_inverse=True)
+    for start in range(0, count, block):
+        similar = vectors[start:start + block] @ vectors.T >= threshold
+        rows = np.arange(start, min(start + block, count))
+        # Each pair once, never a video with itself
+        similar &= np.arange(count)[None, :] > rows[:, None]
+        if label_ids is not None:
+            similar &= label_ids[None, :] != label_ids[rows][:, None]
+        for row, column in zip(*np.nonzero(similar)):
+            a, b = find(start + int(row)), find(int(column))
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(count):
+        groups.setdefault(find(index), []).append(index)
+    return [members for members in groups.values() if len(members) > 1]
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .config import Config
+from .langchain_utils import LARGE, SMALL
+from .llm_client import LLMClient
+from .pipeline import estimate_tokens, plan_batches
+from .store import ReviewStore
+
+logger = logging.getLogger(__name__)
+
+# Digest periods: ISO weeks ("2026-W41") and calendar months ("2026-10")
+WEEK = "week"
+MONTH = "month"
+PERIODS = [WEEK, MONTH]
+
+_WEEK_KEY = re.compile(r"^(\d{4})-W(\d{1,2})$")
+_MONTH_KEY = re.compile(r"^(\d{4})-(\d{1,2})$")
+
+
+def week_key(day: date) -> str:
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def week_start(key: str) -> date:
+    year, week = _WEEK_KEY.match(key).groups()
+    return date.fromisocalendar(int(year), int(week), 1)
+
+
+def month_weeks(key: str) -> List[str]:
+    """The ISO weeks of a month: those whose Thursday falls in it."""
+    year, month = (int(part) for part in _MONTH_KEY.match(key).groups())
+    day = date(year, month, 1)
+    day += timedelta(days=(3 - day.weekday()) % 7)  # First Thursday
+    weeks = []
+    while day.month == month:
+        weeks.append(week_key(day))
+        day += timedelta(days=7)
+    return weeks
+
+
+def resolve_period(spec: str, today: date) -> Tuple[str, str]:
+    """(kind, key) for ``week``/``month`` (the last complete one) or an explicit key like 2026-W41 or 2026-10."""
+    period = spec.strip().upper()
+    if period == "WEEK":
+        return WEEK, week_key(today - timedelta(days=7))
+    if period == "MONTH":
+        last = today.replace(day=1) - timedelta(days=1)
+        return MONTH, f"{last.year}-{last.month:02d}"
+    try:
+        match = _WEEK_KEY.match(period)
+        if match:
+            year, week = int(match.group(1)), int(match.group(2))
+            date.fromisocalendar(year, week, 1)
+            return WEEK, f"{year}-W{week:02d}"
+        match = _MONTH_KEY.match(period)
+        if match:
+            year, month = int(match.group(1)), int(match.group(2))
+            date(year, month, 1)
+            return MONTH, f"{year}-{month:02d}"
+    except ValueError:
+        pass
+    raise ValueError(f"Unknown digest period '{spec.strip()}' (use week, month, or e.g. 2026-W41 / 2026-10)")
+
+
+def period_label(kind: str, key: str) -> str:
+    if kind == MONTH:
+        year, month = (int(part) for part in _MONTH_KEY.match(key).groups())
+        return date(year, month, 1).strftime("%B %Y")
+    start = week_start(key)
+    end = start + timedelta(days=6)
+    return f"{start.strftime('%b %d')} – {end.strftime('%b %d, %Y')}"
+
+
+class DigestBuilder:
+    """Builds weekly and monthly digests hierarchically from stored summaries.
+
+    The summaries of a channel's videos from one ISO week are reduced to a
+    weekly rollup; a month reduces the weekly rollups of its weeks. Rollups
+    are cached in the ReviewStore with a fingerprint of their inputs, so
+    only channels with new summaries cost an LLM call, and the reductions
+    of many channels are packed into each request.
+    """
+
+    def __init__(self, store: ReviewStore, llm_client: LLMClient, config: Config):
+        self.store = store
+        self.llm_client = llm_client
+        self.config = config
+        try:
+            self.tz = ZoneInfo(config.run.timezone)
+        except ZoneInfoNotFoundError:
+            self.tz = timezone.utc
+        # Rollups depend on these as well as on their inputs
+        self._settings = [config.llm.model, config.llm.language, config.digest.max_sentences]
+
+    def build(self, kind: str, key: str) -> Dict[str, Any]:
+        """The digest of a period: label, LLM request count and per-channel entries (channel, videos, text)."""
+        counts = self.llm_client.lc_utils.tier_counts
+        requests_before = counts[LARGE] + counts[SMALL]
+        weeks = month_weeks(key) if kind == MONTH else [key]
+        weekly: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        tasks = []
+        for week in weeks:
+            weekly[week], week_tasks = self._plan(week, period_label(WEEK, week), self._week_parts(week))
+            tasks.extend(week_tasks)
+        # The weeks of a month are reduced together, packed into the same requests
+        self._reduce(tasks)
+        rollups = weekly[key] if kind == WEEK else self._month(key, weekly)
+
+        channels = [
+            {"channel": channel, "videos": rollup["videos"], "text": rollup["text"]}
+            for channel, rollup in rollups.items()
+        ]
+        channels.sort(key=lambda entry: (-entry["videos"], entry["channel"].lower()))
+        requests_used = counts[LARGE] + counts[SMALL] - requests_before
+        logger.info(f"Digest {key}: {len(channels)} channels, {requests_used} LLM requests")
+        return {"kind": kind, "period": key, "label": period_label(kind, key), "channels": channels, "llm_requests": requests_used}
+
+    def _utc(self, day: date) -> str:
+        return datetime.combine(day, time(0), tzinfo=self.tz).astimezone(timezone.utc).isoformat()
+
+    def _week_parts(self, week: str) -> Dict[str, List[Dict[str, Any]]]:
+        start = week_start(week)
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for row in self.store.summaries_published(self._utc(start), self._utc(start + timedelta(days=7))):
+            groups.setdefault(row["channel"], []).append({
+                "id": row["video_id"],
+                "text": row["summary"],
+                "line": f"{row['title']}: {row['summary']}",
+                "videos": 1
+            })
+        return groups
+
+    def _month(self, month: str, weekly: Dict[str, Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for week, rollups in weekly.items():
+            for channel, rollup in rollups.items():
+                if rollup["text"] is None:
+                    continue
+                groups.setdefault(channel, []).append({
+                    "id": week,
+                    "text": rollup["text"],
+                    "line": f"{period_label(WEEK, week)}: {rollup['text']}",
+                    "videos": rollup["videos"]
+                })
+        rollups, tasks = self._plan(month, period_label(MONTH, month), groups)
+        self._reduce(tasks)
+        return rollups
+
+    def _fingerprint(self, parts: List[Dict[str, Any]]) -> str:
+        inputs = [self._settings, [(part["id"], part["text"]) for part in parts]]
+        return hashlib.sha1(json.dumps(inputs).encode("utf-8")).hexdigest()[:12]
+
+    def _plan(
+        self,
+        period: str,
+        label: str,
+        groups: Dict[str, List[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+        """Rollups of a period by channel, cached ones filled in, and the tasks that compute the rest.
+
+        ``groups`` maps each channel to the parts (id, text, line, videos)
+        it is reduced from. A single part needs no reduction.
+        """
+        cached = self.store.get_rollups(period)
+        rollups: Dict[str, Dict[str, Any]] = {}
+        tasks = []
+        for channel, parts in groups.items():
+            fingerprint = self._fingerprint(parts)
+            hit = cached.get(channel)
+            if hit is not None and hit["fingerprint"] == fingerprint:
+                rollups[channel] = hit
+                continue
+            rollups[channel] = {
+                "fingerprint": fingerprint,
+                "videos": sum(part["videos"] for part in parts),
+                "text": parts[0]["text"] if len(parts) == 1 else None
+            }
+            tasks.append({
+                "channel": channel,
+                "period": period,
+                "label": label,
+                "lines": [part["line"] for part in parts],
+                "rollup": rollups[channel]
+            })
+        return rollups, tasks
+
+    def _reduce(self, tasks: List[Dict[str, Any]]) -> None:
+        """Fill in and cache the rollup of each task, packing many channels into each LLM request."""
+        pending = [task for task in tasks if task["rollup"]["text"] is None]
+        if pending:
+            digest = self.config.digest
+            groups = [
+                {"id": f"c{index}", "name": task["channel"], "period": task["label"], "items": task["lines"]}
+                for index, task in enumerate(pending, 1)
+            ]
+            batches = plan_batches(
+                [estimate_tokens("\n".join(group["items"])) for group in groups],
+                digest.pack_max_tokens, digest.pack_max_tokens, digest.pack_max_channels
+            )
+            workers = max(1, min(len(batches), self.llm_client.lc_utils.router.max_parallel("summarize")))
+            texts: Dict[str, str] = {}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for result in executor.map(
+                    lambda batch: self.llm_client.generate_rollups(
+                        [groups[index] for index in batch], digest.max_sentences, self.config.llm.language
+                    ),
+                    batches
+                ):
+                    texts.update(result)
+            for group, task in zip(groups, pending):
+                task["rollup"]["text"] = texts.get(group["id"])
+            failed = sum(1 for task in pending if task["rollup"]["text"] is None)
+            if failed:
+                logger.warning(f"Could not roll up {failed} of {len(pending)} channel periods")
+        self.store.put_rollups([
+            (task["channel"], task["period"], task["rollup"]) for task in tasks if task["rollup"]["text"] is not None
+        ])
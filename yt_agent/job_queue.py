@@ -0,0 +1,175 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    job_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    visible_at REAL NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (run_id, kind, job_key)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, visible_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_run ON jobs (run_id, status);
+"""
+
+
+@dataclass
+class Job:
+    id: int
+    run_id: str
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class JobQueue:
+    """Durable local job queue on SQLite, shared by the bot and worker processes.
+
+    A claimed job is leased for ``visibility_timeout`` seconds; if its worker
+    dies, the lease expires and another worker picks it up. Jobs are retried
+    until ``max_attempts`` and then marked failed. ``(run_id, kind, job_key)``
+    is unique, so re-enqueueing after a crash does not duplicate work.
+    """
+
+    def __init__(self, path: str, visibility_timeout: float = 900, max_attempts: int = 3, retry_delay: float = 5.0):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(self, run_id: str, kind: str, job_key: str, payload: Dict[str, Any]) -> bool:
+        """Add a job; returns False if an identical job already exists for this run."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (run_id, kind, job_key, payload, visible_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, kind, job_key, json.dumps(payload), now, now, now)
+            )
+            return cursor.rowcount > 0
+
+    def claim(self, kinds: Optional[Sequence[str]] = None) -> Optional[Job]:
+        """Lease the oldest visible job (optionally of the given kinds)."""
+        now = time.time()
+        kind_filter = ""
+        params: List[Any] = [QUEUED, RUNNING, now]
+        if kinds:
+            kind_filter = f" AND kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                while True:
+                    row = self._conn.execute(
+                        "SELECT id, run_id, kind, payload, attempts FROM jobs "
+                        f"WHERE status IN (?, ?) AND visible_at <= ?{kind_filter} ORDER BY id LIMIT 1",
+                        params
+                    ).fetchone()
+                    if row is None:
+                        self._conn.execute("COMMIT")
+                        return None
+                    job_id, run_id, kind, payload, attempts = row
+                    if attempts >= self.max_attempts:
+                        # Its last lease expired without completion.
+                        self._conn.execute(
+                            "UPDATE jobs SET status = ?, error = COALESCE(error, 'lease expired'), updated_at = ? WHERE id = ?",
+                            (FAILED, now, job_id)
+                        )
+                        continue
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, visible_at = ?, updated_at = ? WHERE id = ?",
+                        (RUNNING, now + self.visibility_timeout, now, job_id)
+                    )
+                    self._conn.execute("COMMIT")
+                    return Job(id=job_id, run_id=run_id, kind=kind, payload=json.loads(payload), attempts=attempts + 1)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def complete(self, job: Job, result: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, updated_at = ? WHERE id = ?",
+                (DONE, json.dumps(result), time.time(), job.id)
+            )
+
+    def fail(self, job: Job, error: str) -> None:
+        """Record a failed attempt; the job is retried later unless attempts are used up."""
+        now = time.time()
+        final = job.attempts >= self.max_attempts
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, visible_at = ?, updated_at = ? WHERE id = ?",
+                (FAILED if final else QUEUED, error[:1000], now + self.retry_delay * job.attempts, now, job.id)
+            )
+        if final:
+            logger.error(f"Job {job.id} ({job.kind}) failed permanently: {error}")
+
+    def run_counts(self, run_id: str) -> Dict[str, Dict[str, int]]:
+        """Job counts per kind and status for one run."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, status, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY kind, status",
+                (run_id,)
+            ).fetchall()
+        counts: Dict[str, Dict[str, int]] = {}
+        for kind, status, count in rows:
+            counts.setdefault(kind, {})[status] = count
+        return counts
+
+    def is_run_finished(self, run_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE run_id = ? AND status IN (?, ?)",
+                (run_id, QUEUED, RUNNING)
+            ).fetchone()
+        return row[0] == 0
+
+    def unfinished(self, run_id: str, kind: str) -> List[Dict[str, Any]]:
+        """Payloads of queued or running jobs of one kind, in enqueue order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM jobs WHERE run_id = ? AND kind = ? AND status IN (?, ?) ORDER BY id",
+                (run_id, kind, QUEUED, RUNNING)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def results(self, run_id: str, kind: str) -> List[Any]:
+        """Results of completed jobs of one kind, in enqueue order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM jobs WHERE run_id = ? AND kind = ? AND status = ? ORDER BY id",
+                (run_id, kind, DONE)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
@@ -1,27 +1,45 @@
 import logging
 import json
-from typing import Dict, Any, Optional
+import threading
+from typing import Callable, Dict, Any, List, Optional, Set
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 
+from .concurrency import AdaptiveLimiter
+from .config import LLMConfig, LLMEndpoint
+from .llm_router import LLMBackend, LLMRouter
+
 
 logger = logging.getLogger(__name__)
 
+INTENT_ACTIONS = {"ADD_CHANNEL", "REMOVE_CHANNEL", "LIST_CHANNELS", "RUN_REVIEW", "SEARCH", "STATUS", "HELP", "UNKNOWN"}
+SUMMARY_ERROR = "Error generating summary."
+REFUSAL_PREFIXES = ("i'm sorry", "i am sorry", "i cannot", "i can't", "as an ai")
+
+# Model tiers
+SMALL = "small"
+LARGE = "large"
+
 class LangChainUtils:
-    def __init__(self, api_base: str, model: str, temperature: float = 0.0):
-        # Helper to ensure unique /v1 suffix
-        base = api_base.rstrip('/')
-        if not base.endswith('/v1'):
-            base += '/v1'
-            
-        self.llm = ChatOpenAI(
-            base_url=base,  # OpenAI compatible
-            api_key="lm-studio",  # Dummy key for local LLM
-            model=model,
-            temperature=temperature
-        )
-        
+    def __init__(
+        self,
+        api_base: str = "http://127.0.0.1:1234",
+        model: str = "local-model",
+        temperature: float = 0.0,
+        max_concurrency: int = 4,
+        endpoints: Optional[List[LLMEndpoint]] = None,
+        health_interval: float = 30.0,
+        small_model: Optional[str] = None,
+        small_max_chars: int = 8000,
+        escalate_invalid: bool = True
+    ):
+        # Cascade: the small model takes intents and short transcripts, the large one the rest
+        self.small_model = small_model
+        self.small_max_chars = small_max_chars
+        self.escalate_invalid = escalate_invalid
+        self.tier_counts: Dict[str, int] = {SMALL: 0, LARGE: 0, "escalated": 0}
+        self._counts_lock = threading.Lock()  # Summaries are generated from many threads
         # Intent Classifier Chain
         self.intent_parser = JsonOutputParser()
         self.intent_prompt = ChatPromptTemplate.from_messages([
@@ -35,6 +53,9 @@ class LangChainUtils:
             - LIST_CHANNELS: User wants to see the list of monitored channels.
             - RUN_REVIEW: User wants to run the review manually.
               * Examples: "check for new videos", "run review", "give me summary of latest videos", "what's new on my channels", "overview of videos", "summary of latest videos from each channel"
+            - SEARCH: User wants to find past videos about a topic.
+              - ARG: The topic, copied from the message as written.
+              * Examples: "find videos about rust async", "search for the GPT-5 launch", "which videos covered Kubernetes?"
             - STATUS: User wants to check bot status.
             - HELP: User asks for help or greeting.
             - UNKNOWN: If the intent is unclear.
@@ -47,7 +68,6 @@ class LangChainUtils:
             """),
             ("user", "{text}")
         ])
-        self.intent_chain = self.intent_prompt | self.llm | self.intent_parser
 
         # Summarization Chain
         self.summary_prompt = ChatPromptTemplate.from_messages([
@@ -66,36 +86,293 @@ class LangChainUtils:
             
             Summary:""")
         ])
-        self.summary_chain = self.summary_prompt | self.llm
+
+        # Packed summarization chain: several short videos per request, JSON out
+        self.packed_summary_prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are an assistant that summarizes YouTube video content.
+            For EACH video below, write a concise summary in {language} using at most {max_sentences} sentences.
+            
+            IMPORTANT:
+            - Summarize every video separately; never mix content between videos.
+            - If a video's 'Transcript' is missing or "N/A", summarize it from its 'Title' and 'Description'.
+            - Copy each video's id exactly as given.
+
+            Output only JSON in this format:
+            {{
+                "summaries": [
+                    {{"id": "VIDEO_ID", "summary": "..."}}
+                ]
+            }}
+            """),
+            ("user", "{videos}")
+        ])
+
+        # Digest rollups: condense the summaries of several channels per request, JSON out
+        self.rollup_prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are an assistant that writes digests of YouTube channels.
+            For EACH channel below, condense the listed summaries from its 'Period' into one digest in {language}
+            of at most {max_sentences} sentences: the main topics and anything notable.
+
+            IMPORTANT:
+            - Use only the given summaries; never mix content between channels.
+            - Copy each channel's id exactly as given.
+
+            Output only JSON in this format:
+            {{
+                "rollups": [
+                    {{"id": "CHANNEL_ID", "summary": "..."}}
+                ]
+            }}
+            """),
+            ("user", "{channels}")
+        ])
+
+        backends = []
+        for endpoint in endpoints or [LLMEndpoint(api_base=api_base)]:
+            base = self._normalize_base(endpoint.api_base)
+            tiers = {LARGE: self._build_chains(base, endpoint.model or model, temperature)}
+            if small_model:
+                tiers[SMALL] = self._build_chains(base, small_model, temperature)
+            backends.append(LLMBackend(
+                api_base=base,
+                client=tiers,
+                # Requests in flight to each server adapt to its measured speed
+                limiter=AdaptiveLimiter(initial=min(2, max_concurrency), max_limit=max_concurrency),
+                weight=endpoint.weight,
+                capabilities=endpoint.capabilities
+            ))
+        self.router = LLMRouter(backends, health_interval=health_interval)
+
+    @classmethod
+    def from_config(cls, llm_config: LLMConfig) -> "LangChainUtils":
+        return cls(
+            api_base=llm_config.api_base,
+            model=llm_config.model,
+            temperature=llm_config.temperature,
+            max_concurrency=llm_config.max_concurrency,
+            endpoints=llm_config.endpoints,
+            health_interval=llm_config.health_interval,
+            small_model=llm_config.small_model,
+            small_max_chars=llm_config.small_model_max_chars,
+            escalate_invalid=llm_config.escalate_invalid
+        )
+
+    def _build_chains(self, base: str, model: str, temperature: float) -> Dict[str, Any]:
+        llm = ChatOpenAI(
+            base_url=base,  # OpenAI compatible
+            api_key="lm-studio",  # Dummy key for local LLM
+            model=model,
+            temperature=temperature
+        )
+        return {
+            "intent": self.intent_prompt | llm | self.intent_parser,
+            "summarize": self.summary_prompt | llm,
+            "summarize_packed": self.packed_summary_prompt | llm,
+            "rollup_packed": self.rollup_prompt | llm
+        }
+
+    @staticmethod
+    def _normalize_base(api_base: str) -> str:
+        # Helper to ensure unique /v1 suffix
+        base = api_base.rstrip('/')
+        if not base.endswith('/v1'):
+            base += '/v1'
+        return base
+
+    def close(self) -> None:
+        self.router.close()
+
+    def _count(self, tier: str) -> None:
+        with self._counts_lock:
+            self.tier_counts[tier] = self.tier_counts.get(tier, 0) + 1
+
+    def cascade_summary(self) -> str:
+        with self._counts_lock:
+            counts = dict(self.tier_counts)
+        if not self.small_model:
+            return f"single model ({counts[LARGE]} calls)"
+        return f"small {counts[SMALL]} (escalated {counts['escalated']}), large {counts[LARGE]}"
+
+    @staticmethod
+    def _valid_intent(result: Any) -> bool:
+        return isinstance(result, dict) and result.get("action") in INTENT_ACTIONS
+
+    @staticmethod
+    def _valid_summary(summary: str) -> bool:
+        return len(summary.split()) >= 3 and not summary.lower().startswith(REFUSAL_PREFIXES)
+
+    def _invoke_intent(self, tier: str, text: str) -> Any:
+        self._count(tier)
+        with self.router.acquire("intent") as backend, backend.limiter.slot(model=tier):
+            return backend.client[tier]["intent"].invoke({"text": text})
 
     def classify_intent(self, text: str) -> Dict[str, Any]:
+        """The intent of a message; when classification fails, UNKNOWN with an ``error`` key."""
         try:
-            result = self.intent_chain.invoke({"text": text})
+            result = None
+            if self.small_model:
+                try:
+                    result = self._invoke_intent(SMALL, text)
+                except Exception as e:
+                    logger.warning(f"Small model intent classification failed: {e}")
+                if result is not None and not self._valid_intent(result) and self.escalate_invalid:
+                    logger.info(f"Escalating intent to the large model (small model returned {result!r})")
+                    result = None
+                if result is None:
+                    self._count("escalated")
+            if result is None:
+                result = self._invoke_intent(LARGE, text)
             
             # Validate that result is a dict with expected structure
             if not isinstance(result, dict):
                 logger.warning(f"Intent classifier returned non-dict: {type(result).__name__} = {result}")
-                return {"action": "UNKNOWN"}
+                return {"action": "UNKNOWN", "error": "answer is not a JSON object"}
             
             if "action" not in result:
                 logger.warning(f"Intent classifier returned dict without 'action' key: {result}")
-                return {"action": "UNKNOWN", **result}
+                return {"action": "UNKNOWN", **result, "error": "answer has no action"}
             
             return result
         except Exception as e:
             logger.error(f"Intent classification failed: {e}")
-            return {"action": "UNKNOWN"}
+            return {"action": "UNKNOWN", "error": str(e)}
+
+    def _stream_summary(
+        self,
+        tier: str,
+        inputs: Dict[str, Any],
+        chain: str = "summarize",
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> str:
+        self._count(tier)
+        text = ""
+        # Rough prompt size (about 4 characters per token), for the limiter's TTFT baseline
+        prompt_tokens = sum(len(str(value)) for value in inputs.values()) // 4 + 1
+        # Streamed so the limiter can measure time-to-first-token and tokens/sec
+        with self.router.acquire("summarize") as backend, backend.limiter.slot(prompt_tokens, model=tier) as call:
+            for chunk in backend.client[tier][chain].stream(inputs):
+                if chunk.content:
+                    call.token()
+                    text += chunk.content
+                    if on_token is not None:
+                        on_token(text)
+        return text.strip()
+
+    def generate_summary(
+        self,
+        title: str,
+        description: str,
+        transcript: str,
+        max_sentences: int,
+        language: str,
+        on_token: Optional[Callable[[str], None]] = None,
+        prefer_small: bool = False
+    ) -> str:
+        """Summarize one video. ``on_token`` receives the partial text as it streams in.
 
-    def generate_summary(self, title: str, description: str, transcript: str, max_sentences: int, language: str) -> str:
+        ``prefer_small`` sends it to the small model regardless of length
+        (used when a review runs short of time).
+        """
+        inputs = {
+            "title": title,
+            "description": description or "N/A",
+            "transcript": transcript or "N/A",
+            "max_sentences": max_sentences,
+            "language": language
+        }
         try:
-            response = self.summary_chain.invoke({
-                "title": title,
-                "description": description or "N/A",
-                "transcript": transcript or "N/A",
-                "max_sentences": max_sentences,
-                "language": language
-            })
-            return response.content.strip()
+            if self.small_model and (prefer_small or len(transcript or "") <= self.small_max_chars):
+                try:
+                    summary = self._stream_summary(SMALL, inputs, on_token=on_token)
+                    if self._valid_summary(summary) or not self.escalate_invalid:
+                        return summary
+                    logger.info(f"Escalating summary of '{title}' to the large model")
+                except Exception as e:
+                    logger.warning(f"Small model failed on '{title}', escalating: {e}")
+                self._count("escalated")
+            return self._stream_summary(LARGE, inputs, on_token=on_token)
         except Exception as e:
             logger.error(f"Summarization failed: {e}")
-            return "Error generating summary."
+            return SUMMARY_ERROR
+
+    def generate_summaries_packed(
+        self,
+        videos: List[Dict[str, Any]],
+        max_sentences: int,
+        language: str,
+        prefer_small: bool = False
+    ) -> Dict[str, str]:
+        """Summarize several videos (dicts with id, title, description, transcript) in one request.
+
+        Returns summaries keyed by video id. Ids the model dropped, invented or
+        garbled are left out, so the caller can summarize those one by one.
+        """
+        blocks = []
+        for video in videos:
+            blocks.append(
+                f"### Video id: {video['id']}\n"
+                f"Title: {video['title']}\n"
+                f"Description: {video.get('description') or 'N/A'}\n"
+                f"Transcript: {video.get('transcript') or 'N/A'}"
+            )
+        total_chars = sum(len(video.get("transcript") or "") for video in videos)
+        tier = SMALL if self.small_model and (prefer_small or total_chars <= self.small_max_chars) else LARGE
+        inputs = {"videos": "\n\n".join(blocks), "max_sentences": max_sentences, "language": language}
+        try:
+            parsed = self.intent_parser.parse(self._stream_summary(tier, inputs, chain="summarize_packed"))
+        except Exception as e:
+            logger.warning(f"Packed summarization of {len(videos)} videos failed: {e}")
+            return {}
+
+        wanted = {video["id"] for video in videos}
+        summaries = self._packed_entries(parsed, "summaries", wanted)
+        if len(summaries) < len(wanted):
+            logger.warning(f"Packed summary covered {len(summaries)}/{len(wanted)} videos")
+        return summaries
+
+    def _packed_entries(self, parsed: Any, key: str, wanted: Set[str]) -> Dict[str, str]:
+        """Valid ``{"id", "summary"}`` entries of a packed answer, keyed by id; unknown or repeated ids are dropped."""
+        entries = parsed.get(key) if isinstance(parsed, dict) else parsed
+        results: Dict[str, str] = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            item_id, summary = str(entry.get("id", "")).strip(), entry.get("summary")
+            if item_id in wanted and item_id not in results and isinstance(summary, str) and self._valid_summary(summary.strip()):
+                results[item_id] = summary.strip()
+        return results
+
+    def generate_rollups_packed(
+        self,
+        groups: List[Dict[str, Any]],
+        max_sentences: int,
+        language: str
+    ) -> Dict[str, str]:
+        """Condense several channels' summaries (dicts with id, name, period, items) in one request.
+
+        Returns digests keyed by group id; groups the model dropped or garbled are left out.
+        """
+        blocks = []
+        for group in groups:
+            items = "\n".join(f"- {item}" for item in group["items"])
+            blocks.append(
+                f"### Channel id: {group['id']}\n"
+                f"Channel: {group['name']}\n"
+                f"Period: {group['period']}\n"
+                f"Summaries:\n{items}"
+            )
+        # Summaries are short input; the small model is enough unless there is a lot of it.
+        total_chars = sum(len(item) for group in groups for item in group["items"])
+        tier = SMALL if self.small_model and total_chars <= self.small_max_chars else LARGE
+        inputs = {"channels": "\n\n".join(blocks), "max_sentences": max_sentences, "language": language}
+        try:
+            parsed = self.intent_parser.parse(self._stream_summary(tier, inputs, chain="rollup_packed"))
+        except Exception as e:
+            logger.warning(f"Packed rollup of {len(groups)} channels failed: {e}")
+            return {}
+
+        wanted = {group["id"] for group in groups}
+        rollups = self._packed_entries(parsed, "rollups", wanted)
+        if len(rollups) < len(wanted):
+            logger.warning(f"Packed rollup covered {len(rollups)}/{len(wanted)} channels")
+        return rollups
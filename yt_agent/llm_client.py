@@ -1,8 +1,64 @@
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
 from .langchain_utils import LangChainUtils
 
+logger = logging.getLogger(__name__)
+
 class LLMClient:
-    def __init__(self, api_base: str, model: str, temperature: float = 0.2):
-        self.lc_utils = LangChainUtils(api_base=api_base, model=model, temperature=temperature)
+    def __init__(self, lc_utils: LangChainUtils):
+        # Shares the agent's LangChainUtils, so both use one pool of LLM endpoints
+        self.lc_utils = lc_utils
+
+    def generate_summary(
+        self,
+        title: str,
+        description: str | None,
+        transcript: str,
+        max_sentences: int,
+        language: str,
+        on_token: Optional[Callable[[str], None]] = None,
+        prefer_small: bool = False
+    ) -> str:
+        return self.lc_utils.generate_summary(
+            title, description, transcript, max_sentences, language, on_token=on_token, prefer_small=prefer_small
+        )
+
+    def generate_summaries(
+        self,
+        videos: List[Dict[str, Any]],
+        max_sentences: int,
+        language: str,
+        prefer_small: bool = False
+    ) -> Dict[str, str]:
+        """Summarize several short videos in one packed request.
+
+        Videos missing from (or garbled in) the packed answer are summarized
+        one by one, so every id in ``videos`` gets a summary.
+        """
+        summaries = {}
+        if len(videos) > 1:
+            summaries = self.lc_utils.generate_summaries_packed(videos, max_sentences, language, prefer_small=prefer_small)
+        missing = [video for video in videos if video["id"] not in summaries]
+        if missing and len(videos) > 1:
+            logger.info(f"Falling back to per-video summaries for {len(missing)} of {len(videos)} videos")
+        for video in missing:
+            summaries[video["id"]] = self.generate_summary(
+                video["title"], video.get("description"), video.get("transcript") or "", max_sentences, language,
+                prefer_small=prefer_small
+            )
+        return summaries
+
+    def generate_rollups(self, groups: List[Dict[str, Any]], max_sentences: int, language: str) -> Dict[str, str]:
+        """Condense several channels' summaries in one packed request.
 
-    def generate_summary(self, title: str, description: str | None, transcript: str, max_sentences: int, language: str) -> str:
-        return self.lc_utils.generate_summary(title, description, transcript, max_sentences, language)
+        Groups missing from the packed answer are retried one by one; those
+        that still fail are left out.
+        """
+        rollups = self.lc_utils.generate_rollups_packed(groups, max_sentences, language)
+        missing = [group for group in groups if group["id"] not in rollups]
+        if missing and len(groups) > 1:
+            logger.info(f"Falling back to per-channel rollups for {len(missing)} of {len(groups)} channels")
+            for group in missing:
+                rollups.update(self.lc_utils.generate_rollups_packed([group], max_sentences, language))
+        return rollups
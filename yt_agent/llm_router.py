@@ -0,0 +1,125 @@
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional
+
+import requests
+
+from .concurrency import AdaptiveLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class LLMBackend:
+    """One OpenAI-compatible server (e.g. an LM Studio instance) and its chains."""
+
+    def __init__(
+        self,
+        api_base: str,
+        client: Any,
+        limiter: AdaptiveLimiter,
+        weight: float = 1.0,
+        capabilities: Optional[List[str]] = None
+    ):
+        self.api_base = api_base
+        self.client = client
+        self.limiter = limiter
+        self.weight = weight if weight > 0 else 1.0
+        self.capabilities = set(capabilities) if capabilities else None  # None: everything
+        self.outstanding = 0
+        self.healthy = True
+
+    def supports(self, capability: str) -> bool:
+        return self.capabilities is None or capability in self.capabilities
+
+    def load(self) -> float:
+        return (self.outstanding + 1) / self.weight
+
+
+class LLMRouter:
+    """Spreads requests over several backends by weighted least outstanding requests.
+
+    A background thread polls each backend's ``/models`` endpoint and takes a
+    backend out of rotation while it fails; a failed request triggers an early
+    check. If no healthy backend offers a capability, unhealthy ones are tried
+    rather than failing outright.
+    """
+
+    def __init__(self, backends: List[LLMBackend], health_interval: float = 30.0, health_timeout: float = 3.0):
+        if not backends:
+            raise ValueError("At least one LLM endpoint is required.")
+        self.backends = backends
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._check_now = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if len(backends) > 1 and health_interval > 0:
+            self._thread = threading.Thread(target=self._health_loop, daemon=True, name="llm-health")
+            self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._check_now.set()
+
+    def candidates(self, capability: str) -> List[LLMBackend]:
+        capable = [backend for backend in self.backends if backend.supports(capability)]
+        if not capable:
+            raise LookupError(f"No LLM endpoint offers '{capability}'")
+        return [backend for backend in capable if backend.healthy] or capable
+
+    @contextmanager
+    def acquire(self, capability: str) -> Iterator[LLMBackend]:
+        """Reserve the least-loaded backend offering ``capability`` for one request."""
+        with self._lock:
+            backend = min(self.candidates(capability), key=LLMBackend.load)
+            backend.outstanding += 1
+        try:
+            yield backend
+        except Exception:
+            if len(self.backends) > 1:
+                self._check_now.set()
+            raise
+        finally:
+            with self._lock:
+                backend.outstanding -= 1
+
+    def max_parallel(self, capability: str) -> int:
+        """Upper bound on useful concurrent requests for ``capability``."""
+        return sum(backend.limiter.max_limit for backend in self.candidates(capability))
+
+    def expected_latency(self, capability: str) -> Optional[float]:
+        """Typical duration of one request on the fastest backend, once one has been measured."""
+        latencies = [
+            backend.limiter.latency_ema for backend in self.candidates(capability)
+            if backend.limiter.latency_ema is not None
+        ]
+        return min(latencies) if latencies else None
+
+    def _health_loop(self) -> None:
+        while not self._stop.is_set():
+            for backend in self.backends:
+                self._check(backend)
+            self._check_now.wait(self.health_interval)
+            self._check_now.clear()
+
+    def _check(self, backend: LLMBackend) -> None:
+        try:
+            response = requests.get(f"{backend.api_base}/models", timeout=self.health_timeout)
+            healthy = response.status_code == 200
+        except requests.exceptions.RequestException:
+            healthy = False
+        if healthy != backend.healthy:
+            if healthy:
+                logger.info(f"LLM endpoint {backend.api_base} is back in rotation")
+            else:
+                logger.warning(f"LLM endpoint {backend.api_base} failed its health check; removed from rotation")
+        backend.healthy = healthy
+
+    def summary(self) -> List[str]:
+        lines = []
+        for backend in self.backends:
+            state = "up" if backend.healthy else "DOWN"
+            lines.append(f"{backend.api_base} [{state}] {backend.limiter.summary()}")
+        return lines
@@ -0,0 +1,284 @@
+import logging
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+from .benchmarks import format_table, percentiles
+from .channel_manager import ChannelManager
+from .config import Config, LLMConfig, RunConfig, TelegramConfig, YouTubeConfig
+from .stub_servers import StubLLMServer, StubTelegramServer, StubTranscriptClient, StubYouTubeServer
+
+logger = logging.getLogger(__name__)
+
+AUTHORIZED_CHAT = 1000
+
+# Commands and messages sent by default, with their relative frequency
+DEFAULT_MIX = {
+    "/status": 3,
+    "/help": 1,
+    "list my channels": 2,
+    "find videos about rust": 1,
+    "/search kubernetes": 1,
+    "/review": 0.2
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse ``"text=weight,text=weight"`` (e.g. ``"/status=3,/review=0.5"``) into a command mix."""
+    mix = {}
+    for part in spec.split(","):
+        text, _, weight = part.rpartition("=")
+        if not text.strip():
+            raise ValueError(f"Expected text=weight, got '{part}'")
+        mix[text.strip()] = float(weight)
+    return mix
+
+
+class LoadTest:
+    """Drives a ReviewAgent in bot mode with a synthetic update stream against local stubs.
+
+    Updates arrive as a Poisson process at ``rate`` per second. An
+    ``authorized_share`` of them come from the configured chat; the rest
+    are spread over ``chats - 1`` other chats. Texts are drawn from ``mix``.
+    The agent runs its real polling loop against a stub Telegram API, with
+    stub YouTube and LLM servers behind it. ``cooldown`` overrides the
+    agent's per-chat command cooldown.
+    """
+
+    def __init__(
+        self,
+        duration: float = 30.0,
+        rate: float = 2.0,
+        chats: int = 3,
+        authorized_share: float = 0.8,
+        mix: Optional[Dict[str, float]] = None,
+        cooldown: Optional[float] = None,
+        llm_latency: float = 0.2,
+        llm_tokens_per_sec: float = 200.0,
+        youtube_latency: float = 0.02,
+        channels: int = 5,
+        sample_interval: float = 1.0,
+        drain_timeout: float = 60.0,
+        track_memory: bool = True,
+        seed: int = 0
+    ):
+        self.duration = duration
+        self.rate = rate
+        self.chats = max(1, chats)
+        self.authorized_share = authorized_share
+        self.mix = mix or DEFAULT_MIX
+        self.cooldown = cooldown
+        self.llm_latency = llm_latency
+        self.llm_tokens_per_sec = llm_tokens_per_sec
+        self.youtube_latency = youtube_latency
+        self.channels = channels
+        self.sample_interval = sample_interval
+        self.drain_timeout = drain_timeout
+        self.track_memory = track_memory
+        self.seed = seed
+
+    def _build_agent(self, data_dir: str, telegram: StubTelegramServer, llm: StubLLMServer, youtube: StubYouTubeServer) -> Any:
+        from .review_agent import ReviewAgent
+
+        config = Config(
+            run=RunConfig(data_dir=data_dir, max_videos_per_channel=2, watch_config=False),
+            telegram=TelegramConfig(chat_id=AUTHORIZED_CHAT, api_base=telegram.url),
+            llm=LLMConfig(api_base=llm.url, model="stub-model"),
+            youtube=YouTubeConfig(api_key="stub", transport="rest", api_base=youtube.url)
+        )
+        # Never hand a real bot token to the stub (it would appear in request paths)
+        saved_token = os.environ.get("TELEGRAM_BOT_TOKEN")
+        os.environ["TELEGRAM_BOT_TOKEN"] = "loadtest"
+        try:
+            agent = ReviewAgent(config)
+        finally:
+            if saved_token is None:
+                del os.environ["TELEGRAM_BOT_TOKEN"]
+            else:
+                os.environ["TELEGRAM_BOT_TOKEN"] = saved_token
+        agent.channel_manager = ChannelManager(os.path.join(data_dir, "channels.json"))
+        for index in range(self.channels):
+            agent.channel_manager.add_channel(f"Stub channel {index}", f"@stub_channel_{index}")
+        agent.transcript_client = StubTranscriptClient(max_chars=config.llm.max_transcript_chars)
+        if self.cooldown is not None:
+            agent._cooldown_seconds = self.cooldown
+        return agent
+
+    def run(self) -> Dict[str, Any]:
+        """Run the load test and return its results (see ``format_results``)."""
+        data_dir = tempfile.mkdtemp(prefix="yt-loadtest-")
+        if self.track_memory:
+            tracemalloc.start()
+        try:
+            with StubTelegramServer(max_poll_wait=0.5) as telegram, \
+                    StubLLMServer(latency=self.llm_latency, tokens_per_sec=self.llm_tokens_per_sec) as llm, \
+                    StubYouTubeServer(latency=self.youtube_latency) as youtube:
+                return self._run(data_dir, telegram, llm, youtube)
+        finally:
+            if self.track_memory:
+                tracemalloc.stop()
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    def _run(self, data_dir: str, telegram: StubTelegramServer, llm: StubLLMServer, youtube: StubYouTubeServer) -> Dict[str, Any]:
+        agent = self._build_agent(data_dir, telegram, llm, youtube)
+
+        # message_id -> (start, end) of the agent handling it; updates missing here were ignored
+        handled: Dict[int, Tuple[float, float]] = {}
+        handle_text = agent._handle_text
+
+        def timed_handle_text(text: str, chat_id: int, message_id: Optional[int] = None) -> None:
+            start = time.monotonic()
+            try:
+                handle_text(text, chat_id, message_id)
+            finally:
+                handled[message_id] = (start, time.monotonic())
+
+        agent._handle_text = timed_handle_text
+        bot = threading.Thread(target=agent.start_bot_mode, daemon=True, name="loadtest-bot")
+        bot.start()
+
+        samples: List[Dict[str, Any]] = []
+        stop_sampling = threading.Event()
+        started = time.monotonic()
+
+        def sample() -> None:
+            while True:
+                heap = tracemalloc.get_traced_memory()[0] if self.track_memory else 0
+                samples.append({
+                    "t": round(time.monotonic() - started, 2),
+                    "heap_kb": heap // 1024,
+                    "cooldown_entries": len(agent._command_cooldown),
+                    "queued_updates": telegram.pending(),
+                    "threads": threading.active_count()
+                })
+                if stop_sampling.wait(self.sample_interval):
+                    return
+
+        sampler = threading.Thread(target=sample, daemon=True, name="loadtest-sampler")
+        sampler.start()
+
+        rng = random.Random(self.seed)
+        texts, weights = list(self.mix), list(self.mix.values())
+        other_chats = [AUTHORIZED_CHAT + index for index in range(1, self.chats)]
+        pushed: List[Dict[str, Any]] = []
+        next_at = started
+        while True:
+            next_at += rng.expovariate(self.rate)
+            if next_at >= started + self.duration:
+                break
+            time.sleep(max(0.0, next_at - time.monotonic()))
+            authorized = not other_chats or rng.random() < self.authorized_share
+            chat_id = AUTHORIZED_CHAT if authorized else rng.choice(other_chats)
+            text = rng.choices(texts, weights)[0]
+            update = telegram.push_update(chat_id, text)
+            pushed.append({
+                "update_id": update["update_id"], "message_id": update["message"]["message_id"], "chat_id": chat_id, "text": text
+            })
+
+        # Let the agent work through what is queued, then stop it
+        drain_until = time.monotonic() + self.drain_timeout
+        while telegram.pending() and time.monotonic() < drain_until:
+            time.sleep(0.1)
+        drained = telegram.pending() == 0
+        agent.stop_bot_mode()
+        bot.join(timeout=telegram.max_poll_wait + 30)
+        stop_sampling.set()
+        sampler.join()
+        agent.lc_utils.close()
+        agent.store.close()
+        return self._results(pushed, handled, telegram, llm, samples, drained, agent)
+
+    def _results(
+        self,
+        pushed: List[Dict[str, Any]],
+        handled: Dict[int, Tuple[float, float]],
+        telegram: StubTelegramServer,
+        llm: StubLLMServer,
+        samples: List[Dict[str, Any]],
+        drained: bool,
+        agent: Any
+    ) -> Dict[str, Any]:
+        delivered = [item for item in pushed if item["update_id"] in telegram.delivered_at]
+        authorized = [item for item in delivered if item["chat_id"] == AUTHORIZED_CHAT]
+        done = [item for item in authorized if item["message_id"] in handled]
+        for item in done:
+            start, end = handled[item["message_id"]]
+            pushed_at = telegram.pushed_at[item["update_id"]]
+            item["latency"] = end - pushed_at
+            item["wait"] = start - pushed_at
+
+        commands = []
+        for text in self.mix:
+            sent = [item for item in pushed if item["text"] == text]
+            latencies = [item["latency"] for item in done if item["text"] == text]
+            row = {"command": text, "sent": len(sent), "handled": len(latencies)}
+            row.update({f"{key}_ms": _ms(value) for key, value in percentiles(latencies, (50, 95, 99)).items()})
+            row["max_ms"] = max(latencies) * 1000 if latencies else None
+            commands.append(row)
+
+        heap = [sample["heap_kb"] for sample in samples]
+        history_ids = len(agent.telegram_client.history.get(AUTHORIZED_CHAT))
+        return {
+            "duration": self.duration,
+            "rate": self.rate,
+            "chats": self.chats,
+            "updates": len(pushed),
+            "delivered": len(delivered),
+            "undelivered": len(pushed) - len(delivered),
+            "handled": len(done),
+            "unauthorized": len(delivered) - len(authorized),
+            "rate_limited": len(authorized) - len(done),
+            "drained": drained,
+            "latency": {key: _ms(value) for key, value in percentiles([item["latency"] for item in done]).items()},
+            "queue_wait": {key: _ms(value) for key, value in percentiles([item["wait"] for item in done]).items()},
+            "commands": commands,
+            "memory": {
+                "tracked": self.track_memory,
+                "heap_start_kb": heap[0] if heap else 0,
+                "heap_end_kb": heap[-1] if heap else 0,
+                "heap_max_kb": max(heap) if heap else 0,
+                "cooldown_entries": len(agent._command_cooldown),
+                "message_history_ids": history_ids
+            },
+            "telegram_calls": dict(telegram.call_counts),
+            "llm_completions": llm.completions,
+            "samples": samples
+        }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else seconds * 1000
+
+
+def _format_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.0f}"
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = [
+        f"Load test: {results['updates']} updates in {results['duration']:.0f}s "
+        f"({results['rate']}/s) from {results['chats']} chats",
+        f"Handled {results['handled']}, rate limited {results['rate_limited']}, "
+        f"unauthorized {results['unauthorized']}, undelivered {results['undelivered']}"
+        + ("" if results["drained"] else " (queue not drained)"),
+        "Latency ms: " + ", ".join(f"{key} {_format_ms(value)}" for key, value in results["latency"].items())
+        + "; queue wait ms: " + ", ".join(f"{key} {_format_ms(value)}" for key, value in results["queue_wait"].items()),
+        "",
+        format_table(results["commands"], ["command", "sent", "handled", "p50_ms", "p95_ms", "p99_ms", "max_ms"]),
+        ""
+    ]
+    memory = results["memory"]
+    if memory["tracked"]:
+        lines.append(
+            f"Heap: {memory['heap_start_kb']} KB -> {memory['heap_end_kb']} KB (max {memory['heap_max_kb']} KB)"
+        )
+    lines.append(
+        f"_command_cooldown entries: {memory['cooldown_entries']}; "
+        f"message history ids: {memory['message_history_ids']}; LLM completions: {results['llm_completions']}"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,116 @@
+import re
+from bisect import bisect_right
+from typing import List, Optional, Sequence, Tuple
+
+# Telegram legacy Markdown entities, plus backslash escapes, which must never be cut in half.
+ENTITY_RE = re.compile(
+    r"\\[_*`\[\]]"              # escaped character
+    r"|\[[^\]\n]*\]\([^)\s]*\)"  # [text](url)
+    r"|\*[^*\n]+\*"              # *bold*
+    r"|_[^_\n]+_"                # _italic_
+    r"|`[^`\n]+`"                # `code`
+)
+_MARKUP_RE = re.compile(r"\[([^\]\n]*)\]\(([^)\s]*)\)|\*([^*\n]+)\*|_([^_\n]+)_|`([^`\n]+)`")
+
+
+def _strip_markup(text: str) -> str:
+    """Drop entity markup but keep its text, e.g. ``[Link](url)`` becomes ``Link (url)``."""
+    def plain(match: re.Match) -> str:
+        if match.group(1) is not None:
+            return f"{match.group(1)} ({match.group(2)})"
+        return next(group for group in match.groups()[2:] if group is not None)
+    return _MARKUP_RE.sub(plain, text)
+
+
+def _entity_at(spans: Sequence[Tuple[int, int]], starts: Sequence[int], pos: int) -> Optional[Tuple[int, int]]:
+    """Return the entity span strictly containing ``pos``, if any."""
+    idx = bisect_right(starts, pos) - 1
+    if idx >= 0 and spans[idx][0] < pos < spans[idx][1]:
+        return spans[idx]
+    return None
+
+
+def _last_break(text: str, sep: str, lo: int, hi: int, spans, starts) -> int:
+    """Last index of ``sep`` in ``text[lo:hi]`` that is outside every entity, or -1."""
+    pos = text.rfind(sep, lo, hi)
+    while pos > lo:
+        span = _entity_at(spans, starts, pos)
+        if span is None:
+            return pos
+        pos = text.rfind(sep, lo, span[0])
+    return -1
+
+
+def split_message(text: str, limit: int) -> List[str]:
+    """Split one oversized text into parts of at most ``limit`` characters.
+
+    Parts end at a line break where possible, otherwise at a space, and never
+    inside a Markdown entity. An entity longer than a whole part cannot be kept
+    intact; in that case the remaining text loses its markup instead of being
+    rejected by Telegram.
+    """
+    spans = [m.span() for m in ENTITY_RE.finditer(text)]
+    starts = [span[0] for span in spans]
+    parts: List[str] = []
+    start = 0
+    length = len(text)
+
+    while length - start > limit:
+        end = start + limit
+        # Prefer paragraph/line boundaries in the second half of the window.
+        cut = _last_break(text, "\n", start + limit // 2, end, spans, starts)
+        if cut < 0:
+            cut = _last_break(text, " ", start, end, spans, starts)
+        if cut < 0:
+            cut = _last_break(text, "\n", start, end, spans, starts)
+        if cut < 0:
+            span = _entity_at(spans, starts, end)
+            if span is not None and span[1] - span[0] > 2:
+                return parts + split_message(_strip_markup(text[start:]), limit)
+            # No whitespace at all: hard cut, but keep backslash escapes whole.
+            cut = end - 1 if span is not None else end
+
+        part = text[start:cut].rstrip()
+        if part:
+            parts.append(part)
+        start = cut
+        while start < length and text[start].isspace():
+            start += 1
+
+    if start < length:
+        parts.append(text[start:])
+    return parts
+
+
+def pack_blocks(blocks: Sequence[str], limit: int, separator: str = "\n") -> List[str]:
+    """Pack report blocks into as few messages of at most ``limit`` characters as possible.
+
+    Blocks are kept whole whenever they fit; a block larger than ``limit`` is
+    split on its own with :func:`split_message`. Each message is joined exactly
+    once, so the cost is linear in the report size.
+    """
+    messages: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    sep_len = len(separator)
+
+    for block in blocks:
+        block_len = len(block)
+        if block_len > limit:
+            if current:
+                messages.append(separator.join(current))
+                current, current_len = [], 0
+            messages.extend(split_message(block, limit))
+            continue
+
+        needed = block_len + (sep_len if current else 0)
+        if current and current_len + needed > limit:
+            messages.append(separator.join(current))
+            current, current_len = [], 0
+            needed = block_len
+        current.append(block)
+        current_len += needed
+
+    if current:
+        messages.append(separator.join(current))
+    return messages
@@ -0,0 +1,117 @@
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import LLMConfig
+from .llm_client import LLMClient
+from .profiling import StageTimer
+from .transcript_client import TranscriptClient
+from .youtube_client import Video
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def video_tokens(video: Video, transcript: str) -> int:
+    return estimate_tokens(f"{video.title} {video.description or ''} {transcript}")
+
+
+def plan_batches(sizes: List[int], max_item_tokens: int, max_batch_tokens: int, max_items: int) -> List[List[int]]:
+    """Group item indices for packed requests, keeping the original order.
+
+    Items above ``max_item_tokens`` get a batch of their own; the rest are
+    packed greedily until the token or item budget of a batch is reached.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for index, size in enumerate(sizes):
+        if size > max_item_tokens:
+            batches.append([index])
+            continue
+        if current and (current_tokens + size > max_batch_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def fetch_transcript(video: Video, transcript_client: TranscriptClient, stages: Optional[StageTimer] = None) -> str:
+    stages = stages or StageTimer()
+    with stages.stage("transcripts"):
+        return transcript_client.get_transcript(video.id)
+
+
+def summarize_batch(
+    videos: List[Video],
+    transcripts: List[str],
+    llm_client: LLMClient,
+    llm_config: LLMConfig,
+    stages: Optional[StageTimer] = None,
+    on_partial: Optional[Callable[[Video, str], None]] = None,
+    prefer_small: bool = False
+) -> List[Dict[str, Any]]:
+    """Summarize videos whose transcripts are already fetched; several videos share one request.
+
+    Returns the ``summary`` and ``has_transcript`` fields of a report entry
+    for each video, in order. ``on_partial`` receives a single video's summary
+    text as it streams in (packed requests answer in JSON and do not stream).
+    ``prefer_small`` sends the request to the small model if one is configured.
+    """
+    stages = stages or StageTimer()
+    # Use LangChain for summarization
+    with stages.stage("summaries"):
+        if len(videos) == 1:
+            video, transcript = videos[0], transcripts[0]
+            logger.info(f"Summarizing video: {video.title}")
+            summaries = {video.id: llm_client.generate_summary(
+                title=video.title,
+                description=video.description,
+                transcript=transcript,
+                max_sentences=llm_config.max_sentences_per_video,
+                language=llm_config.language,
+                on_token=(lambda text: on_partial(video, text)) if on_partial is not None else None,
+                prefer_small=prefer_small
+            )}
+        else:
+            logger.info(f"Summarizing {len(videos)} short videos in one request")
+            summaries = llm_client.generate_summaries(
+                [
+                    {"id": video.id, "title": video.title, "description": video.description, "transcript": transcript}
+                    for video, transcript in zip(videos, transcripts)
+                ],
+                max_sentences=llm_config.max_sentences_per_video,
+                language=llm_config.language,
+                prefer_small=prefer_small
+            )
+    return [
+        {"summary": summaries[video.id], "has_transcript": bool(transcript)}
+        for video, transcript in zip(videos, transcripts)
+    ]
+
+
+def summarize_video(
+    video: Video,
+    transcript_client: TranscriptClient,
+    llm_client: LLMClient,
+    llm_config: LLMConfig,
+    stages: Optional[StageTimer] = None
+) -> Dict[str, Any]:
+    """Fetch one video's transcript and summarize it (used by the queue workers)."""
+    transcript = fetch_transcript(video, transcript_client, stages)
+    return summarize_batch([video], [transcript], llm_client, llm_config, stages)[0]
+
+
+def headline_entry(video: Video, max_chars: int = 200) -> Dict[str, Any]:
+    """Report entry without an LLM call: the first line of the description, if any."""
+    lines = [line.strip() for line in (video.description or "").splitlines() if line.strip()]
+    snippet = lines[0] if lines else ""
+    if len(snippet) > max_chars:
+        snippet = snippet[:max_chars].rsplit(" ", 1)[0] + "…"
+    return {"summary": snippet, "has_transcript": False}
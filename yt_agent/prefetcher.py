@@ -0,0 +1,107 @@
+import logging
+import threading
+from typing import Any, Optional
+
+from .langchain_utils import SUMMARY_ERROR
+from .pipeline import fetch_transcript, summarize_batch
+from .store import summary_key
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """Low-priority background thread that prepares the next review.
+
+    Every ``prefetch.interval`` seconds it checks the monitored channels for
+    uploads, fetches their transcripts into the store and, with
+    ``prefetch.summaries``, also pre-generates their summaries. It skips a
+    round while YouTube quota is below ``prefetch.min_quota`` and pauses
+    between items whenever the agent is busy, so a review in progress always
+    goes first. Each round also drops stored transcripts older than
+    ``prefetch.transcript_days``. Settings are read from the agent's current
+    config each round.
+    """
+
+    def __init__(self, agent: Any):
+        self.agent = agent
+        self.rounds = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "Prefetcher":
+        self._thread = threading.Thread(target=self._run, daemon=True, name="prefetcher")
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        # Let the bot finish starting up before the first round.
+        while not self._stop.wait(self.agent.config.prefetch.interval if self.rounds else 30):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Prefetch round failed: {e}", exc_info=True)
+            self.rounds += 1
+
+    def _yield_to_reviews(self) -> bool:
+        """Wait while a review runs; returns False if we are stopping."""
+        while self.agent.is_busy:
+            if self._stop.wait(5):
+                return False
+        return not self._stop.is_set()
+
+    def prune(self, days: Optional[float]) -> int:
+        """Drop stored transcripts fetched more than ``days`` days ago."""
+        if not days:
+            return 0
+        try:
+            dropped = self.agent.store.prune_transcripts(days * 86400)
+        except Exception as e:
+            logger.error(f"Pruning stored transcripts failed: {e}")
+            return 0
+        if dropped:
+            logger.info(f"Dropped {dropped} transcripts older than {days:g} days")
+        return dropped
+
+    def run_once(self) -> int:
+        """One prefetch round. Returns the number of newly prepared videos."""
+        agent = self.agent
+        config = agent.config
+        self.prune(config.prefetch.transcript_days)
+        channels = agent.channel_manager.get_channels()
+        if not channels:
+            return 0
+        if agent.quota.remaining < config.prefetch.min_quota + len(channels):
+            logger.info(f"Prefetch skipped: YouTube quota {agent.quota.summary()}")
+            return 0
+        if not self._yield_to_reviews():
+            return 0
+
+        videos_by_channel = agent.yt_client.get_latest_videos_many(
+            [channel.identifier for channel in channels],
+            max_videos=config.run.max_videos_per_channel
+        )
+        key = summary_key(config.llm)
+        prepared = 0
+        for channel in channels:
+            for video in videos_by_channel.get(channel.identifier) or []:
+                if not self._yield_to_reviews():
+                    return prepared
+                transcript = agent.store.get_transcript(video.id)
+                if transcript is None:
+                    transcript = fetch_transcript(video, agent.transcript_client)
+                    agent.store.put_transcript(video, channel.name, transcript)
+                    prepared += 1
+                if config.prefetch.summaries and agent.store.get_summary(video.id, key) is None:
+                    if not self._yield_to_reviews():
+                        return prepared
+                    entry = summarize_batch([video], [transcript], agent.llm_client, config.llm)[0]
+                    if entry["summary"] != SUMMARY_ERROR:
+                        agent.store.put_summary(video, channel.name, key, entry["summary"])
+        if prepared:
+            logger.info(f"Prefetched {prepared} videos; store: {agent.store.stats()}")
+        return prepared
@@ -0,0 +1,140 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """Accumulates wall-clock time per named pipeline stage (thread-safe)."""
+
+    def __init__(self):
+        self._stages: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._ended = self._started
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._stages.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+            self._ended = max(self._ended, time.perf_counter())
+
+    def as_dict(self) -> Dict[str, Tuple[float, int]]:
+        with self._lock:
+            return {name: (total, count) for name, (total, count) in self._stages.items()}
+
+    def summary(self) -> str:
+        total = self._ended - self._started
+        parts = [f"{name} {seconds:.2f}s/{count}" for name, (seconds, count) in self.as_dict().items()]
+        return f"total {total:.2f}s" + (f" ({', '.join(parts)})" if parts else "")
+
+
+class Profiler:
+    """Context manager that captures a CPU profile and, optionally, allocations.
+
+    On exit it writes ``<label>-<timestamp>.prof`` (loadable with pstats or
+    snakeviz) and a ``.txt`` report with the stage breakdown, the top-N
+    functions by cumulative time and the top allocation sites. cProfile only
+    sees the thread that entered the context; work on pool threads shows up
+    in the stage timings instead.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        label: str,
+        track_memory: bool = False,
+        top_n: int = 15,
+        stages_source: Optional[Callable[[], Optional[StageTimer]]] = None
+    ):
+        self.output_dir = output_dir
+        self.label = re.sub(r"[^A-Za-z0-9_.-]+", "_", label).strip("_") or "profile"
+        self.track_memory = track_memory
+        self.top_n = top_n
+        self.stages: Optional[StageTimer] = None
+        self._stages_source = stages_source
+        self.elapsed = 0.0
+        self.hotspots: List[Tuple[str, float, int]] = []
+        self.allocations: List[str] = []
+        self.report_path: Optional[str] = None
+        self._profile = cProfile.Profile()
+        self._memory_before: Optional[tracemalloc.Snapshot] = None
+        self._started_tracemalloc = False
+        self._start = 0.0
+
+    def __enter__(self) -> "Profiler":
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                self._started_tracemalloc = True
+            self._memory_before = tracemalloc.take_snapshot()
+        self._start = time.perf_counter()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._profile.disable()
+        self.elapsed = time.perf_counter() - self._start
+        if self._stages_source is not None:
+            self.stages = self._stages_source()
+        if self.track_memory and self._memory_before is not None:
+            diff = tracemalloc.take_snapshot().compare_to(self._memory_before, "lineno")
+            self.allocations = [str(stat) for stat in diff[:self.top_n]]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        self._collect_hotspots()
+        try:
+            self._write()
+        except OSError as e:
+            logger.error(f"Failed to write profile to {self.output_dir}: {e}")
+
+    def _collect_hotspots(self) -> None:
+        stats = pstats.Stats(self._profile)
+        rows = []
+        for (filename, line, func), (_, ncalls, _, cumtime, _) in stats.stats.items():
+            location = f"{os.path.basename(filename)}:{line}({func})" if line else func
+            rows.append((location, cumtime, ncalls))
+        rows.sort(key=lambda row: row[1], reverse=True)
+        self.hotspots = rows[:self.top_n]
+
+    def _write(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"{self.label}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        self._profile.dump_stats(base + ".prof")
+
+        out = io.StringIO()
+        out.write(f"Profile: {self.label}\nWall time: {self.elapsed:.3f}s\n")
+        if self.stages is not None:
+            out.write(f"Stages: {self.stages.summary()}\n")
+        out.write("\n")
+        pstats.Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(self.top_n)
+        if self.allocations:
+            out.write("\nTop allocation growth:\n")
+            out.write("\n".join(self.allocations) + "\n")
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(out.getvalue())
+        self.report_path = base + ".txt"
+        logger.info(f"Profile written to {base}.prof / .txt")
+
+    def hotspot_summary(self, limit: int = 10) -> List[str]:
+        """Short lines describing the top functions by cumulative time."""
+        return [f"{cumtime:.2f}s {location} x{ncalls}" for location, cumtime, ncalls in self.hotspots[:limit]]
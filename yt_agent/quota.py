@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+# YouTube Data API v3 unit cost per call. Quota resets at midnight Pacific time.
+QUOTA_COSTS: Dict[str, int] = {
+    "channels.list": 1,
+    "playlistItems.list": 1,
+    "videos.list": 1,
+    "search.list": 100,
+}
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+# Pseudo-method that books the rest of the day once the API reports the quota exhausted
+_EXHAUSTED = "quotaExceeded"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_usage (
+    day TEXT NOT NULL,
+    method TEXT NOT NULL,
+    units INTEGER NOT NULL,
+    PRIMARY KEY (day, method)
+);
+"""
+
+
+class QuotaExceeded(Exception):
+    """Raised instead of calling the API when the daily quota cannot cover a call."""
+
+
+class QuotaTracker:
+    """Counts YouTube Data API units spent per Pacific-time day.
+
+    Usage lives in a small SQLite database shared by the bot and worker
+    processes. Every check and charge is one transaction that adds to the
+    stored count, so concurrent processes never overwrite each other's
+    usage. Without a path the count is kept in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None, daily_limit: int = 10000):
+        self.path = path
+        self.daily_limit = daily_limit
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or ":memory:", timeout=30, isolation_level=None, check_same_thread=False)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        today = self._today()
+        with self._lock:
+            self._conn.execute("DELETE FROM quota_usage WHERE day < ?", (today,))
+        if path:
+            self._import_json(os.path.splitext(path)[0] + ".json", today)
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).astimezone(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+    def _import_json(self, json_path: str, today: str) -> None:
+        """Carry over today's usage from the JSON file older versions kept, then remove it."""
+        if not os.path.exists(json_path):
+            return
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("day") == today and not self.by_method():
+                with self._lock:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO quota_usage (day, method, units) VALUES (?, ?, ?)",
+                        [(today, method, int(units)) for method, units in data.get("by_method", {}).items()]
+                    )
+            os.remove(json_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to import quota usage from {json_path}: {e}")
+
+    def _used(self, day: str) -> int:
+        row = self._conn.execute("SELECT COALESCE(SUM(units), 0) FROM quota_usage WHERE day = ?", (day,)).fetchone()
+        return row[0]
+
+    def _add(self, day: str, method: str, units: int) -> None:
+        self._conn.execute(
+            "INSERT INTO quota_usage (day, method, units) VALUES (?, ?, ?) "
+            "ON CONFLICT(day, method) DO UPDATE SET units = units + excluded.units",
+            (day, method, units)
+        )
+
+    @property
+    def used(self) -> int:
+        with self._lock:
+            return self._used(self._today())
+
+    def by_method(self) -> Dict[str, int]:
+        """Units spent today per API method."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT method, units FROM quota_usage WHERE day = ?", (self._today(),)
+            ).fetchall()
+        return dict(rows)
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.daily_limit - self.used)
+
+    def can_afford(self, method: str, keep: int = 0) -> bool:
+        """True if ``method`` fits in today's budget while leaving ``keep`` units unspent."""
+        return self.remaining - QUOTA_COSTS.get(method, 1) >= keep
+
+    def charge(self, method: str) -> None:
+        """Record a call. YouTube bills failed requests too, so charge before executing."""
+        with self._lock:
+            self._add(self._today(), method, QUOTA_COSTS.get(method, 1))
+
+    def try_charge(self, method: str, keep: int = 0) -> bool:
+        """Charge ``method`` if it fits while leaving ``keep`` units unspent; check and charge are one step."""
+        cost = QUOTA_COSTS.get(method, 1)
+        day = self._today()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so other processes wait instead of racing the check
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                affordable = self.daily_limit - self._used(day) - cost >= keep
+                if affordable:
+                    self._add(day, method, cost)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return affordable
+
+    def mark_exhausted(self) -> None:
+        """The API reported quotaExceeded; stop spending until the next Pacific day."""
+        day = self._today()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                used = self._used(day)
+                if used < self.daily_limit:
+                    logger.warning(f"YouTube quota exhausted by API report ({used} units counted locally)")
+                    self._add(day, _EXHAUSTED, self.daily_limit - used)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def summary(self) -> str:
+        remaining = self.remaining
+        return f"{remaining}/{self.daily_limit} units left today (PT)"
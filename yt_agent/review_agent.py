@@ -1,26 +1,55 @@
 import logging
 import os
+import threading
 import time
+import uuid
 from collections import defaultdict
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import replace
+from datetime import date, datetime, timezone
 from typing import List, Dict, Any, Optional
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from dotenv import load_dotenv
-import requests
 
 # Load environment variables from .env file
 load_dotenv()
 
-from .config import Config
-from .youtube_client import YouTubeClient, Video
+from .config import Config, load_config
+from .youtube_client import YouTubeClient, Video, video_from_dict
 from .transcript_client import TranscriptClient
 from .llm_client import LLMClient
-from .telegram_client import TelegramClient, escape_markdown
-from .channel_manager import ChannelManager
-from .langchain_utils import LangChainUtils
+from .telegram_client import TelegramClient, ProgressMessage, escape_markdown
+from .channel_manager import Channel, ChannelManager
+from .webhook_server import WebhookServer
+from .update_journal import UpdateJournal
+from .quota import QuotaExceeded, QuotaTracker
+from .cassette import Cassette
+from .profiling import Profiler, StageTimer
+from .config_watcher import ConfigWatcher
+from .langchain_utils import LangChainUtils, SUMMARY_ERROR
+from .prefetcher import Prefetcher
+from .store import ReviewStore, summary_key, ABANDONED, SENDING
+from .job_queue import DONE, FAILED
+from .pipeline import fetch_transcript, headline_entry, plan_batches, summarize_batch, video_tokens
+from .deadline import Deadline, FULL, REDUCED, DESCRIPTION, HEADLINE
+from .dedup import Fingerprinter, duplicate_groups
+from .archive import EndpointEmbedder, HashedEmbedder, SummaryArchive
+from .digest import DigestBuilder, MONTH, resolve_period
+from .review_worker import JOB_CHANNEL, JOB_VIDEO, open_job_queue
 
 logger = logging.getLogger(__name__)
 
+# Review run modes, recorded so a resumed run continues the same way
+RUN_LOCAL = "local"
+RUN_QUEUE = "queue"
+
+# How the report marks entries that were cut down to meet the time budget
+_DEGRADED_NOTES = {
+    REDUCED: "short summary",
+    DESCRIPTION: "summarized from the description",
+    HEADLINE: "headline only"
+}
+
 
 def get_current_date_str(timezone_name: str, now_utc: Optional[datetime] = None) -> str:
     """Return current date in configured timezone (YYYY-MM-DD)."""
@@ -35,97 +64,750 @@ def get_current_date_str(timezone_name: str, now_utc: Optional[datetime] = None)
         tz = timezone.utc
     return base_now.astimezone(tz).strftime("%Y-%m-%d")
 
+def _new_run_id() -> str:
+    return f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+class _ReviewProgress:
+    """Renders review progress into a ProgressMessage; a no-op without one.
+
+    While a summary streams in, the status shows it growing as plain text
+    (partial output may contain unbalanced Markdown); the report itself uses
+    the escaped final text.
+    """
+
+    # Room left in a Telegram message for the partial summary
+    MAX_PARTIAL_CHARS = 3500
+
+    def __init__(self, message: Optional[ProgressMessage], channels_total: int):
+        self.message = message
+        self.channels_total = channels_total
+        self.channels_done = 0
+        self.videos_done = 0
+        self._streaming: Optional[str] = None  # Video whose summary is being shown
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Stop editing the message, e.g. when work still finishing after a deadline would overwrite the result."""
+        self._closed = True
+
+    def channel_done(self) -> None:
+        with self._lock:
+            self.channels_done += 1
+        self.show()
+
+    def video_done(self, count: int = 1, video: Optional[Video] = None) -> None:
+        with self._lock:
+            self.videos_done += count
+            if video is not None and self._streaming == video.id:
+                self._streaming = None
+        self.show()
+
+    def set_counts(self, channels: Optional[int] = None, videos: Optional[int] = None) -> None:
+        with self._lock:
+            if channels is not None:
+                self.channels_done = channels
+            if videos is not None:
+                self.videos_done = videos
+        self.show()
+
+    def _counts(self) -> List[str]:
+        return [
+            f"📺 Channels: {self.channels_done}/{self.channels_total}",
+            f"📝 Videos summarized: {self.videos_done}"
+        ]
+
+    def show(self, current: str = "") -> None:
+        if self.message is None or self._closed:
+            return
+        lines = ["🔄 *Review in progress*"] + self._counts()
+        if current:
+            lines.append(f"⏳ {escape_markdown(current)}")
+        # ProgressMessage throttles the edits itself.
+        self.message.update("\n".join(lines))
+
+    def partial(self, video: Video, text: str) -> None:
+        """Show a summary as it is generated; parallel summaries wait their turn."""
+        if self.message is None or self._closed:
+            return
+        with self._lock:
+            if self._streaming is None:
+                self._streaming = video.id
+            elif self._streaming != video.id:
+                return
+        if len(text) > self.MAX_PARTIAL_CHARS:
+            text = "…" + text[-self.MAX_PARTIAL_CHARS:]
+        lines = ["🔄 Review in progress"] + self._counts() + ["", f"▶️ {video.title}", text.rstrip() + " ▌"]
+        self.message.update("\n".join(lines), parse_mode=None)
+
+
 class ReviewAgent:
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        cassette: Optional[Cassette] = None,
+        config_path: Optional[str] = None,
+        run_overrides: Optional[Dict[str, Any]] = None
+    ):
+        # Command-line settings for config.run, re-applied on every config reload
+        self.run_overrides = dict(run_overrides or {})
+        config = self._with_overrides(config)
         self.config = config
+        self.config_path = config_path
+        self.cassette = cassette
+        # A replayed run never reaches the real services, so credentials are optional.
+        placeholder = "replay" if cassette is not None and cassette.replaying else None
         
+        os.makedirs(config.run.data_dir, exist_ok=True)
+
         # Initialize clients
-        self.yt_client = YouTubeClient(api_key=config.youtube.api_key)
-        self.transcript_client = TranscriptClient()
-        # Initialize LangChain Util directly here or inside LLMClient, but we also need it for intents
-        self.lc_utils = LangChainUtils(
-            api_base=config.llm.api_base,
-            model=config.llm.model,
-            temperature=config.llm.temperature
+        self.quota = QuotaTracker(
+            path=os.path.join(config.run.data_dir, "youtube_quota.sqlite3"),
+            daily_limit=config.youtube.daily_quota
         )
-        # LLMClient now just wraps lc_utils for summarization
-        self.llm_client = LLMClient(
-            api_base=config.llm.api_base,
-            model=config.llm.model,
-            temperature=config.llm.temperature
+        self.yt_client = YouTubeClient(
+            api_key=config.youtube.api_key or placeholder,
+            quota=self.quota,
+            search_reserve=config.youtube.search_reserve,
+            transport=config.youtube.transport,
+            api_base=config.youtube.api_base,
+            max_workers=config.youtube.max_workers
         )
+        self.transcript_client = TranscriptClient(max_chars=config.llm.max_transcript_chars)
+        self.lc_utils, self.llm_client = self._build_llm_clients(config)
         
         self.channel_manager = ChannelManager()
 
-        token = os.environ.get("TELEGRAM_BOT_TOKEN")
+        token = os.environ.get("TELEGRAM_BOT_TOKEN") or placeholder
         if not token:
             raise ValueError("TELEGRAM_BOT_TOKEN environment variable is required.")
-        self.telegram_client = TelegramClient(token=token)
+        self.telegram_client = TelegramClient(
+            token=token,
+            history_path=os.path.join(config.run.data_dir, "message_history.json"),
+            api_base=config.telegram.api_base
+        )
+        self.update_journal = UpdateJournal(os.path.join(config.run.data_dir, "update_journal.jsonl"))
+        self.store = ReviewStore(os.path.join(config.run.data_dir, "review_store.sqlite3"))
+        self.archive = self._build_archive(config, self.lc_utils)
+        
+        if cassette is not None:
+            cassette.install(self)
         
         # Bot mode state
-        self.last_update_id = 0
+        self.last_update_id = self.update_journal.offset
         self.is_running = False
         self.is_busy = False  # Track if a review is currently running
+        self._review_lock = threading.Lock()  # Webhook mode handles messages concurrently
+        self._poll_error_backoff = 5  # Seconds to wait after a failed getUpdates call
         
         # Rate limiting
         self._command_cooldown: dict = defaultdict(float)
         self._cooldown_seconds = 10  # Minimum seconds between commands
+        self._dispatch_lock = threading.Lock()  # Guards the cooldowns and the profiling count across webhook threads
+
+        # Profiling (/profile profiles the next N commands)
+        self.profile_dir = self._profile_dir(config)
+        self._profile_remaining = 0
+        self.last_run_stages: Optional[StageTimer] = None
+
+        # Config hot reload
+        self._reload_lock = threading.Lock()
+        self._config_watcher: Optional[ConfigWatcher] = None
+
+        # Background preparation of the next review
+        self._prefetcher: Optional[Prefetcher] = None
+
+    def _with_overrides(self, config: Config) -> Config:
+        if not self.run_overrides:
+            return config
+        return replace(config, run=replace(config.run, **self.run_overrides))
+
+    @staticmethod
+    def _profile_dir(config: Config) -> str:
+        return config.run.profile_dir or os.path.join(config.run.data_dir, "profiles")
+
+    def _build_llm_clients(self, config: Config):
+        # One LangChainUtils (and so one endpoint pool) serves intents and summaries
+        lc_utils = LangChainUtils.from_config(config.llm)
+        return lc_utils, LLMClient(lc_utils)
+
+    def _build_archive(self, config: Config, lc_utils: LangChainUtils) -> Optional[SummaryArchive]:
+        if not config.archive.enabled:
+            return None
+        if config.archive.embedding_model:
+            embedder = EndpointEmbedder(lc_utils.router, config.archive.embedding_model)
+        else:
+            embedder = HashedEmbedder(config.archive.hashed_dim)
+        return SummaryArchive(os.path.join(config.run.data_dir, "archive"), embedder)
+
+    def reload_config(self) -> str:
+        """Re-read the config file and swap in only the components it affects.
+
+        An invalid file leaves the running config untouched. A review already in
+        progress keeps the config and LLM clients it started with.
+        """
+        if not self.config_path:
+            return "⚠️ No config file to reload from."
+
+        with self._reload_lock:
+            start = time.perf_counter()
+            try:
+                new_config = load_config(self.config_path)
+            except Exception as e:
+                logger.error(f"Config reload rejected: {e}")
+                return f"❌ Config not reloaded: {e}"
+            changes = self.apply_config(new_config)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+        summary = ", ".join(changes) if changes else "no changes"
+        logger.info(f"Config reloaded in {elapsed_ms:.1f}ms: {summary}")
+        return f"♻️ Config reloaded in {elapsed_ms:.0f}ms: {summary}"
+
+    def apply_config(self, new_config: Config) -> List[str]:
+        """Swap in a validated config; returns a description of what changed.
+
+        Command-line overrides (``run_overrides``) take precedence over the file.
+        """
+        new_config = self._with_overrides(new_config)
+        old = self.config
+        changes = []
+
+        llm_keys = (
+            "api_base", "model", "temperature", "max_concurrency", "endpoints", "health_interval",
+            "small_model", "small_model_max_chars", "escalate_invalid"
+        )
+        if any(getattr(old.llm, key) != getattr(new_config.llm, key) for key in llm_keys):
+            previous = self.lc_utils
+            lc_utils, llm_client = self._build_llm_clients(new_config)
+            self.lc_utils, self.llm_client = lc_utils, llm_client
+            previous.close()
+            self.archive = self._build_archive(new_config, lc_utils)
+            if self.cassette is not None:
+                self.cassette.install_llm(self)
+            changes.append(f"LLM rebuilt ({new_config.llm.model})")
+        elif old.archive != new_config.archive:
+            self.archive = self._build_archive(new_config, self.lc_utils)
+            if self.cassette is not None:
+                self.cassette.install_llm(self)
+            changes.append("archive reopened")
+
+        if old.llm.max_transcript_chars != new_config.llm.max_transcript_chars:
+            self.transcript_client.max_chars = new_config.llm.max_transcript_chars
+            changes.append("transcript limit")
+
+        yt_old, yt_new = old.youtube, new_config.youtube
+        self.quota.daily_limit = yt_new.daily_quota
+        self.yt_client.search_reserve = yt_new.search_reserve
+        self.yt_client.max_workers = yt_new.max_workers
+
+        # These are wired into long-lived connections and servers at startup.
+        restart_only = [
+            ("youtube.transport", yt_old.transport, yt_new.transport),
+            ("youtube.api_base", yt_old.api_base, yt_new.api_base),
+            ("run.data_dir", old.run.data_dir, new_config.run.data_dir),
+            ("telegram.webhook_*", old.telegram.webhook_url, new_config.telegram.webhook_url),
+        ]
+        for name, before, after in restart_only:
+            if before != after:
+                logger.warning(f"{name} changed; restart the bot to apply it")
+                changes.append(f"{name} needs restart")
+
+        changed_sections = [
+            section for section in ("run", "telegram", "llm", "youtube", "queue", "prefetch", "dedup", "archive")
+            if getattr(old, section) != getattr(new_config, section)
+        ]
+        if changed_sections:
+            changes.append(f"updated {'/'.join(changed_sections)}")
+
+        self.profile_dir = self._profile_dir(new_config)
+        self.config = new_config
+        return changes
+
+    def watch_config(self, interval: float = 2.0) -> None:
+        """Reload automatically whenever the config file changes on disk."""
+        if not self.config_path or self._config_watcher is not None:
+            return
+        self._config_watcher = ConfigWatcher(self.config_path, self.reload_config, interval=interval).start()
+
+    def start_prefetch(self) -> None:
+        """Start preparing transcripts (and optionally summaries) for new uploads in the background."""
+        if self._prefetcher is None:
+            self._prefetcher = Prefetcher(self).start()
 
-    def run_review(self):
+    def resume_interrupted_review(self) -> bool:
+        """Bot mode: finish a review the previous process did not complete, in the background."""
+        config = self.config
+        if not config.run.resume_interrupted or self.store.interrupted_run(config.run.resume_max_age) is None:
+            return False
+        logger.info("Found an interrupted review; resuming it")
+        threading.Thread(
+            target=self.run_review_command, args=(config.telegram.chat_id,), daemon=True, name="resume-review"
+        ).start()
+        return True
+
+    def run_review(self, progress: Optional[ProgressMessage] = None) -> int:
+        """Review all channels and send the report. Returns the number of videos reported.
+
+        If ``progress`` is given, it is edited in place with per-stage progress.
+        With ``queue.enabled`` the work is done by ``worker`` processes. With
+        ``run.time_budget`` the report is sent within the budget, with
+        summaries cut down as time runs short. Results are checkpointed as they
+        finish; a review interrupted by a crash or restart is resumed by the
+        next call instead of starting over.
+        """
         logger.info("Starting YouTube Review Agent...")
+        # Snapshot so a config reload mid-review does not change this run.
+        config = self.config
+        llm_client = self.llm_client
+        deadline = Deadline(config.run.time_budget)
+        mode = RUN_QUEUE if config.queue.enabled else RUN_LOCAL
+
+        run = self.store.interrupted_run(config.run.resume_max_age) if config.run.resume_interrupted else None
+        if run is not None and run["status"] == SENDING:
+            logger.info(f"Resuming delivery of review {run['run_id']} after part {run['parts_sent']}")
+            self._deliver(config, run["run_id"], run["report"], run["videos"], start=run["parts_sent"])
+            return run["videos"]
+        if run is not None and run["mode"] != mode:
+            logger.warning(f"Not resuming review {run['run_id']}: it was started in {run['mode']} mode")
+            self.store.finish_run(run["run_id"], ABANDONED)
+            run = None
         
-        report_data = []
+        stages = StageTimer()
+        self.last_run_stages = stages
         channels = self.channel_manager.get_channels()
         
         if not channels:
             logger.warning("No channels configured.")
-            return
+            return 0
 
-        for channel in channels:
-            logger.info(f"Processing channel: {channel.name}")
-            videos = self.yt_client.get_latest_videos(channel.identifier, max_videos=self.config.run.max_videos_per_channel)
-            
-            if not videos:
-                logger.warning(f"No videos found for {channel.name}")
-                continue
-                
-            for video in videos:
-                logger.info(f"Summarizing video: {video.title}")
-                transcript = self.transcript_client.get_transcript(video.id)
-                
-                # Use LangChain for summarization
-                summary = self.llm_client.generate_summary(
-                    title=video.title,
-                    description=video.description,
-                    transcript=transcript,
-                    max_sentences=self.config.llm.max_sentences_per_video,
-                    language=self.config.llm.language
+        if run is not None:
+            run_id = run["run_id"]
+            logger.info(f"Resuming interrupted review {run_id}")
+        else:
+            run_id = _new_run_id()
+            self.store.start_run(run_id, mode)
+
+        tracker = _ReviewProgress(progress, len(channels))
+        tracker.show()
+        skipped: List[str] = []  # Channels not checked because the YouTube quota ran out
+        unfinished: List[str] = []  # Channels not checked before the time budget ran out
+        if config.queue.enabled:
+            with stages.stage("queue"):
+                report_data = self._collect_queued(
+                    config, channels, tracker, deadline, run_id, skipped=skipped, unfinished=unfinished
                 )
-                
-                report_data.append({
-                    "channel": channel.name,
-                    "video": video,
-                    "summary": summary,
-                    "has_transcript": bool(transcript)
-                })
+        else:
+            report_data = self._collect_local(
+                config, llm_client, channels, stages, tracker, deadline, run_id, resume=run is not None,
+                skipped=skipped
+            )
 
-        if not report_data:
+        tracker.show()
+        tracker.close()
+        degraded = sum(1 for item in report_data if item.get("degraded"))
+        if skipped:
+            logger.warning(f"Skipped {len(skipped)} channels, YouTube quota exhausted: {', '.join(skipped)}")
+        logger.info(
+            f"Run summary: {len(report_data)} videos ({degraded} degraded) from {len(channels)} channels; "
+            f"YouTube quota {self.quota.summary()}; stages {stages.summary()}; "
+            f"LLM {'; '.join(llm_client.lc_utils.router.summary())}; models {llm_client.lc_utils.cascade_summary()}"
+        )
+        if not report_data and not skipped and not unfinished:
             logger.info("No new videos to report.")
             # self.telegram_client.send_message(self.config.telegram.chat_id, "No new videos found.")
-            return
+            self.store.finish_run(run_id)
+            return 0
 
-        report_text = self._generate_report(report_data)
-        self.telegram_client.send_message(self.config.telegram.chat_id, report_text)
+        with stages.stage("report"):
+            report_blocks = self._build_report_blocks(report_data, config, skipped=skipped, unfinished=unfinished)
+            self._deliver(config, run_id, report_blocks, len(report_data))
         logger.info("Report sent to Telegram.")
+        self.sync_archive()
+        return len(report_data)
+
+    def sync_archive(self) -> int:
+        """Add summaries stored since the last sync to the search archive."""
+        archive = self.archive
+        if archive is None:
+            return 0
+        try:
+            added = archive.sync(self.store)
+        except Exception as e:
+            logger.error(f"Archiving summaries failed: {e}")
+            return 0
+        if added:
+            logger.info(f"Archived {added} summaries ({len(archive)} searchable)")
+        return added
+
+    def run_digest(self, spec: str = "week", chat_id: Optional[int] = None) -> int:
+        """Build and send the digest of a week or month (see ``resolve_period``). Returns the number of channels.
+
+        Digests are rolled up from stored summaries only; nothing is fetched
+        from YouTube.
+        """
+        config = self.config
+        kind, key = resolve_period(spec, date.fromisoformat(get_current_date_str(config.run.timezone)))
+        digest = DigestBuilder(self.store, self.llm_client, config).build(kind, key)
+        if not digest["channels"]:
+            logger.info(f"No stored summaries for {key}")
+            return 0
+        self.telegram_client.send_blocks(chat_id or config.telegram.chat_id, self._build_digest_blocks(digest))
+        logger.info(f"Digest {key} sent to Telegram.")
+        return len(digest["channels"])
+
+    def _build_digest_blocks(self, digest: Dict[str, Any]) -> List[str]:
+        title = "Monthly digest" if digest["kind"] == MONTH else "Weekly digest"
+        videos = sum(entry["videos"] for entry in digest["channels"])
+        blocks = [
+            f"🗓 *{title}* ({escape_markdown(digest['label'])})\n"
+            f"{videos} videos from {len(digest['channels'])} channels\n"
+        ]
+        for entry in digest["channels"]:
+            lines = [f"*{escape_markdown(entry['channel'])}* ({entry['videos']} videos)"]
+            if entry["text"]:
+                lines.append(f"   📝 {escape_markdown(entry['text'])}")
+            else:
+                lines.append("   ⚠️ _Digest unavailable_")
+            lines.append("")
+            blocks.append("\n".join(lines))
+        return blocks
+
+    def _deliver(self, config: Config, run_id: str, blocks: List[str], videos: int, start: int = 0) -> None:
+        """Send a run's report on ``videos`` videos, recording each delivered part so a restart does not send it again."""
+        if start == 0:
+            self.store.set_run_report(run_id, blocks, videos)
+        self.telegram_client.send_blocks(
+            config.telegram.chat_id,
+            blocks,
+            start=start,
+            on_sent=lambda sent: self.store.mark_parts_sent(run_id, sent)
+        )
+        self.store.finish_run(run_id)
+
+    def _collect_local(
+        self,
+        config: Config,
+        llm_client: LLMClient,
+        channels: List[Channel],
+        stages: StageTimer,
+        tracker: "_ReviewProgress",
+        deadline: Optional[Deadline] = None,
+        run_id: Optional[str] = None,
+        resume: bool = False,
+        skipped: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Discover, fetch and summarize in this process, checkpointing each entry under ``run_id``.
+
+        With ``resume``, the run's recorded plan is reused and only entries
+        without a checkpoint are worked on. Channels skipped because the
+        YouTube quota ran out are appended to ``skipped``.
+        """
+        deadline = deadline or Deadline(None)
+        items = self.store.run_items(run_id) if run_id and resume else []
+        if items:
+            pending = [(Channel(item["channel"], item["identifier"]), item["video"]) for item in items]
+            tracker.set_counts(channels=len(channels))
+        else:
+            # Discovery runs concurrently across channels; the report keeps channel order.
+            logger.info(f"Fetching latest videos for {len(channels)} channels")
+            with stages.stage("discovery"):
+                videos_by_channel = self.yt_client.get_latest_videos_many(
+                    [channel.identifier for channel in channels],
+                    max_videos=config.run.max_videos_per_channel,
+                    on_done=lambda identifier, videos: tracker.channel_done()
+                )
+
+            pending = []
+            for channel in channels:
+                videos = videos_by_channel.get(channel.identifier, [])
+                if videos is None:
+                    if skipped is not None:
+                        skipped.append(channel.name)
+                    continue
+                if not videos:
+                    logger.warning(f"No videos found for {channel.name}")
+                pending.extend((channel, video) for video in videos)
+            if run_id:
+                self.store.plan_run(run_id, [(channel.name, channel.identifier, video) for channel, video in pending])
+
+        report_data: List[Dict[str, Any]] = [{} for _ in pending]
+        also_on: Dict[int, List[Dict[str, str]]] = {}  # Cross-links between copies of the same video
+
+        def record(index: int, entry: Dict[str, Any]) -> None:
+            channel, video = pending[index]
+            if index in also_on:
+                entry = {**entry, "also_on": also_on[index]}
+            report_data[index] = {"channel": channel.name, "video": video, **entry}
+            if run_id:
+                self.store.checkpoint(run_id, index, entry)
+
+        for index, item in enumerate(items):
+            if item["entry"] is not None:
+                channel, video = pending[index]
+                report_data[index] = {"channel": channel.name, "video": video, **item["entry"]}
+        remaining = [index for index, entry in enumerate(report_data) if not entry]
+        if items:
+            logger.info(f"Resuming with {len(pending) - len(remaining)}/{len(pending)} videos already done")
+            tracker.video_done(len(pending) - len(remaining))
+
+        stored_transcripts = []
+
+        def transcript_for(task) -> str:
+            channel, video = task
+            stored = self.store.get_transcript(video.id)
+            if stored is not None:
+                stored_transcripts.append(video.id)
+                return stored
+            transcript = fetch_transcript(video, self.transcript_client, stages)
+            self.store.put_transcript(video, channel.name, transcript)
+            return transcript
+
+        workers = max(1, min(llm_client.lc_utils.router.max_parallel("summarize"), len(remaining)))
+        # Not a `with` block: at the deadline the report goes out without waiting for stragglers.
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summarize")
+        try:
+            # Once summaries are written from descriptions only, missing transcripts are no longer needed.
+            transcript_futures = {index: executor.submit(transcript_for, pending[index]) for index in remaining}
+            wait(transcript_futures.values(), timeout=deadline.until(DESCRIPTION) if deadline.enabled else None)
+            transcripts = [""] * len(pending)
+            for index, future in transcript_futures.items():
+                if not future.done():
+                    future.cancel()
+                transcripts[index] = future.result() if future.done() and not future.cancelled() else ""
+
+            # Mirrors and re-uploads on other channels are summarized once; the copies reuse that summary.
+            copies: Dict[int, int] = {}  # Index of a copy -> index of the video summarized for it
+            if config.dedup.enabled and len(remaining) > 1:
+                with stages.stage("dedup"):
+                    # Transcripts only: descriptions share channel boilerplate (links, sponsors) and
+                    # would pair unrelated videos. Without a transcript the vector is zero and matches nothing.
+                    vectors = Fingerprinter().matrix([transcripts[index] for index in remaining])
+                    groups = duplicate_groups(
+                        vectors, config.dedup.threshold, labels=[pending[index][0].identifier for index in remaining]
+                    )
+                for group in groups:
+                    members = [remaining[position] for position in group]
+                    for index in members:
+                        also_on[index] = [
+                            {"channel": pending[other][0].name, "url": pending[other][1].url}
+                            for other in members if other != index
+                        ]
+                    for index in members[1:]:
+                        copies[index] = members[0]
+                if copies:
+                    logger.info(f"{len(copies)} of {len(remaining)} videos are copies of another channel's upload")
+
+            # Summaries prepared earlier (by the prefetcher or a previous run) are reused as-is.
+            key = summary_key(config.llm)
+            todo = []
+            for index in remaining:
+                if index in copies:
+                    continue
+                stored = self.store.get_summary(pending[index][1].id, key)
+                if stored is None:
+                    todo.append(index)
+                    continue
+                record(index, {"summary": stored, "has_transcript": bool(transcripts[index])})
+                tracker.video_done()
+            originals = len(remaining) - len(copies)
+            logger.info(
+                f"From the store: {len(stored_transcripts)}/{len(remaining)} transcripts, "
+                f"{originals - len(todo)}/{originals} summaries"
+            )
+
+            # Short videos share a request; long ones are summarized alone.
+            if config.llm.pack_videos:
+                planned = plan_batches(
+                    [video_tokens(pending[index][1], transcripts[index]) for index in todo],
+                    max_item_tokens=config.llm.pack_max_video_tokens,
+                    max_batch_tokens=config.llm.pack_max_tokens,
+                    max_items=config.llm.pack_max_videos
+                )
+                batches = [[todo[position] for position in batch] for batch in planned]
+            else:
+                batches = [[index] for index in todo]
+
+            results_lock = threading.Lock()
+            cut_off = threading.Event()  # Set at the deadline; later results only go to the store
+
+            def summarize(batch: List[int]) -> None:
+                videos = [pending[index][1] for index in batch]
+                level = deadline.level(llm_client.lc_utils.router.expected_latency("summarize"))
+                if level == HEADLINE:
+                    entries = [headline_entry(video) for video in videos]
+                else:
+                    tracker.show(videos[0].title)
+                    llm_config = config.llm
+                    if level != FULL:
+                        llm_config = replace(llm_config, max_sentences_per_video=max(1, llm_config.max_sentences_per_video // 2))
+                    entries = summarize_batch(
+                        videos,
+                        ["" if level == DESCRIPTION else transcripts[index] for index in batch],
+                        llm_client,
+                        llm_config,
+                        stages,
+                        on_partial=tracker.partial,
+                        prefer_small=level != FULL
+                    )
+                for index, entry in zip(batch, entries):
+                    channel, video = pending[index]
+                    # Only full summaries are reusable by later reviews.
+                    if level == FULL and entry["summary"] != SUMMARY_ERROR:
+                        self.store.put_summary(video, channel.name, key, entry["summary"])
+                    if level != FULL:
+                        entry["degraded"] = level
+                    with results_lock:
+                        if not cut_off.is_set():
+                            record(index, entry)
+                tracker.video_done(len(batch), video=videos[0])
+
+            # The LLM endpoints' adaptive limiters decide how many of these actually run at once.
+            futures = [executor.submit(summarize, batch) for batch in batches]
+            _, late = wait(futures, timeout=max(0.0, deadline.remaining()) if deadline.enabled else None)
+            with results_lock:
+                cut_off.set()
+            for future in futures:
+                if future not in late:
+                    future.result()
+            for index, original in copies.items():
+                if report_data[original]:
+                    entry = {
+                        field: value for field, value in report_data[original].items()
+                        if field not in ("channel", "video", "also_on")
+                    }
+                    record(index, entry)
+                    channel, video = pending[index]
+                    if not entry.get("degraded") and entry["summary"] != SUMMARY_ERROR:
+                        self.store.put_summary(video, channel.name, key, entry["summary"])
+                    tracker.video_done()
+            if late:
+                headlines = 0
+                for index, (channel, video) in enumerate(pending):
+                    if not report_data[index]:
+                        record(index, {**headline_entry(video), "degraded": HEADLINE})
+                        headlines += 1
+                logger.warning(f"Time budget reached; {headlines} videos reported as headlines only")
+            return report_data
+        finally:
+            executor.shutdown(wait=not deadline.enabled, cancel_futures=True)
+
+    def _collect_queued(
+        self,
+        config: Config,
+        channels: List[Channel],
+        tracker: "_ReviewProgress",
+        deadline: Optional[Deadline] = None,
+        run_id: Optional[str] = None,
+        skipped: Optional[List[str]] = None,
+        unfinished: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Enqueue one job per channel and wait for the workers to finish the run (or the deadline).
+
+        Jobs are keyed by ``run_id``, so calling this again for an interrupted
+        run enqueues nothing twice and picks up the results already finished.
+        Channels the workers skipped for YouTube quota are appended to ``skipped``.
+        At the deadline, videos still being summarized are reported as
+        headlines and channels not yet checked are appended to ``unfinished``.
+        """
+        deadline = deadline or Deadline(None)
+        queue = open_job_queue(config)
+        run_id = run_id or _new_run_id()
+        timed_out = False
+        try:
+            for order, channel in enumerate(channels):
+                queue.enqueue(run_id, JOB_CHANNEL, channel.identifier, {
+                    "channel": channel.name,
+                    "identifier": channel.identifier,
+                    "max_videos": config.run.max_videos_per_channel,
+                    "order": order
+                })
+            logger.info(f"Queued run {run_id} with {len(channels)} channel jobs")
+
+            timeout_at = time.monotonic() + min(config.queue.run_timeout, deadline.remaining())
+            while True:
+                counts = queue.run_counts(run_id)
+                channel_counts = counts.get(JOB_CHANNEL, {})
+                video_counts = counts.get(JOB_VIDEO, {})
+                tracker.set_counts(
+                    channels=channel_counts.get(DONE, 0) + channel_counts.get(FAILED, 0),
+                    videos=video_counts.get(DONE, 0)
+                )
+                if queue.is_run_finished(run_id):
+                    break
+                if time.monotonic() > timeout_at:
+                    logger.warning(f"Run {run_id} timed out; reporting unfinished jobs as such ({counts})")
+                    timed_out = True
+                    break
+                time.sleep(config.queue.poll_interval)
+
+            failed = sum(kind_counts.get(FAILED, 0) for kind_counts in counts.values())
+            if failed:
+                logger.warning(f"Run {run_id}: {failed} jobs failed permanently")
+
+            results = [
+                (result["order"], {
+                    "channel": result["channel"],
+                    "video": video_from_dict(result["video"]),
+                    "summary": result["summary"],
+                    "has_transcript": result["has_transcript"]
+                })
+                for result in queue.results(run_id, JOB_VIDEO)
+            ]
+            if skipped is not None:
+                skipped.extend(
+                    result["channel"] for result in queue.results(run_id, JOB_CHANNEL) if result.get("skipped")
+                )
+            if timed_out:
+                # Workers may still finish these; this report does not wait for them.
+                late_videos = queue.unfinished(run_id, JOB_VIDEO)
+                for payload in late_videos:
+                    video = video_from_dict(payload["video"])
+                    results.append((payload["order"], {
+                        "channel": payload["channel"], "video": video, **headline_entry(video), "degraded": HEADLINE
+                    }))
+                late_channels = [payload["channel"] for payload in queue.unfinished(run_id, JOB_CHANNEL)]
+                if unfinished is not None:
+                    unfinished.extend(late_channels)
+                logger.warning(
+                    f"Time budget reached; {len(late_videos)} videos reported as headlines only, "
+                    f"{len(late_channels)} channels not checked"
+                )
+        finally:
+            queue.close()
+
+        report_data = [item for _, item in sorted(results, key=lambda result: result[0])]
+        # Keep the workers' summaries too, for later reviews and the search archive.
+        key = summary_key(config.llm)
+        for item in report_data:
+            if item.get("degraded"):
+                continue
+            if item["summary"] != SUMMARY_ERROR and self.store.get_summary(item["video"].id, key) is None:
+                self.store.put_summary(item["video"], item["channel"], key, item["summary"])
+        return report_data
 
     def _generate_report(self, report_data: List[Dict[str, Any]]) -> str:
-        lines = []
-        date_str = get_current_date_str(self.config.run.timezone)
-        safe_report_title = escape_markdown(self.config.llm.title)
-        lines.append(f"📺 *{safe_report_title}* ({date_str})")
-        lines.append("")
+        return "\n".join(self._build_report_blocks(report_data))
+
+    def _build_report_blocks(
+        self,
+        report_data: List[Dict[str, Any]],
+        config: Optional[Config] = None,
+        skipped: Optional[List[str]] = None,
+        unfinished: Optional[List[str]] = None
+    ) -> List[str]:
+        """Build the report as blocks (header, then one per video) that are never split across messages.
 
-        if self.config.llm.group_by_channel:
+        Joined with newlines, the blocks form the full report text. ``unfinished``
+        and ``skipped`` channels are listed at the end.
+        """
+        config = config or self.config
+        blocks = []
+        date_str = get_current_date_str(config.run.timezone)
+        safe_report_title = escape_markdown(config.llm.title)
+        blocks.append(f"📺 *{safe_report_title}* ({date_str})\n")
+
+        if config.llm.group_by_channel:
             # Group by channel
             grouped = {}
             for item in report_data:
@@ -136,38 +818,31 @@ class ReviewAgent:
             
             for channel_name, items in grouped.items():
                 safe_channel_name = escape_markdown(channel_name)
-                lines.append(f"*{safe_channel_name}*")
                 for idx, item in enumerate(items, 1):
-                    video = item['video']
-                    summary = item['summary']
-                    safe_title = escape_markdown(video.title)
-                    safe_summary = escape_markdown(summary)
-                    
-                    lines.append(f"{idx}. *{safe_title}*")
-                    lines.append(f"   📅 {video.published_at.strftime('%Y-%m-%d')}")
-                    lines.append(f"   📝 {safe_summary}")
-                    if self.config.llm.include_links:
-                        lines.append(f"   🔗 [Link]({video.url})")
-                    lines.append("")
+                    lines = []
+                    if idx == 1:
+                        # Keep the channel heading together with its first video
+                        lines.append(f"*{safe_channel_name}*")
+                    lines.append(f"{idx}. *{escape_markdown(item['video'].title)}*")
+                    lines.extend(self._video_detail_lines(item, config))
+                    blocks.append("\n".join(lines))
         else:
             # Flat list, sorted by date
             sorted_items = sorted(report_data, key=lambda x: x['video'].published_at, reverse=True)
             for idx, item in enumerate(sorted_items, 1):
-                video = item['video']
-                summary = item['summary']
-                channel_name = item['channel']
-                safe_title = escape_markdown(video.title)
-                safe_summary = escape_markdown(summary)
-                safe_channel_name = escape_markdown(channel_name)
-                
-                lines.append(f"{idx}. *{safe_title}* ({safe_channel_name})")
-                lines.append(f"   📅 {video.published_at.strftime('%Y-%m-%d')}")
-                lines.append(f"   📝 {safe_summary}")
-                if self.config.llm.include_links:
-                    lines.append(f"   🔗 [Link]({video.url})")
-                lines.append("")
+                safe_title = escape_markdown(item['video'].title)
+                safe_channel_name = escape_markdown(item['channel'])
+                lines = [f"{idx}. *{safe_title}* ({safe_channel_name})"]
+                lines.extend(self._video_detail_lines(item, config))
+                blocks.append("\n".join(lines))
+
+        if unfinished:
+            names = ", ".join(escape_markdown(name) for name in unfinished)
+            blocks.append(f"⏱ *Not finished within the time budget:* {names}\n")
+        if skipped:
+            names = ", ".join(escape_markdown(name) for name in skipped)
+            blocks.append(f"⚠️ *Skipped, YouTube quota exhausted:* {names}\n")
 
-        # Notes section
         # Notes section
         # missing_transcripts = [item['video'].title for item in report_data if not item['has_transcript']]
         # if missing_transcripts:
@@ -176,35 +851,40 @@ class ReviewAgent:
         #     for title in missing_transcripts:
         #         lines.append(f"- {title}")
 
-        return "\n".join(lines)
+        return blocks
+
+    def _video_detail_lines(self, item: Dict[str, Any], config: Config) -> List[str]:
+        video = item['video']
+        lines = [f"   📅 {video.published_at.strftime('%Y-%m-%d')}"]
+        if item['summary']:
+            lines.append(f"   📝 {escape_markdown(item['summary'])}")
+        if item.get('degraded'):
+            lines.append(f"   ⏱ _Time budget: {_DEGRADED_NOTES[item['degraded']]}_")
+        if item.get('also_on'):
+            copies = ", ".join(f"{escape_markdown(copy['channel'])} [Link]({copy['url']})" for copy in item['also_on'])
+            lines.append(f"   🔁 Also on: {copies}")
+        if config.llm.include_links:
+            lines.append(f"   🔗 [Link]({video.url})")
+        lines.append("")
+        return lines
     
     # ========== Interactive Bot Mode Methods ==========
     
     def get_updates(self, offset: Optional[int] = None, timeout: int = 30) -> list:
         """Get updates from Telegram using long polling."""
-        url = f"{self.telegram_client.base_url}/getUpdates"
-        params = {
-            "timeout": timeout,
-            "allowed_updates": ["message"]
-        }
-        
-        if offset:
-            params["offset"] = offset
-            
-        try:
-            response = requests.get(url, params=params, timeout=timeout + 5)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get("ok"):
-                return data.get("result", [])
-            else:
-                logger.error(f"Failed to get updates: {data}")
-                return []
-                
-        except Exception as e:
-            logger.error(f"Error getting updates: {e}")
-            return []
+        return self.telegram_client.get_updates(offset=offset, timeout=timeout) or []
+
+    def handle_update(self, update: Dict[str, Any]) -> None:
+        """Dispatch a single Telegram update (shared by polling and webhook mode)."""
+        update_id = update.get("update_id")
+        if update_id is not None and not self.update_journal.claim(update_id):
+            logger.info(f"Skipping already processed update {update_id}")
+            return
+        if "message" in update:
+            try:
+                self.process_message(update["message"])
+            except Exception as e:
+                logger.error(f"Error processing message: {e}", exc_info=True)
     
     def process_message(self, message: Dict[str, Any]) -> None:
         """Process an incoming Telegram message using LangChain for intent recognition."""
@@ -221,23 +901,41 @@ class ReviewAgent:
             return
         
         logger.info(f"Received message #{message_id} from {from_user}: {text}")
+        if message_id is not None:
+            self.telegram_client.track_message(chat_id, message_id)
         
-        # Rate limiting check
-        now = time.time()
-        if now - self._command_cooldown[chat_id] < self._cooldown_seconds:
-            remaining = int(self._cooldown_seconds - (now - self._command_cooldown[chat_id]))
-            logger.info(f"Rate limit hit for chat {chat_id}, {remaining}s remaining")
-            return  # Silently ignore to avoid spam
-        self._command_cooldown[chat_id] = now
-        
+        # Rate limiting check; checked and set together so concurrent messages cannot both pass
+        with self._dispatch_lock:
+            now = time.time()
+            if now - self._command_cooldown[chat_id] < self._cooldown_seconds:
+                remaining = int(self._cooldown_seconds - (now - self._command_cooldown[chat_id]))
+                logger.info(f"Rate limit hit for chat {chat_id}, {remaining}s remaining")
+                return  # Silently ignore to avoid spam
+            self._command_cooldown[chat_id] = now
+
+            profile = self._profile_remaining > 0 and not text.lower().startswith("/profile")
+            if profile:
+                self._profile_remaining -= 1
+
+        if profile:
+            self._handle_text_profiled(text, chat_id, message_id)
+        else:
+            self._handle_text(text, chat_id, message_id)
+
+    def _handle_text(self, text: str, chat_id: int, message_id: Optional[int] = None) -> None:
         # 1. Check for basic /commands mainly for fallback or specific utilities
         if text.startswith("/"):
+            if text.split()[0].lower() == "/search":
+                # The query keeps its original case
+                self.handle_search(chat_id, text[len("/search"):].strip())
+                return
             # Basic command handling (legacy support + utilities)
             self.handle_legacy_command(text.lower(), chat_id, message_id)
             return
 
         # 2. Use LangChain for Intent Classification
-        self.telegram_client.send_message(chat_id, "🤔 Thinking...")
+        # The "Thinking..." message is later edited into the answer instead of sending a new one.
+        status = self.telegram_client.progress(chat_id, "🤔 Thinking...")
         intent = self.lc_utils.classify_intent(text)
         logger.info(f"Classified Intent: {intent}")
         
@@ -245,23 +943,33 @@ class ReviewAgent:
         arg = intent.get("arg")
 
         if action == "ADD_CHANNEL":
-            self.handle_add_channel(chat_id, arg)
+            self.handle_add_channel(chat_id, arg, status)
         elif action == "REMOVE_CHANNEL":
-            self.handle_remove_channel(chat_id, arg)
+            self.handle_remove_channel(chat_id, arg, status)
         elif action == "LIST_CHANNELS":
-            self.handle_list_channels(chat_id)
+            self.handle_list_channels(chat_id, status)
         elif action == "RUN_REVIEW":
-            self.run_review_command(chat_id)
+            self.run_review_command(chat_id, status)
+        elif action == "SEARCH":
+            self.handle_search(chat_id, arg, status)
         elif action == "STATUS":
-            self.send_status(chat_id)
+            self.send_status(chat_id, status)
         elif action == "HELP":
-            self.send_help(chat_id)
+            self.send_help(chat_id, status)
         else:
-            self.telegram_client.send_message(
+            self._reply(
                 chat_id,
-                f"I'm not sure what you mean by that. Try saying 'Add channel @Handle' or 'List channels'."
+                f"I'm not sure what you mean by that. Try saying 'Add channel @Handle' or 'List channels'.",
+                status
             )
 
+    def _reply(self, chat_id: int, text: str, status: Optional[ProgressMessage] = None) -> None:
+        """Answer in place of the pending status message if there is one, else send a new message."""
+        if status is not None and not status.finished:
+            status.finish(text)
+        else:
+            self.telegram_client.send_message(chat_id, text)
+
     def handle_legacy_command(self, command: str, chat_id: int, message_id: Optional[int] = None) -> None:
         if command == "/start" or command == "/help":
             self.send_help(chat_id)
@@ -271,17 +979,26 @@ class ReviewAgent:
             self.send_status(chat_id)
         elif command in ["/clean", "/clear"]:
             self.clean_chat(chat_id, message_id)
+        elif command == "/reload":
+            self.telegram_client.send_message(chat_id, self.reload_config())
+        elif command.split()[0] == "/digest":
+            self.handle_digest(chat_id, command.split()[1:])
+        elif command.split()[0] == "/profile":
+            self.toggle_profiling(chat_id, command.split()[1:])
         else:
             # Fallback to intent classifier for things that look like commands but aren't explicit
             # Or just ignore/say unknown.
             self.telegram_client.send_message(chat_id, f"Unknown command: {command}")
 
-    def handle_add_channel(self, chat_id: int, identifier: Optional[str]):
+    def handle_add_channel(self, chat_id: int, identifier: Optional[str], status: Optional[ProgressMessage] = None):
         if not identifier:
-            self.telegram_client.send_message(chat_id, "Please specify a channel to add.")
+            self._reply(chat_id, "Please specify a channel to add.", status)
             return
 
-        self.telegram_client.send_message(chat_id, f"Checking channel: {identifier}...")
+        if status is not None:
+            status.update(f"Checking channel: {identifier}...", force=True)
+        else:
+            status = self.telegram_client.progress(chat_id, f"Checking channel: {identifier}...")
         
         # Verify channel exists using YouTube Client
         # We can reuse get_latest_videos logic or get_channel_id_from_handle to verify existence
@@ -291,34 +1008,98 @@ class ReviewAgent:
         # Or improve YouTubeClient to get channel details.
         # For now, let's try to fetch 1 video.
         
-        videos = self.yt_client.get_latest_videos(identifier, max_videos=1)
+        try:
+            videos = self.yt_client.get_latest_videos(identifier, max_videos=1)
+        except QuotaExceeded as e:
+            logger.error(f"Could not check channel '{identifier}': {e}")
+            self._reply(
+                chat_id,
+                f"⚠️ Skipped {identifier}: the YouTube quota is exhausted ({self.quota.summary()}). Try again later.",
+                status
+            )
+            return
         if videos:
             channel_name = videos[0].channel_name or identifier
             if self.channel_manager.add_channel(channel_name, identifier):
-                self.telegram_client.send_message(chat_id, f"✅ Added channel: {channel_name}")
+                self._reply(chat_id, f"✅ Added channel: {channel_name}", status)
             else:
-                self.telegram_client.send_message(chat_id, f"⚠️ Channel already exists or could not be added.")
+                self._reply(chat_id, f"⚠️ Channel already exists or could not be added.", status)
         else:
              # Try adding anyway if we can't find videos? No, better to be safe.
              # Actually, if the channel has no videos, we might fail here.
              # But for a review bot, a channel with no videos is useless.
-             self.telegram_client.send_message(chat_id, f"❌ Could not verify channel (or no videos found). check the identifier.")
+             self._reply(chat_id, f"❌ Could not verify channel (or no videos found). check the identifier.", status)
 
-    def handle_remove_channel(self, chat_id: int, identifier: Optional[str]):
+    def handle_remove_channel(self, chat_id: int, identifier: Optional[str], status: Optional[ProgressMessage] = None):
         if not identifier:
-            self.telegram_client.send_message(chat_id, "Please specify a channel to remove.")
+            self._reply(chat_id, "Please specify a channel to remove.", status)
             return
             
         if self.channel_manager.remove_channel(identifier):
-            self.telegram_client.send_message(chat_id, f"✅ Removed channel: {identifier}")
+            self._reply(chat_id, f"✅ Removed channel: {identifier}", status)
         else:
-            self.telegram_client.send_message(chat_id, f"⚠️ Channel not found: {identifier}")
+            self._reply(chat_id, f"⚠️ Channel not found: {identifier}", status)
+
+    def handle_search(self, chat_id: int, query: Optional[str], status: Optional[ProgressMessage] = None) -> None:
+        """/search <query>: the archived summaries closest to the query."""
+        archive = self.archive
+        if archive is None:
+            self._reply(chat_id, "🔍 The summary archive is disabled.", status)
+            return
+        if not query:
+            self._reply(chat_id, "Please tell me what to search for, e.g. /search rust async", status)
+            return
+        self.sync_archive()
+        try:
+            start = time.perf_counter()
+            hits = archive.search(query, self.config.archive.top_k)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            logger.error(f"Search for '{query}' failed: {e}")
+            self._reply(chat_id, "❌ Search failed.", status)
+            return
+        logger.info(f"Searched {len(archive)} summaries for '{query}' in {elapsed_ms:.1f}ms")
+        if not hits:
+            self._reply(chat_id, "🔍 No summaries archived yet.", status)
+            return
+
+        videos = self.store.get_videos([video_id for video_id, _ in hits])
+        lines = [f"🔍 *Search:* {escape_markdown(query)}", ""]
+        for rank, (video_id, _) in enumerate(hits, 1):
+            video = videos.get(video_id)
+            if video is None:
+                continue
+            summary = video["summary"] or ""
+            if len(summary) > 300:
+                summary = summary[:300].rsplit(" ", 1)[0] + "…"
+            lines.append(
+                f"{rank}. *{escape_markdown(video['title'])}* "
+                f"({escape_markdown(video['channel'])}, {video['published_at'][:10]})"
+            )
+            lines.append(f"   📝 {escape_markdown(summary)}")
+            lines.append(f"   🔗 [Link]({video['url']})")
+        self._reply(chat_id, "\n".join(lines), status)
+
+    def handle_digest(self, chat_id: int, args: List[str]) -> None:
+        """/digest [week|month|2026-W41|2026-10]: digest rolled up from stored summaries (default: last week)."""
+        spec = args[0] if args else "week"
+        status = self.telegram_client.progress(chat_id, "🗓 Building digest...")
+        try:
+            sent = self.run_digest(spec, chat_id)
+        except ValueError as e:
+            self._reply(chat_id, f"⚠️ {e}", status)
+            return
+        except Exception as e:
+            logger.error(f"Digest failed: {e}", exc_info=True)
+            self._reply(chat_id, "❌ Error occurred.", status)
+            return
+        self._reply(chat_id, f"✅ Digest sent ({sent} channels)." if sent else "🗓 No stored summaries for that period.", status)
 
-    def handle_list_channels(self, chat_id: int):
+    def handle_list_channels(self, chat_id: int, status: Optional[ProgressMessage] = None):
         msg = self.channel_manager.list_channels_formatted()
-        self.telegram_client.send_message(chat_id, msg)
+        self._reply(chat_id, msg, status)
 
-    def send_help(self, chat_id: int) -> None:
+    def send_help(self, chat_id: int, status: Optional[ProgressMessage] = None) -> None:
         help_text = """
 🤖 *YouTube Review Agent*
 
@@ -327,66 +1108,115 @@ I can understand natural language! Try:
 - "List my channels"
 - "Remove channel Google"
 - "Run review now"
+- "Find videos about Rust"
 
 *Commands:*
 /review - Run review
+/search <topic> - Search past summaries
+/digest [week|month] - Digest of last week or month
 /clean - Clear chat
+/profile N - Profile the next N commands
+/reload - Reload config.yaml
 /help - Show this message
 """
-        self.telegram_client.send_message(chat_id, help_text)
+        self._reply(chat_id, help_text, status)
     
-    def send_status(self, chat_id: int) -> None:
+    def send_status(self, chat_id: int, status: Optional[ProgressMessage] = None) -> None:
         channels = self.channel_manager.get_channels()
+        endpoints = "\n".join(f"  - {escape_markdown(line)}" for line in self.lc_utils.router.summary())
+        store = self.store.stats()
         status_text = f"""
 📊 *Agent Status*
 ✅ Running
 • Monitored Channels: {len(channels)}
-• LLM: {self.config.llm.model}
+• LLM: {escape_markdown(self._model_description())}
+• YouTube quota: {self.quota.summary()}
+• LLM endpoints:
+{endpoints}
+• Prepared: {store['transcripts']} transcripts, {store['summaries']} summaries
+• Archive: {len(self.archive) if self.archive is not None else 'disabled'}
 """
-        self.telegram_client.send_message(chat_id, status_text)
+        self._reply(chat_id, status_text, status)
     
-    def run_review_command(self, chat_id: int) -> None:
-        if self.is_busy:
-            self.telegram_client.send_message(chat_id, "⏳ Review in progress...")
+    def _model_description(self) -> str:
+        llm = self.config.llm
+        if not llm.small_model:
+            return llm.model
+        return f"{llm.small_model} -> {llm.model} ({self.lc_utils.cascade_summary()})"
+
+    def run_review_command(self, chat_id: int, status: Optional[ProgressMessage] = None) -> None:
+        if not self._review_lock.acquire(blocking=False):
+            self._reply(chat_id, "⏳ Review in progress...", status)
             return
         
         try:
             self.is_busy = True
-            self.telegram_client.send_message(chat_id, "🔄 Starting review...")
-            self.run_review()
-            self.telegram_client.send_message(chat_id, "✅ Done!")
+            if status is not None:
+                status.update("🔄 Starting review...", force=True)
+            else:
+                status = self.telegram_client.progress(chat_id, "🔄 Starting review...")
+            reported = self.run_review(progress=status)
+            done_text = f"✅ Done! {reported} videos reviewed." if reported else "✅ Done! No new videos."
+            self._reply(chat_id, f"{done_text}\n📊 YouTube quota: {self.quota.summary()}", status)
         except Exception as e:
             logger.error(f"Error: {e}", exc_info=True)
-            self.telegram_client.send_message(chat_id, "❌ Error occurred.")
+            self._reply(chat_id, "❌ Error occurred.", status)
         finally:
             self.is_busy = False
+            self._review_lock.release()
     
+    def toggle_profiling(self, chat_id: int, args: List[str]) -> None:
+        """/profile [N|off]: profile the next N commands (default 5)."""
+        if args and args[0] == "off":
+            with self._dispatch_lock:
+                self._profile_remaining = 0
+            self.telegram_client.send_message(chat_id, "🔬 Profiling disabled.")
+            return
+        try:
+            count = int(args[0]) if args else 5
+        except ValueError:
+            self.telegram_client.send_message(chat_id, "Usage: /profile [N|off]")
+            return
+        count = max(0, min(count, 100))
+        with self._dispatch_lock:
+            self._profile_remaining = count
+        self.telegram_client.send_message(
+            chat_id,
+            f"🔬 Profiling the next {count} commands."
+        )
+
+    def _handle_text_profiled(self, text: str, chat_id: int, message_id: Optional[int] = None) -> None:
+        self.last_run_stages = None
+        label = text.split()[0] if text.startswith("/") else "message"
+        profiler = Profiler(
+            self.profile_dir,
+            f"bot-{label}",
+            track_memory=self.config.run.profile_memory,
+            stages_source=lambda: self.last_run_stages
+        )
+        with profiler:
+            self._handle_text(text, chat_id, message_id)
+
+        lines = [f"🔬 *Profile* {escape_markdown(label)}: {profiler.elapsed:.2f}s"]
+        if profiler.stages is not None:
+            lines.append(f"Stages: {escape_markdown(profiler.stages.summary())}")
+        lines.append("Top functions (cumulative):")
+        lines.extend(f"• {escape_markdown(line)}" for line in profiler.hotspot_summary(8))
+        if profiler.report_path:
+            lines.append(f"Saved: `{escape_markdown(os.path.basename(profiler.report_path))}`")
+        if self._profile_remaining == 0:
+            lines.append("Profiling finished.")
+        self.telegram_client.send_message(chat_id, "\n".join(lines))
+
     def clean_chat(self, chat_id: int, current_message_id: Optional[int] = None) -> None:
-        # Same as before, just kept for utility
+        """Delete every tracked message in the chat with as few API calls as possible."""
         try:
-            self.telegram_client.send_message(chat_id, "🧹 Cleaning...")
-            # ... implementation simplified for brevity in this replacement ...
-            # Actually, I should probably keep the full implementation if I'm replacing the whole file.
-            # I will assume the previous implementation was good and I deleted it in the ReplacementContent...
-            # Wait, I need to provide the FULL content for the file to be functional.
-            # For this 'clean_chat', I'll use a simplified version because the previous one was long
-            # and I don't want to exceed output limits if possible, but correctness is key.
-            # I'll paste a reasonably robust version.
-            
-            updates = self.get_updates(offset=0, timeout=1)
-            msg_ids = set()
+            message_ids = self.telegram_client.history.get(chat_id)
             if current_message_id:
-                for i in range(50):
-                     msg_ids.add(current_message_id - i)
-            
-            for upd in updates:
-                 if "message" in upd:
-                     msg_ids.add(upd["message"].get("message_id"))
-            
-            for mid in sorted(list(msg_ids), reverse=True):
-                self.telegram_client.delete_message(chat_id, mid)
-                time.sleep(0.05)
-                
+                message_ids.append(current_message_id)
+
+            deleted = self.telegram_client.delete_messages(chat_id, message_ids)
+            logger.info(f"Deleted {deleted} messages in chat {chat_id}")
             self.telegram_client.send_message(chat_id, "✅ Chat cleaned.")
         except Exception as e:
             logger.error(f"Clean chat error: {e}")
@@ -401,21 +1231,53 @@ I can understand natural language! Try:
         
         try:
             while self.is_running:
-                updates = self.get_updates(offset=self.last_update_id + 1)
+                # Long polling already waits server-side, so no extra sleep between polls.
+                updates = self.telegram_client.get_updates(offset=self.last_update_id + 1)
+                if updates is None:
+                    time.sleep(self._poll_error_backoff)
+                    continue
                 for update in updates:
                     self.last_update_id = max(self.last_update_id, update.get("update_id", 0))
-                    if "message" in update:
-                        try:
-                            self.process_message(update["message"])
-                        except Exception as e:
-                            logger.error(f"Error processing message: {e}", exc_info=True)
-                time.sleep(1)
+                    self.handle_update(update)
         except KeyboardInterrupt:
             self.stop_bot_mode()
         except Exception as e:
             logger.error(f"Fatal error: {e}", exc_info=True)
             self.stop_bot_mode()
             raise
+
+    def start_webhook_mode(self) -> None:
+        """Receive updates through an embedded webhook server instead of long polling."""
+        tg = self.config.telegram
+        if not tg.webhook_secret:
+            raise ValueError("TELEGRAM_WEBHOOK_SECRET environment variable is required for webhook mode.")
+
+        logger.info("Starting agent in webhook mode...")
+        server = WebhookServer(
+            handler=self.handle_update,
+            secret_token=tg.webhook_secret,
+            host=tg.webhook_host,
+            port=tg.webhook_port,
+            path=tg.webhook_path
+        )
+        # Without a public URL the server only receives what is posted to it locally
+        # (e.g. from a reverse proxy that registers the webhook itself, or in tests).
+        if tg.webhook_url and not self.telegram_client.set_webhook(tg.webhook_url, tg.webhook_secret):
+            raise RuntimeError(f"Failed to register webhook URL: {tg.webhook_url}")
+
+        self.telegram_client.send_message(
+            tg.chat_id,
+            "🤖 *Bot Started*\nI'm ready! distinct from commands, you can now speak to me naturally."
+        )
+        self.is_running = True
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if tg.webhook_url:
+                self.telegram_client.delete_webhook()
+            self.stop_bot_mode()
     
     def stop_bot_mode(self) -> None:
         logger.info("Stopping bot mode...")
@@ -424,3 +1286,4 @@ I can understand natural language! Try:
             self.telegram_client.send_message(self.config.telegram.chat_id, "🛑 Bot stopped.")
         except Exception as e:
             logger.warning("Failed to send bot stop notification: %s", e)
+        self.telegram_client.history.flush()
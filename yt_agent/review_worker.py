@@ -0,0 +1,172 @@
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+from dataclasses import replace
+from typing import Any, Dict, List, Optional
+
+from .config import Config, LLMEndpoint
+from .job_queue import Job, JobQueue
+from .langchain_utils import LangChainUtils, SUMMARY_ERROR
+from .llm_client import LLMClient
+from .pipeline import summarize_video
+from .quota import QuotaExceeded, QuotaTracker
+from .transcript_client import TranscriptClient
+from .youtube_client import YouTubeClient, video_from_dict, video_to_dict
+
+logger = logging.getLogger(__name__)
+
+JOB_CHANNEL = "channel"
+JOB_VIDEO = "video"
+
+
+def open_job_queue(config: Config) -> JobQueue:
+    os.makedirs(config.run.data_dir, exist_ok=True)
+    return JobQueue(
+        config.queue.path or os.path.join(config.run.data_dir, "jobs.sqlite3"),
+        visibility_timeout=config.queue.visibility_timeout,
+        max_attempts=config.queue.max_attempts
+    )
+
+
+class ReviewWorker:
+    """Consumes review jobs from the queue in its own process.
+
+    A ``channel`` job discovers the latest videos and enqueues one ``video`` job
+    each; a ``video`` job fetches the transcript and summarizes it. The bot
+    collects the ``video`` results into one report. Quota usage is added to
+    the quota database shared with the bot and the other workers.
+    """
+
+    def __init__(self, config: Config, name: str = "worker"):
+        self.config = config
+        self.name = name
+        self.queue = open_job_queue(config)
+        self.yt_client = YouTubeClient(
+            api_key=config.youtube.api_key,
+            quota=QuotaTracker(
+                path=os.path.join(config.run.data_dir, "youtube_quota.sqlite3"),
+                daily_limit=config.youtube.daily_quota
+            ),
+            search_reserve=config.youtube.search_reserve,
+            transport=config.youtube.transport,
+            api_base=config.youtube.api_base,
+            max_workers=1
+        )
+        self.transcript_client = TranscriptClient(max_chars=config.llm.max_transcript_chars)
+        self.llm_client = LLMClient(LangChainUtils.from_config(config.llm))
+
+    def run_once(self) -> bool:
+        """Process one job if any is ready. Returns False when the queue was empty."""
+        job = self.queue.claim()
+        if job is None:
+            return False
+        logger.info(f"[{self.name}] Job {job.id} ({job.kind}, attempt {job.attempts})")
+        try:
+            result = self.handle(job)
+        except Exception as e:
+            logger.error(f"[{self.name}] Job {job.id} failed: {e}", exc_info=True)
+            self.queue.fail(job, str(e))
+        else:
+            self.queue.complete(job, result)
+        return True
+
+    def run(self, stop: Optional[Any] = None) -> None:
+        """Work until ``stop`` (an Event) is set."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            if not self.run_once():
+                stop.wait(self.config.queue.poll_interval)
+
+    def handle(self, job: Job) -> Dict[str, Any]:
+        if job.kind == JOB_CHANNEL:
+            return self._handle_channel(job)
+        if job.kind == JOB_VIDEO:
+            return self._handle_video(job)
+        raise ValueError(f"Unknown job kind: {job.kind}")
+
+    def _handle_channel(self, job: Job) -> Dict[str, Any]:
+        payload = job.payload
+        try:
+            videos = self.yt_client.get_latest_videos(payload["identifier"], max_videos=payload["max_videos"])
+        except QuotaExceeded as e:
+            # Retrying would only fail again until the quota resets; report the channel as skipped.
+            logger.error(f"Skipping '{payload['identifier']}': {e}")
+            return {"videos": 0, "channel": payload["channel"], "skipped": True}
+        if not videos:
+            logger.warning(f"No videos found for {payload['channel']}")
+        for index, video in enumerate(videos):
+            # Keyed by video id, so a retried channel job does not enqueue duplicates.
+            self.queue.enqueue(job.run_id, JOB_VIDEO, video.id, {
+                "channel": payload["channel"],
+                "order": [payload["order"], index],
+                "video": video_to_dict(video)
+            })
+        return {"videos": len(videos)}
+
+    def _handle_video(self, job: Job) -> Dict[str, Any]:
+        payload = job.payload
+        video = video_from_dict(payload["video"])
+        entry = summarize_video(video, self.transcript_client, self.llm_client, self.config.llm)
+        if entry["summary"] == SUMMARY_ERROR and job.attempts < self.queue.max_attempts:
+            # generate_summary reports failures as text; raise so the queue retries the job.
+            # The last attempt's error entry goes into the report.
+            raise RuntimeError(f"Summarizing '{video.title}' failed")
+        return {**payload, **entry}
+
+
+def _worker_main(config: Config, name: str, stop: Any, log_level: int) -> None:
+    logging.basicConfig(
+        level=log_level,
+        format=f'%(asctime)s - {name} - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    # Ctrl+C reaches the whole process group; the parent sets ``stop`` instead.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    ReviewWorker(config, name).run(stop)
+
+
+def run_workers(config: Config, processes: int, api_bases: Optional[List[str]] = None) -> None:
+    """Start ``processes`` worker processes and block until interrupted.
+
+    ``api_bases`` pins each worker to one LLM server, round-robin; without it
+    every worker routes over all of ``llm.endpoints``.
+    A job interrupted mid-flight becomes visible again after the queue's
+    visibility timeout.
+    """
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    log_level = logging.getLogger().getEffectiveLevel()
+    workers = []
+    for index in range(max(processes, 1)):
+        worker_config = config
+        if api_bases:
+            api_base = api_bases[index % len(api_bases)]
+            worker_config = replace(config, llm=replace(
+                config.llm,
+                api_base=api_base,
+                endpoints=[LLMEndpoint(api_base=api_base)]
+            ))
+        name = f"worker-{index + 1}"
+        process = context.Process(
+            target=_worker_main,
+            args=(worker_config, name, stop, log_level),
+            name=name,
+            daemon=True
+        )
+        process.start()
+        logger.info(f"Started {name} (pid {process.pid}, LLM {worker_config.llm.api_base})")
+        workers.append(process)
+
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        logger.info("Stopping workers...")
+        stop.set()
+        for process in workers:
+            process.join(timeout=config.queue.poll_interval + 30)
+            if process.is_alive():
+                process.terminate()
@@ -0,0 +1,342 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import LLMConfig
+from .youtube_client import Video, video_from_dict, video_to_dict
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    channel TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    description TEXT,
+    transcript TEXT,
+    transcript_at REAL,
+    summary TEXT,
+    summary_key TEXT,
+    summary_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_videos_published ON videos (published_at);
+CREATE INDEX IF NOT EXISTS idx_videos_summary_at ON videos (summary_at);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    mode TEXT NOT NULL,
+    status TEXT NOT NULL,
+    planned INTEGER NOT NULL DEFAULT 0,
+    report TEXT,
+    parts_sent INTEGER NOT NULL DEFAULT 0,
+    videos INTEGER NOT NULL DEFAULT 0,
+    started_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_items (
+    run_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    identifier TEXT NOT NULL,
+    video TEXT NOT NULL,
+    entry TEXT,
+    PRIMARY KEY (run_id, position)
+);
+CREATE TABLE IF NOT EXISTS rollups (
+    channel TEXT NOT NULL,
+    period TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    text TEXT NOT NULL,
+    videos INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (channel, period)
+);
+"""
+
+# Review run states
+RUNNING = "running"  # Collecting results
+SENDING = "sending"  # Report built, parts being delivered
+DELIVERED = "delivered"
+ABANDONED = "abandoned"  # Interrupted and too old to resume
+
+
+def summary_key(llm_config: LLMConfig) -> str:
+    """Fingerprint of the settings a summary depends on; changing them invalidates stored summaries."""
+    settings = [
+        llm_config.model, llm_config.small_model, llm_config.small_model_max_chars,
+        llm_config.max_sentences_per_video, llm_config.language, llm_config.max_transcript_chars
+    ]
+    return hashlib.sha1(json.dumps(settings).encode("utf-8")).hexdigest()[:12]
+
+
+class ReviewStore:
+    """Local SQLite store of discovered videos, their transcripts and summaries.
+
+    Filled ahead of time by the Prefetcher and on demand by reviews, so a
+    review only computes what is not already here. An empty transcript
+    (none available, or a failed fetch) is retried after ``empty_ttl`` seconds.
+    """
+
+    def __init__(self, path: str, empty_ttl: float = 6 * 3600):
+        self.path = path
+        self.empty_ttl = empty_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(runs)")}
+        if "videos" not in columns:
+            # Stores created before runs recorded their video count
+            self._conn.execute("ALTER TABLE runs ADD COLUMN videos INTEGER NOT NULL DEFAULT 0")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _upsert_video(self, video: Video, channel: str) -> None:
+        self._conn.execute(
+            "INSERT INTO videos (video_id, channel, title, url, published_at, description) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(video_id) DO UPDATE SET title = excluded.title, description = excluded.description",
+            (video.id, channel, video.title, video.url, video.published_at.isoformat(), video.description)
+        )
+
+    def get_transcript(self, video_id: str) -> Optional[str]:
+        """The stored transcript, or None if it still has to be fetched."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT transcript, transcript_at FROM videos WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        if row is None or row[1] is None:
+            return None
+        transcript, fetched_at = row
+        if not transcript and time.time() - fetched_at > self.empty_ttl:
+            return None
+        return transcript or ""
+
+    def put_transcript(self, video: Video, channel: str, transcript: str) -> None:
+        with self._lock:
+            self._upsert_video(video, channel)
+            self._conn.execute(
+                "UPDATE videos SET transcript = ?, transcript_at = ? WHERE video_id = ?",
+                (transcript, time.time(), video.id)
+            )
+
+    def prune_transcripts(self, max_age: float) -> int:
+        """Drop transcripts fetched more than ``max_age`` seconds ago; returns how many were dropped.
+
+        Summaries and video details are kept. A pruned transcript is fetched
+        again only if a review still needs it.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE videos SET transcript = NULL, transcript_at = NULL WHERE transcript_at < ?",
+                (time.time() - max_age,)
+            )
+        return cursor.rowcount
+
+    def get_summary(self, video_id: str, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM videos WHERE video_id = ? AND summary_key = ?", (video_id, key)
+            ).fetchone()
+        return row[0] if row and row[0] else None
+
+    def put_summary(self, video: Video, channel: str, key: str, summary: str) -> None:
+        with self._lock:
+            self._upsert_video(video, channel)
+            self._conn.execute(
+                "UPDATE videos SET summary = ?, summary_key = ?, summary_at = ? WHERE video_id = ?",
+                (summary, key, time.time(), video.id)
+            )
+
+    def summaries_since(self, since: float, limit: int = 256) -> List[Dict[str, Any]]:
+        """Stored summaries written after ``since``, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT video_id, channel, title, summary, summary_at FROM videos "
+                "WHERE summary IS NOT NULL AND summary_at > ? ORDER BY summary_at LIMIT ?",
+                (since, limit)
+            ).fetchall()
+        return [
+            {"video_id": video_id, "channel": channel, "title": title, "summary": summary, "summary_at": summary_at}
+            for video_id, channel, title, summary, summary_at in rows
+        ]
+
+    def get_videos(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored details (channel, title, url, published_at, summary) by video id."""
+        if not video_ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT video_id, channel, title, url, published_at, summary FROM videos "
+                f"WHERE video_id IN ({', '.join('?' for _ in video_ids)})",
+                list(video_ids)
+            ).fetchall()
+        return {
+            video_id: {"channel": channel, "title": title, "url": url, "published_at": published_at, "summary": summary}
+            for video_id, channel, title, url, published_at, summary in rows
+        }
+
+    def summaries_published(self, start: str, end: str) -> List[Dict[str, Any]]:
+        """Stored summaries of videos published in [start, end) (UTC ISO timestamps), by channel and date."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT video_id, channel, title, published_at, summary FROM videos "
+                "WHERE summary IS NOT NULL AND published_at >= ? AND published_at < ? ORDER BY channel, published_at",
+                (start, end)
+            ).fetchall()
+        return [
+            {"video_id": video_id, "channel": channel, "title": title, "published_at": published_at, "summary": summary}
+            for video_id, channel, title, published_at, summary in rows
+        ]
+
+    # ----- Digest rollups -----
+    # One condensed text per channel and period ("2026-W41" or "2026-10"),
+    # with a fingerprint of the inputs it was reduced from.
+
+    def get_rollups(self, period: str) -> Dict[str, Dict[str, Any]]:
+        """Cached rollups of a period (fingerprint, text, videos) by channel."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT channel, fingerprint, text, videos FROM rollups WHERE period = ?", (period,)
+            ).fetchall()
+        return {
+            channel: {"fingerprint": fingerprint, "text": text, "videos": videos}
+            for channel, fingerprint, text, videos in rows
+        }
+
+    def put_rollups(self, rollups: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Store (channel, period, rollup) entries, replacing older rollups of the same channel and period."""
+        if not rollups:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO rollups (channel, period, fingerprint, text, videos, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (channel, period, rollup["fingerprint"], rollup["text"], rollup["videos"], now)
+                        for channel, period, rollup in rollups
+                    ]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            videos, transcripts, summaries = self._conn.execute(
+                "SELECT COUNT(*), COUNT(NULLIF(transcript, '')), COUNT(summary) FROM videos"
+            ).fetchone()
+        return {"videos": videos, "transcripts": transcripts, "summaries": summaries}
+
+    # ----- Review runs -----
+    # A run checkpoints its plan (the videos to report, in order) and each
+    # finished entry, so an interrupted review resumes where it stopped. The
+    # report is stored before delivery and parts are counted as they are
+    # sent, so a resumed delivery continues instead of starting over.
+
+    def start_run(self, run_id: str, mode: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, mode, status, started_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, mode, RUNNING, now, now)
+            )
+
+    def interrupted_run(self, max_age: float) -> Optional[Dict[str, Any]]:
+        """The most recent unfinished run started within ``max_age`` seconds; older ones are abandoned."""
+        cutoff = time.time() - max_age
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE status IN (?, ?) AND started_at < ?",
+                (ABANDONED, time.time(), RUNNING, SENDING, cutoff)
+            )
+            row = self._conn.execute(
+                "SELECT run_id, mode, status, planned, report, parts_sent, videos FROM runs "
+                "WHERE status IN (?, ?) ORDER BY started_at DESC LIMIT 1",
+                (RUNNING, SENDING)
+            ).fetchone()
+        if row is None:
+            return None
+        run_id, mode, status, planned, report, parts_sent, videos = row
+        return {
+            "run_id": run_id,
+            "mode": mode,
+            "status": status,
+            "planned": bool(planned),
+            "report": json.loads(report) if report else None,
+            "parts_sent": parts_sent,
+            "videos": videos
+        }
+
+    def plan_run(self, run_id: str, items: List[Tuple[str, str, Video]]) -> None:
+        """Record the (channel, identifier, video) items a run will report, in order."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO run_items (run_id, position, channel, identifier, video) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (run_id, position, channel, identifier, json.dumps(video_to_dict(video)))
+                        for position, (channel, identifier, video) in enumerate(items)
+                    ]
+                )
+                self._conn.execute("UPDATE runs SET planned = 1, updated_at = ? WHERE run_id = ?", (time.time(), run_id))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def run_items(self, run_id: str) -> List[Dict[str, Any]]:
+        """A run's planned items in order, with ``entry`` set for the finished ones."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT channel, identifier, video, entry FROM run_items WHERE run_id = ? ORDER BY position", (run_id,)
+            ).fetchall()
+        return [
+            {
+                "channel": channel,
+                "identifier": identifier,
+                "video": video_from_dict(json.loads(video)),
+                "entry": json.loads(entry) if entry else None
+            }
+            for channel, identifier, video, entry in rows
+        ]
+
+    def checkpoint(self, run_id: str, position: int, entry: Dict[str, Any]) -> None:
+        """Durably record a finished entry (summary, has_transcript, degraded) of a run."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE run_items SET entry = ? WHERE run_id = ? AND position = ?",
+                (json.dumps(entry), run_id, position)
+            )
+
+    def set_run_report(self, run_id: str, blocks: List[str], videos: int) -> None:
+        """Store the built report and how many videos it covers; the run moves on to delivery."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, report = ?, parts_sent = 0, videos = ?, updated_at = ? WHERE run_id = ?",
+                (SENDING, json.dumps(blocks), videos, time.time(), run_id)
+            )
+
+    def mark_parts_sent(self, run_id: str, count: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET parts_sent = ?, updated_at = ? WHERE run_id = ?", (count, time.time(), run_id)
+            )
+
+    def finish_run(self, run_id: str, status: str = DELIVERED) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?", (status, time.time(), run_id)
+            )
@@ -0,0 +1,452 @@
+"""Local stand-ins for the external APIs, used by benchmarks and load tests.
+
+Each stub runs a threaded HTTP server on 127.0.0.1 (an ephemeral port by
+default) with a configurable per-request latency, so client behaviour under
+concurrency can be measured without network access or API keys.
+"""
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class EventStream:
+    """A route result sent as server-sent events, one ``data:`` line per item, as it is produced."""
+
+    def __init__(self, events: Iterable[Any]):
+        self.events = events
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("stub: " + format, *args)
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        if isinstance(payload, EventStream):
+            self._send_events(status, payload)
+            return
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_events(self, status: int, stream: EventStream) -> None:
+        # No Content-Length: the stream ends when the connection closes
+        self.send_response(status)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for event in stream.events:
+            data = event if isinstance(event, str) else json.dumps(event)
+            self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        status, payload = self.server.stub.handle("GET", parsed.path, params)
+        self._send_json(status, payload)
+
+    def do_POST(self) -> None:
+        parsed = urlparse(self.path)
+        status, payload = self.server.stub.handle("POST", parsed.path, self._read_json())
+        self._send_json(status, payload)
+
+
+class StubServer:
+    """Base class: subclasses implement ``handle(method, path, params)``."""
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def handle(self, method: str, path: str, params: Dict[str, Any]) -> Tuple[int, Any]:
+        with self._count_lock:
+            self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.route(method, path, params)
+
+    def route(self, method: str, path: str, params: Dict[str, Any]) -> Tuple[int, Any]:
+        raise NotImplementedError
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name=type(self).__name__)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def _stub_channel_id(handle: str) -> str:
+    digest = hashlib.sha1(handle.lower().encode("utf-8")).hexdigest()
+    return "UC" + digest[:22]
+
+
+class StubYouTubeServer(StubServer):
+    """Serves channels.list, playlistItems.list, videos.list and search.list under /youtube/v3/."""
+
+    def route(self, method: str, path: str, params: Dict[str, Any]) -> Tuple[int, Any]:
+        resource = path.rstrip("/").rsplit("/", 1)[-1]
+        if resource == "channels":
+            if "forHandle" in params:
+                return 200, {"items": [{"id": _stub_channel_id(params["forHandle"])}]}
+            channel_id = params.get("id", "")
+            return 200, {"items": [{
+                "id": channel_id,
+                "contentDetails": {"relatedPlaylists": {"uploads": "UU" + channel_id[2:]}}
+            }]}
+        if resource == "search":
+            return 200, {"items": [{"id": {"channelId": _stub_channel_id(params.get("q", "").lstrip("@"))}}]}
+        if resource == "playlistItems":
+            playlist_id = params.get("playlistId", "")
+            count = int(params.get("maxResults", 5))
+            return 200, {"items": [self._snippet(playlist_id, i) for i in range(count)]}
+        if resource == "videos":
+            ids = [video_id for video_id in params.get("id", "").split(",") if video_id]
+            return 200, {"items": [{"id": video_id, "snippet": {"title": f"Video {video_id}"}} for video_id in ids]}
+        return 404, {"error": {"code": 404, "message": f"Unknown resource {resource}"}}
+
+    @staticmethod
+    def _snippet(playlist_id: str, index: int) -> Dict[str, Any]:
+        video_id = f"{playlist_id[2:10]}{index:03d}"
+        return {"snippet": {
+            "title": f"Stub video {index} of {playlist_id}",
+            "description": "Stub description.",
+            "channelTitle": f"Channel {playlist_id[2:8]}",
+            "publishedAt": "2026-01-01T00:00:00Z",
+            "resourceId": {"videoId": video_id}
+        }}
+
+
+class StubTelegramServer(StubServer):
+    """Bot API stand-in: serves queued synthetic updates and records what the bot sends.
+
+    ``push_update`` queues a text message; ``getUpdates`` long-polls for at
+    most ``max_poll_wait`` seconds (so a polling bot notices a stop quickly)
+    and, like Telegram, keeps returning an update until a later offset
+    confirms it. Outgoing calls are counted per method; the most recent ones
+    are kept in ``sent``.
+    """
+
+    def __init__(self, latency: float = 0.0, max_poll_wait: float = 1.0, **kwargs: Any):
+        super().__init__(latency, **kwargs)
+        self.max_poll_wait = max_poll_wait
+        self._cond = threading.Condition()
+        self._updates: Deque[Dict[str, Any]] = deque()
+        self._closed = False
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self.pushed_at: Dict[int, float] = {}  # update_id -> time.monotonic() when queued
+        self.delivered_at: Dict[int, float] = {}  # update_id -> first getUpdates that returned it
+        self.call_counts: Dict[str, int] = {}
+        self.sent: Deque[Dict[str, Any]] = deque(maxlen=100)
+
+    def _message_id(self) -> int:
+        message_id = self._next_message_id
+        self._next_message_id += 1
+        return message_id
+
+    def push_update(self, chat_id: int, text: str, first_name: str = "LoadTest") -> Dict[str, Any]:
+        """Queue a text message from ``chat_id``. Returns the update."""
+        with self._cond:
+            update_id = self._next_update_id
+            self._next_update_id += 1
+            update = {
+                "update_id": update_id,
+                "message": {
+                    "message_id": self._message_id(),
+                    "date": int(time.time()),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "from": {"id": chat_id, "is_bot": False, "first_name": first_name},
+                    "text": text
+                }
+            }
+            self._updates.append(update)
+            self.pushed_at[update_id] = time.monotonic()
+            self._cond.notify_all()
+        return update
+
+    def pending(self) -> int:
+        """Updates queued but not yet confirmed by the bot."""
+        with self._cond:
+            return len(self._updates)
+
+    def route(self, method: str, path: str, params: Dict[str, Any]) -> Tuple[int, Any]:
+        api_method = path.rstrip("/").rsplit("/", 1)[-1]
+        with self._cond:
+            self.call_counts[api_method] = self.call_counts.get(api_method, 0) + 1
+        if api_method == "getUpdates":
+            return 200, {"ok": True, "result": self._get_updates(params)}
+        if api_method in ("sendMessage", "editMessageText"):
+            with self._cond:
+                message_id = params.get("message_id") or self._message_id()
+                self.sent.append({
+                    "method": api_method, "chat_id": params.get("chat_id"), "text": params.get("text"), "at": time.monotonic()
+                })
+            return 200, {"ok": True, "result": {
+                "message_id": message_id,
+                "date": int(time.time()),
+                "chat": {"id": params.get("chat_id")},
+                "text": params.get("text")
+            }}
+        if api_method in ("deleteMessage", "deleteMessages", "setWebhook", "deleteWebhook"):
+            return 200, {"ok": True, "result": True}
+        return 404, {"ok": False, "error_code": 404, "description": f"Unknown method {api_method}"}
+
+    def _get_updates(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        offset = int(params.get("offset") or 0)
+        deadline = time.monotonic() + min(float(params.get("timeout") or 0), self.max_poll_wait)
+        with self._cond:
+            while self._updates and self._updates[0]["update_id"] < offset:
+                self._updates.popleft()
+            while not self._updates and not self._closed:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                self._cond.wait(left)
+            batch = list(self._updates)[:100]
+            now = time.monotonic()
+            for update in batch:
+                self.delivered_at.setdefault(update["update_id"], now)
+        return batch
+
+    def stop(self) -> None:
+        # Release long polls so the server can shut down promptly
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        super().stop()
+
+
+class StubTranscriptClient:
+    """In-process stand-in for TranscriptClient (transcripts are scraped from YouTube, so there is no API to stub).
+
+    Returns ``words`` words of filler text, different for each video id.
+    """
+
+    _WORDS = ("model", "data", "server", "latency", "release", "feature", "python", "rust", "cache", "review",
+              "benchmark", "memory", "network", "design", "update", "video", "channel", "summary", "query", "index")
+
+    def __init__(self, words: int = 400, max_chars: Optional[int] = None):
+        self.words = words
+        self.max_chars = max_chars
+
+    def get_transcript(self, video_id: str, languages: List[str] = ["en"]) -> str:
+        rng = random.Random(video_id)
+        text = " ".join(rng.choice(self._WORDS) for _ in range(self.words))
+        return text[:self.max_chars] if self.max_chars else text
+
+
+# Keyword rules standing in for a model's intent classification
+_STUB_INTENTS = [
+    (re.compile(r"\b(add|subscribe|follow)\b"), "ADD_CHANNEL"),
+    (re.compile(r"\b(remove|delete|unsubscribe|drop)\b"), "REMOVE_CHANNEL"),
+    (re.compile(r"\b(find|search|look up|which videos)\b"), "SEARCH"),
+    (re.compile(r"\b(list|show)\b.*\bchannels?\b|\bmy channels\b"), "LIST_CHANNELS"),
+    (re.compile(r"\b(review|new videos|what's new|latest|summar\w*|overview)\b"), "RUN_REVIEW"),
+    (re.compile(r"\b(status|health|running)\b"), "STATUS"),
+    (re.compile(r"\b(help|hi|hello|hey|start)\b"), "HELP"),
+]
+_STUB_TOPIC = re.compile(r"\b(?:about|for|covered|on)\s+(.+?)[?.!]*$", re.IGNORECASE)
+
+
+def stub_intent(text: str) -> Dict[str, Any]:
+    """Keyword-based intent in the classifier's output format."""
+    lowered = text.lower()
+    action = next((action for pattern, action in _STUB_INTENTS if pattern.search(lowered)), "UNKNOWN")
+    arg = None
+    if action in ("ADD_CHANNEL", "REMOVE_CHANNEL"):
+        handle = re.search(r"@[\w.-]+", text)
+        words = text.split()
+        arg = handle.group(0) if handle else (words[-1] if len(words) > 1 else None)
+    elif action == "SEARCH":
+        topic = _STUB_TOPIC.search(text)
+        arg = topic.group(1) if topic else None
+    return {"action": action, "arg": arg}
+
+
+def _stub_sentences(text: str, count: int) -> str:
+    words = [word for word in re.findall(r"[\w'-]+", text) if word not in ("Title", "Description", "Transcript", "N", "A")]
+    if not words:
+        return "The video has no content to summarize."
+    sentences = []
+    for index in range(max(count, 1)):
+        chunk = words[index * 8:(index + 1) * 8]
+        if not chunk:
+            break
+        sentences.append(f"It covers {' '.join(chunk)}.")
+    return " ".join(sentences)
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class StubLLMServer(StubServer):
+    """OpenAI-compatible LLM stand-in: chat completions (plain and streamed), models and embeddings.
+
+    Answers are synthetic but shaped like a model's: intents come from
+    keyword rules, packed prompts get JSON for every id they list, and
+    summaries are built from the prompt's own words. Before the first token
+    it waits ``latency`` plus the prompt at ``prompt_tokens_per_sec``;
+    tokens then stream at ``tokens_per_sec`` (0 means instantly). A
+    ``failure_rate`` share of completions fails with HTTP 500.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        tokens_per_sec: float = 0.0,
+        prompt_tokens_per_sec: float = 0.0,
+        failure_rate: float = 0.0,
+        models: Tuple[str, ...] = ("stub-model",),
+        embedding_dim: int = 64,
+        seed: Optional[int] = None,
+        **kwargs: Any
+    ):
+        super().__init__(latency, **kwargs)
+        self.tokens_per_sec = tokens_per_sec
+        self.prompt_tokens_per_sec = prompt_tokens_per_sec
+        self.failure_rate = failure_rate
+        self.models = list(models)
+        self.embedding_dim = embedding_dim
+        self.completions = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+
+    def route(self, method: str, path: str, params: Dict[str, Any]) -> Tuple[int, Any]:
+        if path.endswith("/models"):
+            return 200, {"object": "list", "data": [{"id": model, "object": "model"} for model in self.models]}
+        if path.endswith("/embeddings") and method == "POST":
+            return 200, self._embeddings(params)
+        if path.endswith("/chat/completions") and method == "POST":
+            return self._completion(params)
+        return 404, {"error": {"message": f"Unknown path {path}", "type": "invalid_request_error"}}
+
+    def _embeddings(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        texts = params.get("input") or []
+        if isinstance(texts, str):
+            texts = [texts]
+        data = []
+        for index, text in enumerate(texts):
+            vector = [0.0] * self.embedding_dim
+            for word in re.findall(r"\w+", text.lower()):
+                vector[int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % self.embedding_dim] += 1.0
+            data.append({"object": "embedding", "index": index, "embedding": vector})
+        tokens = sum(_estimate_tokens(text) for text in texts)
+        return {"object": "list", "data": data, "model": params.get("model"), "usage": {"prompt_tokens": tokens, "total_tokens": tokens}}
+
+    def answer(self, messages: List[Dict[str, Any]]) -> str:
+        """The synthetic reply to a chat conversation."""
+        system = next((str(m.get("content", "")) for m in messages if m.get("role") == "system"), "")
+        user = next((str(m.get("content", "")) for m in reversed(messages) if m.get("role") == "user"), "")
+        sentences = re.search(r"at most (\d+) sentences", system)
+        count = int(sentences.group(1)) if sentences else 3
+        if "classify user messages" in system:
+            return json.dumps(stub_intent(user))
+        for key, marker in (("rollups", "Channel id"), ("summaries", "Video id")):
+            if f'"{key}"' in system:
+                blocks = re.split(rf"^### {marker}: ", user, flags=re.MULTILINE)[1:]
+                entries = []
+                for block in blocks:
+                    item_id, _, body = block.partition("\n")
+                    entries.append({"id": item_id.strip(), "summary": _stub_sentences(body, count)})
+                return json.dumps({key: entries})
+        return _stub_sentences(user, count)
+
+    def _completion(self, params: Dict[str, Any]) -> Tuple[int, Any]:
+        with self._count_lock:
+            self.completions += 1
+            failed = self.failure_rate > 0 and self._random.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+        if failed:
+            return 500, {"error": {"message": "Stub failure", "type": "server_error"}}
+        messages = params.get("messages") or []
+        prompt_tokens = sum(_estimate_tokens(str(m.get("content", ""))) for m in messages)
+        if self.prompt_tokens_per_sec:
+            time.sleep(prompt_tokens / self.prompt_tokens_per_sec)
+        # Whitespace stays attached to the following word, so the chunks join back to the answer
+        tokens = re.findall(r"\s*\S+", self.answer(messages)) or [""]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = params.get("model") or self.models[0]
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens), "total_tokens": prompt_tokens + len(tokens)}
+        delay = 1.0 / self.tokens_per_sec if self.tokens_per_sec else 0.0
+        if not params.get("stream"):
+            time.sleep(delay * len(tokens))
+            return 200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}, "finish_reason": "stop"}],
+                "usage": usage
+            }
+
+        def events() -> Iterable[Any]:
+            def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> Dict[str, Any]:
+                return {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                }
+
+            yield chunk({"role": "assistant", "content": ""})
+            for index, token in enumerate(tokens):
+                if index and delay:
+                    time.sleep(delay)
+                yield chunk({"content": token})
+            final = chunk({}, "stop")
+            if (params.get("stream_options") or {}).get("include_usage"):
+                final["usage"] = usage
+            yield final
+            yield "[DONE]"
+
+        return 200, EventStream(events())
@@ -1,8 +1,15 @@
+import atexit
 import requests
+import json
 import logging
+import os
 import re
+import threading
 import time
-from typing import Union, Dict, Any, List
+from collections import deque
+from typing import Union, Dict, Any, List, Optional, Deque, Sequence, Callable
+
+from .message_chunker import pack_blocks, split_message
 
 logger = logging.getLogger(__name__)
 
@@ -12,12 +19,164 @@ def escape_markdown(text: str) -> str:
     return re.sub(r'([_*`\[\]])', r'\\\1', text or "")
 
 
+class MessageHistory:
+    """Bounded per-chat ring buffer of message ids, persisted as JSON.
+
+    Telegram offers no way to list a chat's messages, so the client remembers
+    the ids it sent and received in order to delete them later. Changes are
+    written by a background timer at most once per ``save_interval`` seconds
+    (and at exit), never on the message path.
+    """
+
+    def __init__(self, path: Optional[str] = None, size: int = 500, save_interval: float = 5.0):
+        self.path = path
+        self.size = size
+        self.save_interval = save_interval
+        self._chats: Dict[str, Deque[int]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._load()
+        if path:
+            atexit.register(self.flush)
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._chats = {chat: deque(ids, maxlen=self.size) for chat, ids in data.items()}
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load message history from {self.path}: {e}")
+
+    def _schedule_save(self) -> None:
+        """Mark the history changed; called with the lock held."""
+        self._dirty = True
+        if self.path and self._timer is None:
+            self._timer = threading.Timer(self.save_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._dirty:
+                self._save()
+                self._dirty = False
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({chat: list(ids) for chat, ids in self._chats.items()}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save message history to {self.path}: {e}")
+
+    def add(self, chat_id: Union[str, int], message_id: int) -> None:
+        with self._lock:
+            ids = self._chats.setdefault(str(chat_id), deque(maxlen=self.size))
+            if message_id not in ids:
+                ids.append(message_id)
+                self._schedule_save()
+
+    def get(self, chat_id: Union[str, int]) -> List[int]:
+        with self._lock:
+            return list(self._chats.get(str(chat_id), ()))
+
+    def discard(self, chat_id: Union[str, int], message_ids: List[int]) -> None:
+        with self._lock:
+            ids = self._chats.get(str(chat_id))
+            if not ids:
+                return
+            removed = set(message_ids)
+            self._chats[str(chat_id)] = deque((m for m in ids if m not in removed), maxlen=self.size)
+            self._schedule_save()
+
+
+class ProgressMessage:
+    """A single status message that is sent once and then edited in place.
+
+    Edits are throttled to at most one per ``min_interval`` seconds; intermediate
+    updates that arrive faster are coalesced and only the latest text is shown.
+    """
+
+    def __init__(self, client: "TelegramClient", chat_id: Union[str, int], min_interval: float = 1.5):
+        self.client = client
+        self.chat_id = chat_id
+        self.min_interval = min_interval
+        self.message_id: Optional[int] = None
+        self.finished = False
+        self.edit_count = 0
+        self._text = ""
+        self._shown = ""
+        self._last_edit = 0.0
+        self._lock = threading.Lock()
+
+    def start(self, text: str) -> "ProgressMessage":
+        result = self.client.send_message(self.chat_id, text)
+        self.message_id = (result.get("result") or {}).get("message_id") if result else None
+        self._text = self._shown = text
+        self._last_edit = time.monotonic()
+        return self
+
+    def update(self, text: str, force: bool = False, parse_mode: Optional[str] = "Markdown") -> None:
+        """Show new text, unless the last edit was less than min_interval ago."""
+        with self._lock:
+            if self.finished:
+                return
+            self._text = text
+            if not force and time.monotonic() - self._last_edit < self.min_interval:
+                return
+            self._flush(parse_mode)
+
+    def finish(self, text: str) -> None:
+        """Replace the status with its final text and stop further updates."""
+        with self._lock:
+            if self.finished:
+                return
+            self.finished = True
+            self._text = text
+            if self.message_id is None or len(text) > TelegramClient.MAX_MESSAGE_LENGTH:
+                # Too long to fit the status message (or it was never sent): post it normally.
+                if self.message_id is not None:
+                    self.client.delete_message(self.chat_id, self.message_id)
+                self.client.send_message(self.chat_id, text)
+                return
+            self._flush("Markdown")
+
+    def _flush(self, parse_mode: Optional[str]) -> None:
+        if self.message_id is None or self._text == self._shown:
+            return
+        self._last_edit = time.monotonic()
+        if self.client.edit_message_text(self.chat_id, self.message_id, self._text, parse_mode=parse_mode):
+            self._shown = self._text
+            self.edit_count += 1
+
+
 class TelegramClient:
-    def __init__(self, token: str):
+    MAX_MESSAGE_LENGTH = 4096
+    # deleteMessages accepts at most 100 ids per call
+    DELETE_BATCH_SIZE = 100
+
+    def __init__(
+        self,
+        token: str,
+        history_path: Optional[str] = None,
+        history_size: int = 500,
+        api_base: str = "https://api.telegram.org"
+    ):
         self.token = token
-        self.base_url = f"https://api.telegram.org/bot{token}"
+        self.base_url = f"{api_base.rstrip('/')}/bot{token}"
         # Use session for connection pooling
         self.session = requests.Session()
+        self.history = MessageHistory(history_path, size=history_size)
 
     def send_message(self, chat_id: Union[str, int], text: str) -> Dict[str, Any]:
         # Telegram message length limit is 4096 characters.
@@ -28,38 +187,43 @@ class TelegramClient:
         if len(text) <= max_length:
             return self._send_chunk(chat_id, text)
 
-        parts = self._split_text(text, chunk_size)
-        result = None
+        return self._send_parts(chat_id, split_message(text, chunk_size))
+
+    def send_blocks(
+        self,
+        chat_id: Union[str, int],
+        blocks: Sequence[str],
+        separator: str = "\n",
+        start: int = 0,
+        on_sent: Optional[Callable[[int], None]] = None
+    ) -> Dict[str, Any]:
+        """Send a message assembled from blocks, packing whole blocks into each part.
+
+        ``start`` skips parts already delivered (the same blocks always pack
+        into the same parts); ``on_sent`` receives the number of parts sent so far.
+        """
+        return self._send_parts(chat_id, pack_blocks(blocks, 3950, separator), start, on_sent)
+
+    def _send_parts(
+        self,
+        chat_id: Union[str, int],
+        parts: List[str],
+        start: int = 0,
+        on_sent: Optional[Callable[[int], None]] = None
+    ) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
         for i, part in enumerate(parts):
+            if i < start:
+                continue
+            if i > start:
+                # Stay clear of Telegram's per-chat flood limits
+                time.sleep(1)
             header = f"[Part {i + 1}/{len(parts)}]\n" if len(parts) > 1 else ""
             result = self._send_chunk(chat_id, header + part)
-            time.sleep(1)
+            if on_sent is not None:
+                on_sent(i + 1)
         return result
 
-    def _split_text(self, text: str, chunk_size: int) -> List[str]:
-        """Split long messages at natural boundaries to reduce markdown breakage."""
-        remaining = text
-        parts: List[str] = []
-
-        while len(remaining) > chunk_size:
-            window = remaining[:chunk_size]
-            split_index = max(
-                window.rfind("\n\n"),
-                window.rfind("\n"),
-                window.rfind(". "),
-                window.rfind(" ")
-            )
-            if split_index < chunk_size // 2:
-                split_index = chunk_size
-
-            chunk = remaining[:split_index].rstrip()
-            parts.append(chunk)
-            remaining = remaining[split_index:].lstrip()
-
-        if remaining:
-            parts.append(remaining)
-        return parts
-
     def _send_chunk(self, chat_id: Union[str, int], text: str) -> Dict[str, Any]:
         url = f"{self.base_url}/sendMessage"
         payload = {
@@ -71,13 +235,58 @@ class TelegramClient:
         try:
             response = self.session.post(url, json=payload, timeout=10)
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            message_id = (data.get("result") or {}).get("message_id")
+            if message_id is not None:
+                self.history.add(chat_id, message_id)
+            return data
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to send Telegram message: {e}")
             if hasattr(e, 'response') and e.response is not None:
                 logger.error(f"Response: {e.response.text}")
             return {}
     
+    def edit_message_text(
+        self,
+        chat_id: Union[str, int],
+        message_id: int,
+        text: str,
+        parse_mode: Optional[str] = "Markdown"
+    ) -> bool:
+        """Replace the text of a message the bot sent earlier.
+
+        Args:
+            chat_id: Chat ID
+            message_id: Message ID to edit
+            text: New message text
+            parse_mode: Telegram parse mode, or None for plain text
+
+        Returns:
+            True if successful (or the text was unchanged), False otherwise
+        """
+        url = f"{self.base_url}/editMessageText"
+        payload: Dict[str, Any] = {
+            "chat_id": chat_id,
+            "message_id": message_id,
+            "text": text
+        }
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+
+        try:
+            response = self.session.post(url, json=payload, timeout=10)
+            if response.status_code == 400 and "message is not modified" in response.text:
+                return True
+            response.raise_for_status()
+            return response.json().get("ok", False)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Failed to edit message {message_id}: {e}")
+            return False
+
+    def progress(self, chat_id: Union[str, int], text: str, min_interval: float = 1.5) -> ProgressMessage:
+        """Send a status message that can later be updated in place."""
+        return ProgressMessage(self, chat_id, min_interval=min_interval).start(text)
+
     def delete_message(self, chat_id: Union[str, int], message_id: int) -> bool:
         """Delete a specific message.
         
@@ -103,3 +312,97 @@ class TelegramClient:
             logger.debug(f"Failed to delete message {message_id}: {e}")
             return False
 
+    def track_message(self, chat_id: Union[str, int], message_id: int) -> None:
+        """Remember an incoming message so /clean can delete it later."""
+        self.history.add(chat_id, message_id)
+
+    def delete_messages(self, chat_id: Union[str, int], message_ids: List[int]) -> int:
+        """Delete messages in batches using deleteMessages.
+
+        Ids that no longer exist or are too old are skipped by Telegram.
+
+        Args:
+            chat_id: Chat ID
+            message_ids: Message IDs to delete
+
+        Returns:
+            Number of ids covered by successful batch calls
+        """
+        url = f"{self.base_url}/deleteMessages"
+        ids = sorted(set(message_ids))
+        deleted = 0
+        for start in range(0, len(ids), self.DELETE_BATCH_SIZE):
+            batch = ids[start:start + self.DELETE_BATCH_SIZE]
+            try:
+                response = self.session.post(url, json={"chat_id": chat_id, "message_ids": batch}, timeout=10)
+                response.raise_for_status()
+                if response.json().get("ok", False):
+                    deleted += len(batch)
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Failed to delete {len(batch)} messages: {e}")
+        self.history.discard(chat_id, ids)
+        return deleted
+
+    def get_updates(self, offset: Optional[int] = None, timeout: int = 30) -> Optional[List[Dict[str, Any]]]:
+        """Long-poll Telegram for new updates over the pooled session.
+
+        Args:
+            offset: Identifier of the first update to return
+            timeout: Long polling timeout in seconds
+
+        Returns:
+            List of updates, or None if the request failed
+        """
+        url = f"{self.base_url}/getUpdates"
+        params: Dict[str, Any] = {
+            "timeout": timeout,
+            "allowed_updates": json.dumps(["message"])
+        }
+        if offset:
+            params["offset"] = offset
+
+        try:
+            response = self.session.get(url, params=params, timeout=timeout + 5)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Error getting updates: {e}")
+            return None
+
+        if not data.get("ok"):
+            logger.error(f"Failed to get updates: {data}")
+            return None
+        return data.get("result", [])
+
+    def set_webhook(self, url: str, secret_token: str) -> bool:
+        """Register a webhook URL so Telegram pushes updates instead of being polled.
+
+        Args:
+            url: Public HTTPS URL that forwards to the local webhook server
+            secret_token: Value Telegram sends in the X-Telegram-Bot-Api-Secret-Token header
+
+        Returns:
+            True if successful, False otherwise
+        """
+        payload = {
+            "url": url,
+            "secret_token": secret_token,
+            "allowed_updates": ["message"]
+        }
+        try:
+            response = self.session.post(f"{self.base_url}/setWebhook", json=payload, timeout=10)
+            response.raise_for_status()
+            return response.json().get("ok", False)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to set webhook: {e}")
+            return False
+
+    def delete_webhook(self) -> bool:
+        """Remove the registered webhook so long polling works again."""
+        try:
+            response = self.session.post(f"{self.base_url}/deleteWebhook", json={}, timeout=10)
+            response.raise_for_status()
+            return response.json().get("ok", False)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to delete webhook: {e}")
+            return False
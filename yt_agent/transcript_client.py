@@ -1,37 +1,138 @@
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 import logging
-from typing import List
+import re
+from html import unescape
+from typing import Iterator, List, NamedTuple, Optional
+from xml.etree import ElementTree
 
 logger = logging.getLogger(__name__)
 
+_HTML_TAG_RE = re.compile(r"<[^>]*>")
+
+
+class Segment(NamedTuple):
+    text: str
+    start: float
+    duration: float
+
+
+class BoundedTranscript:
+    """Collects transcript text in bounded memory.
+
+    Once the kept text exceeds ``max_chars``, every other kept segment is
+    dropped and only every 2nd (then 4th, 8th, ...) new segment is accepted,
+    so the result stays evenly spread over the whole video no matter how long
+    it is.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None):
+        self.max_chars = max_chars
+        self.texts: List[str] = []
+        self.chars = 0
+        self.seen = 0
+        self._stride = 1
+
+    def add(self, text: str) -> None:
+        index = self.seen
+        self.seen += 1
+        if index % self._stride:
+            return
+        self.texts.append(text)
+        self.chars += len(text) + 1
+        if self.max_chars and self.chars > self.max_chars:
+            self._decimate()
+
+    def _decimate(self) -> None:
+        self.texts = self.texts[::2]
+        self.chars = sum(len(text) + 1 for text in self.texts)
+        self._stride *= 2
+
+    @property
+    def sampled(self) -> bool:
+        return self._stride > 1
+
+    def text(self) -> str:
+        return " ".join(self.texts)
+
+
 class TranscriptClient:
-    def __init__(self):
+    def __init__(self, max_chars: Optional[int] = 60000):
         self.yt_api = YouTubeTranscriptApi()
+        # Upper bound on transcript text kept per video; None keeps everything.
+        self.max_chars = max_chars
+
+    def _find_transcript(self, video_id: str, languages: List[str]):
+        # Use instance method .list() which returns a TranscriptList object
+        transcript_list = self.yt_api.list(video_id)
 
-    def get_transcript(self, video_id: str, languages: List[str] = ["en"]) -> str:
         try:
-            # Use instance method .list() which returns a TranscriptList object
-            transcript_list = self.yt_api.list(video_id)
-            
+            return transcript_list.find_transcript(languages)
+        except NoTranscriptFound:
+            # Try fallback to English or first available
             try:
-                transcript = transcript_list.find_transcript(languages)
+                return transcript_list.find_transcript(['en'])
             except NoTranscriptFound:
-                # Try fallback to English or first available
-                try:
-                    transcript = transcript_list.find_transcript(['en'])
-                except NoTranscriptFound:
-                    # Just grab the first available
-                    available = []
-                    for t in transcript_list:
-                        available.append(t)
-                    if available:
-                        transcript = available[0]
-                    else:
-                        raise NoTranscriptFound("No transcripts available")
-
-            # fetch() returns a list of dictionaries
-            transcript_data = transcript.fetch()
-            return " ".join([t['text'] for t in transcript_data])
+                # Just grab the first available
+                for t in transcript_list:
+                    return t
+                raise NoTranscriptFound("No transcripts available")
+
+    def iter_segments(self, video_id: str, languages: List[str] = ["en"]) -> Iterator[Segment]:
+        """Stream transcript segments without materializing the whole transcript.
+
+        The timed-text XML is parsed incrementally from the response stream and
+        each element is discarded once yielded. Raises the library's errors
+        (e.g. TranscriptsDisabled) instead of swallowing them.
+        """
+        transcript = self._find_transcript(video_id, languages)
+        # Streaming needs Transcript's private _url/_http_client, present in the
+        # youtube-transcript-api version pinned in requirements.txt (1.2.4).
+        url = getattr(transcript, "_url", None)
+        http_client = getattr(transcript, "_http_client", None)
+        if not url or http_client is None:
+            logger.warning(
+                f"youtube-transcript-api internals changed, loading the whole transcript for {video_id} "
+                f"with fetch(); install the version pinned in requirements.txt to stream it"
+            )
+        if not url or http_client is None or "&exp=xpe" in url:
+            # fetch() raises PoTokenRequired for "&exp=xpe" URLs
+            for snippet in transcript.fetch():
+                yield Segment(snippet.text, snippet.start, snippet.duration)
+            return
+
+        response = http_client.get(url, stream=True)
+        try:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            root = None
+            for event, element in ElementTree.iterparse(response.raw, events=("start", "end")):
+                if root is None:
+                    root = element
+                    continue
+                if event != "end" or element.tag != "text":
+                    continue
+                if element.text is not None:
+                    yield Segment(
+                        _HTML_TAG_RE.sub("", unescape(element.text)),
+                        float(element.attrib.get("start", "0.0")),
+                        float(element.attrib.get("dur", "0.0"))
+                    )
+                # Drop parsed elements so memory stays flat for 10-hour transcripts.
+                root.clear()
+        finally:
+            response.close()
+
+    def get_transcript(self, video_id: str, languages: List[str] = ["en"]) -> str:
+        try:
+            collected = BoundedTranscript(self.max_chars)
+            for segment in self.iter_segments(video_id, languages):
+                collected.add(segment.text)
+            if collected.sampled:
+                logger.info(
+                    f"Transcript for {video_id} sampled: kept {len(collected.texts)} of "
+                    f"{collected.seen} segments ({collected.chars} chars)"
+                )
+            return collected.text()
 
         except (TranscriptsDisabled, NoTranscriptFound) as e:
             logger.info(f"No transcript found for video {video_id}: {e}")
@@ -39,5 +140,3 @@ class TranscriptClient:
         except Exception as e:
             logger.error(f"Error fetching transcript for {video_id}: {e}")
             return ""
-
-
@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Deque, Set
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateJournal:
+    """Append-only journal of claimed Telegram update ids.
+
+    Every update is claimed (and fsynced) *before* it is processed, so a crash
+    or restart never replays a command such as /review. The file holds one JSON
+    record per line and is periodically compacted into a single snapshot of the
+    highest offset plus the most recent ids.
+    """
+
+    def __init__(self, path: str, retain: int = 1000, compact_every: int = 500):
+        self.path = path
+        self.retain = retain
+        self.compact_every = compact_every
+        self.offset = 0  # Highest update_id ever claimed
+        self._floor = 0  # Every id <= floor counts as processed
+        self._recent: Deque[int] = deque()
+        self._seen: Set[int] = set()
+        self._appended = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-write; everything before it is valid.
+                        logger.warning(f"Skipping corrupt line in {self.path}")
+                        continue
+                    if "snapshot" in record:
+                        self.offset = max(self.offset, record.get("offset", 0))
+                        self._floor = max(self._floor, record.get("floor", 0))
+                        for update_id in record.get("recent", []):
+                            self._remember(update_id)
+                    elif "update_id" in record:
+                        self._remember(record["update_id"])
+                        self._appended += 1
+            logger.info(f"Resuming from update offset {self.offset} ({self.path})")
+        except OSError as e:
+            logger.error(f"Failed to load update journal from {self.path}: {e}")
+
+    def _remember(self, update_id: int) -> None:
+        if update_id in self._seen:
+            return
+        self._seen.add(update_id)
+        self._recent.append(update_id)
+        self.offset = max(self.offset, update_id)
+        while len(self._recent) > self.retain:
+            dropped = self._recent.popleft()
+            self._seen.discard(dropped)
+            self._floor = max(self._floor, dropped)
+
+    def is_processed(self, update_id: int) -> bool:
+        with self._lock:
+            return update_id <= self._floor or update_id in self._seen
+
+    def claim(self, update_id: int) -> bool:
+        """Record an update as taken. Returns False if it was already claimed."""
+        with self._lock:
+            if update_id <= self._floor or update_id in self._seen:
+                return False
+            self._remember(update_id)
+            self._append({"update_id": update_id})
+            self._appended += 1
+            if self._appended >= self.compact_every:
+                self._compact()
+            return True
+
+    def _append(self, record: dict) -> None:
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.error(f"Failed to append to update journal {self.path}: {e}")
+
+    def _compact(self) -> None:
+        snapshot = {
+            "snapshot": True,
+            "offset": self.offset,
+            "floor": self._floor,
+            "recent": list(self._recent)
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(snapshot) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._appended = 0
+            logger.debug(f"Compacted update journal at offset {self.offset}")
+        except OSError as e:
+            logger.error(f"Failed to compact update journal {self.path}: {e}")
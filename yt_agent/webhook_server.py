@@ -0,0 +1,133 @@
+import asyncio
+import hmac
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class WebhookServer:
+    """Embedded HTTP server that receives Telegram updates pushed via setWebhook.
+
+    Each verified update is acknowledged immediately and dispatched to
+    ``handler`` on a worker thread, so a slow command (e.g. /review) never
+    blocks other incoming messages.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Dict[str, Any]], None],
+        secret_token: str,
+        host: str = "127.0.0.1",
+        port: int = 8443,
+        path: str = "/telegram/webhook",
+        max_workers: int = 4
+    ):
+        if not secret_token:
+            raise ValueError("A webhook secret token is required.")
+        self.handler = handler
+        self.secret_token = secret_token
+        self.host = host
+        self.port = port
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="webhook")
+        self._pending: Set[asyncio.Future] = set()
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: Optional[asyncio.Event] = None
+
+    def _build_app(self) -> web.Application:
+        app = web.Application(client_max_size=1024 * 1024)
+        app.router.add_post(self.path, self._handle_update)
+        return app
+
+    async def _handle_update(self, request: web.Request) -> web.Response:
+        token = request.headers.get(SECRET_HEADER, "")
+        if not hmac.compare_digest(token.encode(), self.secret_token.encode()):
+            logger.warning(f"Rejected webhook request with invalid secret from {request.remote}")
+            return web.Response(status=401)
+
+        try:
+            update = await request.json()
+        except ValueError:
+            return web.Response(status=400)
+        if not isinstance(update, dict):
+            return web.Response(status=400)
+
+        # Acknowledge right away; Telegram retries deliveries that are not answered quickly.
+        future = asyncio.get_running_loop().run_in_executor(self._executor, self._dispatch, update)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return web.Response(status=200)
+
+    def _dispatch(self, update: Dict[str, Any]) -> None:
+        try:
+            self.handler(update)
+        except Exception as e:
+            logger.error(f"Error handling webhook update {update.get('update_id')}: {e}", exc_info=True)
+
+    async def start(self) -> None:
+        """Bind the HTTP server on the current event loop."""
+        self._runner = web.AppRunner(self._build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Report the real port when an ephemeral one (0) was requested.
+        addresses = self._runner.addresses
+        if addresses:
+            self.port = addresses[0][1]
+        logger.info(f"Webhook server listening on http://{self.host}:{self.port}{self.path}")
+
+    async def stop(self) -> None:
+        """Stop accepting requests and wait for in-flight handlers to finish."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def _serve(self, ready: Optional[threading.Event] = None) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        await self.start()
+        if ready is not None:
+            ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            await self.stop()
+
+    def serve_forever(self) -> None:
+        """Run the server in the calling thread until shutdown() or Ctrl+C."""
+        try:
+            asyncio.run(self._serve())
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def start_background(self) -> None:
+        """Run the server on a daemon thread; returns once it is accepting requests."""
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=lambda: asyncio.run(self._serve(ready)),
+            daemon=True,
+            name="webhook-server"
+        )
+        self._thread.start()
+        if not ready.wait(timeout=10):
+            raise RuntimeError("Webhook server failed to start.")
+
+    def shutdown(self) -> None:
+        """Signal the server loop to stop; safe to call from any thread."""
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+            self._executor.shutdown(wait=True)
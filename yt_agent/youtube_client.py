@@ -1,13 +1,15 @@
 import logging
 import re
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import urlparse
 from dateutil import parser
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+
+from .quota import QuotaExceeded, QuotaTracker
+from .youtube_transport import YouTubeApiError, create_transport
 
 logger = logging.getLogger(__name__)
 CHANNEL_ID_RE = re.compile(r"^UC[a-zA-Z0-9_-]{22}$")
@@ -21,17 +23,61 @@ class Video:
     description: Optional[str] = None
     channel_name: Optional[str] = None
 
+def video_to_dict(video: Video) -> Dict[str, Any]:
+    """JSON-safe form of a Video (for job payloads and stored results)."""
+    data = asdict(video)
+    data["published_at"] = video.published_at.isoformat()
+    return data
+
+def video_from_dict(data: Dict[str, Any]) -> Video:
+    return Video(**{**data, "published_at": parser.parse(data["published_at"])})
+
+def uploads_playlist_id_for(channel_id: str) -> Optional[str]:
+    """Derive a channel's uploads playlist ID (UC... -> UU...) without an API call."""
+    if CHANNEL_ID_RE.match(channel_id or ""):
+        return "UU" + channel_id[2:]
+    return None
+
+
 class YouTubeClient:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        quota: Optional[QuotaTracker] = None,
+        search_reserve: int = 1000,
+        transport: str = "discovery",
+        api_base: Optional[str] = None,
+        max_workers: int = 4
+    ):
         if not api_key:
             raise ValueError("YouTube API Key is required.")
         self.api_key = api_key
+        self.quota = quota or QuotaTracker()
+        # Units kept back for cheap calls; the 100-unit search fallback may not dip into them.
+        self.search_reserve = search_reserve
+        self.max_workers = max_workers
         try:
-            self.service = build('youtube', 'v3', developerKey=self.api_key)
+            self.transport = create_transport(transport, self.api_key, api_base=api_base, pool_size=max(max_workers, 1))
         except Exception as e:
             logger.error(f"Failed to build YouTube service: {e}")
             raise
 
+    def _execute(self, method: str, keep: int = 0, **params):
+        """Call an API method (e.g. "channels.list"), accounting its quota cost.
+
+        The call is refused unless ``keep`` units remain after it.
+        """
+        if not self.quota.try_charge(method, keep=keep):
+            reserve = f" while keeping {keep} units in reserve" if keep else ""
+            raise QuotaExceeded(f"Not enough YouTube quota left for {method}{reserve} ({self.quota.summary()})")
+        try:
+            return self.transport.call(method, params)
+        except YouTubeApiError as e:
+            if e.is_quota_error:
+                self.quota.mark_exhausted()
+                raise QuotaExceeded(f"YouTube quota exceeded during {method}") from e
+            raise
+
     @lru_cache(maxsize=100)
     def get_channel_id_from_handle(self, handle: str) -> Optional[str]:
         """Gets channel ID from a channel handle (e.g., @Fireship). Results are cached."""
@@ -42,27 +88,34 @@ class YouTubeClient:
             return None
 
         try:
-            # Exact handle resolution when supported by the API.
-            channels_response = self.service.channels().list(
+            # Exact handle resolution when supported by the API (1 unit).
+            channels_response = self._execute(
+                "channels.list",
                 forHandle=normalized,
                 part='id'
-            ).execute()
+            )
             items = channels_response.get("items", [])
             if items:
                 return items[0]["id"]
 
-            # Fallback for compatibility when forHandle does not resolve.
-            search_response = self.service.search().list(
+            # Fallback for compatibility when forHandle does not resolve (100 units).
+            # It may not spend the reserve; QuotaExceeded defers it instead of caching "unresolvable".
+            search_response = self._execute(
+                "search.list",
+                keep=self.search_reserve,
                 q=f"@{normalized}",
                 type='channel',
                 part='id',
                 maxResults=1
-            ).execute()
+            )
             search_items = search_response.get("items", [])
             if search_items:
                 return search_items[0]["id"]["channelId"]
             return None
-        except HttpError as e:
+        except QuotaExceeded:
+            # Propagate so lru_cache does not remember a quota failure as "no such channel".
+            raise
+        except YouTubeApiError as e:
             logger.error(f"HTTP error resolving channel handle '{handle}': {e}")
             return None
         except Exception as e:
@@ -116,14 +169,17 @@ class YouTubeClient:
     def get_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
         """Gets the ID of the 'uploads' playlist for a given channel ID."""
         try:
-            channels_response = self.service.channels().list(
+            channels_response = self._execute(
+                "channels.list",
                 id=channel_id,
                 part='contentDetails'
-            ).execute()
+            )
             if not channels_response.get('items'):
                 return None
             return channels_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-        except HttpError as e:
+        except QuotaExceeded:
+            raise
+        except YouTubeApiError as e:
             logger.error(f"HTTP error getting uploads playlist for channel '{channel_id}': {e}")
             return None
         except Exception as e:
@@ -133,6 +189,9 @@ class YouTubeClient:
     def get_latest_videos(self, identifier: str, max_videos: int = 1) -> List[Video]:
         """
         Gets the latest videos from a channel using its ID, handle, or full URL.
+
+        Raises QuotaExceeded when the YouTube quota runs out, so callers can
+        tell a skipped channel from one without videos.
         """
         channel_id = self._resolve_channel_id_from_identifier(identifier)
 
@@ -140,17 +199,21 @@ class YouTubeClient:
             logger.error(f"Could not resolve a valid Channel ID from identifier: {identifier}")
             return []
 
-        uploads_playlist_id = self.get_uploads_playlist_id(channel_id)
+        # The uploads playlist ID follows from the channel ID, saving a channels.list call.
+        uploads_playlist_id = uploads_playlist_id_for(channel_id)
+        if not uploads_playlist_id:
+            uploads_playlist_id = self.get_uploads_playlist_id(channel_id)
         if not uploads_playlist_id:
             logger.error(f"Could not find uploads playlist for channel ID: {channel_id}")
             return []
 
         try:
-            playlist_items_response = self.service.playlistItems().list(
+            playlist_items_response = self._execute(
+                "playlistItems.list",
                 playlistId=uploads_playlist_id,
                 part='snippet',
                 maxResults=max_videos
-            ).execute()
+            )
 
             videos = []
             for item in playlist_items_response.get('items', []):
@@ -168,9 +231,40 @@ class YouTubeClient:
             
             return videos
 
-        except HttpError as e:
+        except QuotaExceeded:
+            raise
+        except YouTubeApiError as e:
             logger.error(f"HTTP error fetching videos for playlist '{uploads_playlist_id}': {e}")
             return []
         except Exception as e:
             logger.error(f"Error fetching videos for playlist '{uploads_playlist_id}': {e}")
             return []
+
+    def get_latest_videos_many(
+        self,
+        identifiers: List[str],
+        max_videos: int = 1,
+        on_done: Optional[Callable[[str, List[Video]], None]] = None
+    ) -> Dict[str, Optional[List[Video]]]:
+        """Fetch the latest videos for several channels concurrently.
+
+        Returns a mapping of identifier to videos; channels skipped because
+        the YouTube quota ran out map to None. ``on_done`` is called from the
+        worker threads as each channel finishes.
+        """
+        def fetch(identifier: str) -> Optional[List[Video]]:
+            try:
+                videos = self.get_latest_videos(identifier, max_videos=max_videos)
+            except QuotaExceeded as e:
+                logger.error(f"Skipping '{identifier}': {e}")
+                videos = None
+            if on_done is not None:
+                on_done(identifier, videos or [])
+            return videos
+
+        unique = list(dict.fromkeys(identifiers))
+        if self.max_workers <= 1 or len(unique) <= 1:
+            return {identifier: fetch(identifier) for identifier in unique}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="youtube") as executor:
+            return dict(zip(unique, executor.map(fetch, unique)))
@@ -0,0 +1,99 @@
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_BASE = "https://youtube.googleapis.com/"
+
+
+class YouTubeApiError(Exception):
+    """An error response from the YouTube Data API, independent of the transport used."""
+
+    def __init__(self, status: Optional[int], content: str):
+        super().__init__(f"YouTube API error {status}: {content[:200]}")
+        self.status = status
+        self.content = content
+
+    @property
+    def is_quota_error(self) -> bool:
+        return self.status == 403 and ("quotaExceeded" in self.content or "dailyLimitExceeded" in self.content)
+
+
+class DiscoveryTransport:
+    """googleapiclient-based transport with one service object per thread.
+
+    httplib2 (used by googleapiclient) is not thread-safe, so every worker
+    thread lazily builds its own service instance from the bundled discovery
+    document instead of sharing one.
+    """
+
+    def __init__(self, api_key: str, api_base: Optional[str] = None):
+        self.api_key = api_key
+        self.api_base = api_base
+        self._local = threading.local()
+        # Build eagerly once so configuration errors surface at startup.
+        self._service()
+
+    def _service(self):
+        service = getattr(self._local, "service", None)
+        if service is None:
+            client_options = {"api_endpoint": self.api_base} if self.api_base else None
+            service = build('youtube', 'v3', developerKey=self.api_key, client_options=client_options)
+            self._local.service = service
+        return service
+
+    def call(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        resource_name, verb = method.split(".")
+        resource = getattr(self._service(), resource_name)()
+        try:
+            return getattr(resource, verb)(**params).execute()
+        except HttpError as e:
+            content = e.content.decode("utf-8", "ignore") if isinstance(e.content, bytes) else str(e.content)
+            raise YouTubeApiError(getattr(e.resp, "status", None), content) from e
+
+
+class RestTransport:
+    """Minimal JSON-over-HTTPS client for the few Data API endpoints we use.
+
+    Built on a pooled, thread-safe ``requests.Session`` so many worker threads
+    can share it without per-thread setup cost.
+    """
+
+    def __init__(self, api_key: str, api_base: Optional[str] = None, pool_size: int = 16, timeout: int = 15):
+        self.api_key = api_key
+        self.base_url = (api_base or DEFAULT_API_BASE).rstrip("/") + "/youtube/v3"
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def call(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        resource_name, _ = method.split(".")
+        query = dict(params, key=self.api_key)
+        try:
+            response = self.session.get(f"{self.base_url}/{resource_name}", params=query, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            raise YouTubeApiError(None, str(e)) from e
+        if response.status_code >= 400:
+            raise YouTubeApiError(response.status_code, response.text)
+        try:
+            return response.json()
+        except json.JSONDecodeError as e:
+            raise YouTubeApiError(response.status_code, f"Invalid JSON: {e}") from e
+
+
+def create_transport(kind: str, api_key: str, api_base: Optional[str] = None, pool_size: int = 16):
+    """Create the transport named in ``youtube.transport`` ("discovery" or "rest")."""
+    if kind == "rest":
+        return RestTransport(api_key, api_base=api_base, pool_size=pool_size)
+    if kind == "discovery":
+        return DiscoveryTransport(api_key, api_base=api_base)
+    raise ValueError(f"Unknown YouTube transport: {kind}")